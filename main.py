@@ -58,15 +58,15 @@ def main():
 
     # Process each stock
     for i, stock in enumerate(stocks, 1):
-        print(f"[{i}/{len(stocks)}] Procesando {stock['symbol']} ({stock['company_name']})...")
+        print(f"[{i}/{len(stocks)}] Procesando {stock.symbol} ({stock.company_name})...")
 
         # Get percentage change
         percentage_change, yesterday_close, day_before_close, dates = \
-            stock_fetcher.get_percentage_change(stock['symbol'])
+            stock_fetcher.get_percentage_change(stock.symbol)
 
         if percentage_change is None:
             print("   ⚠️  No se pudo obtener información")
-            summary_lines.append(f"❌ {stock['symbol']}: Error al obtener datos")
+            summary_lines.append(f"❌ {stock.symbol}: Error al obtener datos")
             continue
 
         # Display information
@@ -74,11 +74,11 @@ def main():
         print(f"   Cambio: {percentage_change:+.2f}%")
 
         # Check if exceeds threshold
-        if abs(percentage_change) >= stock['threshold']:
-            print(f"   🚨 ¡ALERTA! Supera el umbral de {stock['threshold']}%")
+        if abs(percentage_change) >= stock.threshold:
+            print(f"   🚨 ¡ALERTA! Supera el umbral de {stock.threshold}%")
 
             # Get news articles
-            articles = news_fetcher.get_articles(stock['company_name'], limit=3)
+            articles = news_fetcher.get_articles(stock.company_name, limit=3)
             print(f"   📰 Noticias encontradas: {len(articles)}")
 
             # Generate report
@@ -92,10 +92,10 @@ def main():
 
             # Add to summary
             up_down = "🔺" if percentage_change > 0 else "🔻"
-            summary_lines.append(f"{up_down} {stock['symbol']}: {percentage_change:+.2f}%")
+            summary_lines.append(f"{up_down} {stock.symbol}: {percentage_change:+.2f}%")
         else:
-            print(f"   ✓ Sin alerta (cambio menor a {stock['threshold']}%)")
-            summary_lines.append(f"✓ {stock['symbol']}: {percentage_change:+.2f}%")
+            print(f"   ✓ Sin alerta (cambio menor a {stock.threshold}%)")
+            summary_lines.append(f"✓ {stock.symbol}: {percentage_change:+.2f}%")
 
         # Delay between requests to avoid saturating the API
         if i < len(stocks):
@@ -134,7 +134,7 @@ def main():
 
                 # Create detailed message
                 up_down = "🔺" if alert['percentage_change'] > 0 else "🔻"
-                detail_message = f"{alert['stock']['symbol']}: {up_down}{abs(alert['percentage_change']):.2f}%\n\n"
+                detail_message = f"{alert['stock'].symbol}: {up_down}{abs(alert['percentage_change']):.2f}%\n\n"
 
                 if alert['articles']:
                     article = alert['articles'][0]  # Send only the first news
@@ -142,7 +142,7 @@ def main():
                     detail_message += f"Brief: {article['description'] or 'No description available'}"
 
                 if notifier.send_message(detail_message):
-                    print(f"   ✅ Alerta {i}/{len(alerts)} enviada ({alert['stock']['symbol']})")
+                    print(f"   ✅ Alerta {i}/{len(alerts)} enviada ({alert['stock'].symbol})")
 
             print("\n✅ Todas las notificaciones enviadas!")
         else:
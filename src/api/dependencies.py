@@ -6,11 +6,41 @@ en los endpoints de la API. FastAPI las ejecuta automáticamente y proporciona
 los objetos necesarios a las funciones de los endpoints.
 """
 
-from typing import Generator
+import threading
+from typing import Generator, Optional
 
 from ..database import DatabaseService
 from ..config import config
 
+# Servicio compartido por todo el proceso: un único engine (y su pool de
+# conexiones) en lugar de crear y destruir uno en cada request
+_db_service: Optional[DatabaseService] = None
+_db_service_lock = threading.Lock()
+
+
+def get_db_service() -> DatabaseService:
+    """
+    Devuelve el DatabaseService compartido del proceso, creándolo la primera vez.
+
+    Returns:
+        DatabaseService: Instancia compartida del servicio de base de datos
+    """
+    global _db_service
+    if _db_service is None:
+        with _db_service_lock:
+            if _db_service is None:
+                _db_service = DatabaseService(database_url=config.DATABASE_URL)
+    return _db_service
+
+
+def close_db_service() -> None:
+    """Cierra el DatabaseService compartido (llamado al apagar la aplicación)."""
+    global _db_service
+    with _db_service_lock:
+        if _db_service is not None:
+            _db_service.close()
+            _db_service = None
+
 
 def get_db() -> Generator[DatabaseService, None, None]:
     """
@@ -29,17 +59,11 @@ def get_db() -> Generator[DatabaseService, None, None]:
     - Gestión automática del ciclo de vida (crear/cerrar)
     - Código más limpio y desacoplado
 
+    Todas las requests comparten el mismo servicio, de modo que reutilizan
+    las conexiones del pool (ver Config.DB_POOL_*). Cada operación abre y
+    cierra su propia sesión, así que no hay estado compartido entre requests.
+
     Yields:
         DatabaseService: Instancia del servicio de base de datos
     """
-    # Crear instancia del servicio
-    db = DatabaseService(database_url=config.DATABASE_URL)
-
-    try:
-        # Yield proporciona la instancia al endpoint
-        # FastAPI esperará a que el endpoint termine antes de continuar
-        yield db
-    finally:
-        # Este código se ejecuta después de que el endpoint termine
-        # Garantiza que la conexión siempre se cierre
-        db.close()
+    yield get_db_service()
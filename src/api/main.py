@@ -12,11 +12,13 @@ from fastapi import FastAPI, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from ..config import config
-from ..database.service import DatabaseService
+from ..http_session import close_http_session
 from ..scheduler import PriceUpdateScheduler, set_scheduler
-from .dependencies import get_db
+from .dependencies import get_db, get_db_service, close_db_service
+from .orjson_response import ORJSONResponse, http_exception_handler
 from .routers import stocks, prices, dashboard, alerts, news, pages, stock_updates, news_updates, notifications
 
 logger = logging.getLogger(__name__)
@@ -44,14 +46,15 @@ async def lifespan(app: FastAPI):
 
     Shutdown:
     - Detiene el scheduler de forma segura
+    - Cierra las conexiones HTTP y de base de datos
     """
     # Startup
     logger.info("=" * 70)
     logger.info("STARTING STOCK PRICE ALERT API")
     logger.info("=" * 70)
 
-    # Inicializar database service y garantizar tablas
-    db_service = DatabaseService()
+    # Inicializar database service (compartido con las requests) y garantizar tablas
+    db_service = get_db_service()
     try:
         db_service.create_tables()
         logger.info("✓ Database tables ensured/created")
@@ -78,6 +81,11 @@ async def lifespan(app: FastAPI):
     # Detener scheduler
     scheduler.stop()
     logger.info("✓ Scheduler stopped")
+
+    # Cerrar las conexiones keep-alive de los fetchers (tras parar el scheduler)
+    close_http_session()
+
+    close_db_service()
     logger.info("=" * 70)
 
 
@@ -88,9 +96,13 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/api/docs",  # Swagger UI
     redoc_url="/api/redoc",  # ReDoc
+    default_response_class=ORJSONResponse,  # Serialización JSON con orjson
     lifespan=lifespan  # Añadir lifespan context manager
 )
 
+# Errores HTTP serializados con orjson (mismo formato {"detail": ...})
+app.add_exception_handler(StarletteHTTPException, http_exception_handler)
+
 # Configurar templates Jinja2
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
 
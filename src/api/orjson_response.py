@@ -0,0 +1,65 @@
+"""
+Respuesta JSON basada en orjson.
+
+FastAPI serializa por defecto con el módulo json de la librería estándar.
+orjson produce el mismo JSON bastante más rápido y con menos memoria, lo que
+se nota en los endpoints que devuelven listas largas (stocks, precios,
+alertas, noticias).
+"""
+
+from functools import lru_cache
+from typing import Any
+
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+
+class ORJSONResponse(Response):
+    """
+    Response que serializa el contenido con orjson.
+
+    Se usa como default_response_class de la aplicación. Los datetime se
+    serializan en ISO 8601 igual que con la serialización estándar (los
+    naive se mantienen sin zona horaria) y se admiten claves no string.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+@lru_cache(maxsize=256)
+def _error_body(detail: str) -> bytes:
+    """Cuerpo JSON ya serializado de un error con detalle de texto."""
+    return orjson.dumps({"detail": detail})
+
+
+async def http_exception_handler(request: Request, exc: StarletteHTTPException) -> Response:
+    """
+    Exception handler para HTTPException que reutiliza cuerpos ya serializados.
+
+    Devuelve el mismo JSON que el handler por defecto de FastAPI
+    ({"detail": ...}), que es lo que leen el frontend y los clientes, pero
+    los errores repetidos (404 de un mismo símbolo, rutas inexistentes...)
+    se sirven desde una cache de bytes en lugar de serializarse de nuevo.
+    """
+    headers = getattr(exc, "headers", None)
+
+    # Estos códigos no pueden llevar cuerpo
+    if exc.status_code in (204, 304):
+        return Response(status_code=exc.status_code, headers=headers)
+
+    if isinstance(exc.detail, str):
+        body = _error_body(exc.detail)
+    else:
+        body = orjson.dumps({"detail": exc.detail}, option=orjson.OPT_NON_STR_KEYS)
+
+    return Response(
+        content=body,
+        status_code=exc.status_code,
+        headers=headers,
+        media_type="application/json"
+    )
@@ -9,10 +9,15 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 
 from ...database import DatabaseService
 from ..dependencies import get_db
+from ..orjson_response import ORJSONResponse
 from ..schemas import (
     AlertResponse,
     AlertListResponse,
-    ErrorResponse
+    ErrorResponse,
+    ALERT_LIST_ADAPTER,
+    construct_from_orm,
+    ALERT_LIST_EXAMPLE,
+    ERROR_EXAMPLE
 )
 
 # Crear router
@@ -34,11 +39,12 @@ router = APIRouter(
     responses={
         200: {
             "description": "Alertas obtenidas exitosamente",
-            "model": AlertListResponse
+            "model": AlertListResponse,
+            "content": {"application/json": {"example": ALERT_LIST_EXAMPLE}}
         }
     }
 )
-async def list_alerts(
+def list_alerts(
     days: int = Query(
         7,
         ge=1,
@@ -64,12 +70,15 @@ async def list_alerts(
     - Si se envió la notificación exitosamente
     - Tipo de notificación (whatsapp, sms)
     """
-    alerts = db.get_recent_alerts(symbol=None, days=days)
+    alerts = db.get_recent_alert_rows(symbol=None, days=days)
 
-    return AlertListResponse(
-        total=len(alerts),
-        alerts=alerts
-    )
+    return ORJSONResponse({
+        "total": len(alerts),
+        "alerts": ALERT_LIST_ADAPTER.dump_python(
+            [construct_from_orm(AlertResponse, alert) for alert in alerts],
+            mode="json"
+        )
+    })
 
 
 # =============================================================================
@@ -84,15 +93,17 @@ async def list_alerts(
     responses={
         200: {
             "description": "Alertas obtenidas exitosamente",
-            "model": AlertListResponse
+            "model": AlertListResponse,
+            "content": {"application/json": {"example": ALERT_LIST_EXAMPLE}}
         },
         404: {
             "description": "Stock no encontrado",
-            "model": ErrorResponse
+            "model": ErrorResponse,
+            "content": {"application/json": {"example": ERROR_EXAMPLE}}
         }
     }
 )
-async def get_stock_alerts(
+def get_stock_alerts(
     stock_symbol: str,
     days: int = Query(
         30,
@@ -130,9 +141,12 @@ async def get_stock_alerts(
         )
 
     # Obtener alertas del stock
-    alerts = db.get_recent_alerts(symbol=stock_symbol, days=days)
+    alerts = db.get_recent_alert_rows(symbol=stock_symbol, days=days)
 
-    return AlertListResponse(
-        total=len(alerts),
-        alerts=alerts
-    )
+    return ORJSONResponse({
+        "total": len(alerts),
+        "alerts": ALERT_LIST_ADAPTER.dump_python(
+            [construct_from_orm(AlertResponse, alert) for alert in alerts],
+            mode="json"
+        )
+    })
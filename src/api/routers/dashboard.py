@@ -9,7 +9,7 @@ from fastapi import APIRouter, Depends
 
 from ...database import DatabaseService
 from ..dependencies import get_db
-from ..schemas import DashboardSummaryResponse
+from ..schemas import DashboardSummaryResponse, DASHBOARD_SUMMARY_EXAMPLE
 
 # Crear router
 router = APIRouter(
@@ -30,11 +30,12 @@ router = APIRouter(
     responses={
         200: {
             "description": "Resumen obtenido exitosamente",
-            "model": DashboardSummaryResponse
+            "model": DashboardSummaryResponse,
+            "content": {"application/json": {"example": DASHBOARD_SUMMARY_EXAMPLE}}
         }
     }
 )
-async def get_dashboard_summary(
+def get_dashboard_summary(
     db: DatabaseService = Depends(get_db)
 ):
     """
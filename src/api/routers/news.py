@@ -9,11 +9,17 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 
 from ...database import DatabaseService
 from ..dependencies import get_db
+from ..orjson_response import ORJSONResponse
 from ..schemas import (
     NewsArticleCreate,
     NewsArticleResponse,
     NewsArticleListResponse,
-    ErrorResponse
+    ErrorResponse,
+    NEWS_LIST_ADAPTER,
+    construct_from_orm,
+    ERROR_EXAMPLE,
+    NEWS_ARTICLE_EXAMPLE,
+    NEWS_LIST_EXAMPLE
 )
 
 # Crear router sin prefijo (se añadirá en main.py)
@@ -34,15 +40,17 @@ router = APIRouter(
     responses={
         200: {
             "description": "Noticias obtenidas exitosamente",
-            "model": NewsArticleListResponse
+            "model": NewsArticleListResponse,
+            "content": {"application/json": {"example": NEWS_LIST_EXAMPLE}}
         },
         404: {
             "description": "Stock no encontrado",
-            "model": ErrorResponse
+            "model": ErrorResponse,
+            "content": {"application/json": {"example": ERROR_EXAMPLE}}
         }
     }
 )
-async def get_stock_news(
+def get_stock_news(
     symbol: str,
     limit: int = Query(
         10,
@@ -82,13 +90,16 @@ async def get_stock_news(
         )
 
     # Obtener noticias del stock
-    news = db.get_news_for_stock(symbol, limit=limit)
-
-    return NewsArticleListResponse(
-        symbol=symbol.upper(),
-        total=len(news),
-        news=news
-    )
+    news = db.get_news_rows_for_stock(symbol, limit=limit)
+
+    return ORJSONResponse({
+        "symbol": symbol.upper(),
+        "total": len(news),
+        "news": NEWS_LIST_ADAPTER.dump_python(
+            [construct_from_orm(NewsArticleResponse, article) for article in news],
+            mode="json"
+        )
+    })
 
 
 # =============================================================================
@@ -97,18 +108,20 @@ async def get_stock_news(
 
 @router.post(
     "/stocks/{symbol}/news",
-    response_model=NewsArticleResponse,
+    response_model=None,  # Se devuelve ya serializada; schema en responses
     status_code=status.HTTP_201_CREATED,
     summary="Guardar noticia manualmente",
     description="Guarda una noticia relacionada con un stock. Útil para testing o integración manual.",
     responses={
         201: {
             "description": "Noticia guardada exitosamente",
-            "model": NewsArticleResponse
+            "model": NewsArticleResponse,
+            "content": {"application/json": {"example": NEWS_ARTICLE_EXAMPLE}}
         },
         404: {
             "description": "Stock no encontrado",
-            "model": ErrorResponse
+            "model": ErrorResponse,
+            "content": {"application/json": {"example": ERROR_EXAMPLE}}
         },
         400: {
             "description": "Error al guardar la noticia",
@@ -116,7 +129,7 @@ async def get_stock_news(
         }
     }
 )
-async def save_news_article(
+def save_news_article(
     symbol: str,
     news_data: NewsArticleCreate,
     db: DatabaseService = Depends(get_db)
@@ -174,7 +187,10 @@ async def save_news_article(
                 detail="Error al guardar la noticia"
             )
 
-        return article
+        return ORJSONResponse(
+            construct_from_orm(NewsArticleResponse, article).model_dump(mode="json"),
+            status_code=status.HTTP_201_CREATED
+        )
 
     except Exception as e:
         raise HTTPException(
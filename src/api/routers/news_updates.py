@@ -10,6 +10,7 @@ import logging
 from ...database import DatabaseService
 from ...news_fetcher import NewsFetcher
 from ...image_fetcher import ImageFetcher
+from ...utils import parse_iso_datetime
 from ..dependencies import get_db
 from ..schemas import ErrorResponse
 
@@ -43,7 +44,7 @@ router = APIRouter(
         }
     }
 )
-async def update_stock_news(
+def update_stock_news(
     symbol: str,
     limit: int = Query(
         5,
@@ -103,10 +104,16 @@ async def update_stock_news(
             detail=f"Failed to fetch news from News API: {str(e)}"
         )
 
+    # Articles already stored for this stock, checked in a single query
+    existing_urls = db.existing_news_urls(
+        [(stock.id, article.get("url")) for article in articles]
+    )
+
     # Save articles to database
     saved_articles = []
     saved_count = 0
     skipped_count = 0
+    download_events = []
 
     for article in articles:
         try:
@@ -122,20 +129,15 @@ async def update_stock_news(
             if not title:
                 continue
 
-            # Check if article already exists (duplicate detection by URL)
-            if url and db.has_news_article_by_url(symbol, url):
+            # Skip known duplicates before any Unsplash lookup; anything that
+            # slips through is dropped by the INSERT (ON CONFLICT DO NOTHING)
+            if url and (stock.id, url) in existing_urls:
                 logger.info(f"Skipping duplicate article for {symbol}: {url}")
                 skipped_count += 1
                 continue
 
             # Parse published_at date
-            from datetime import datetime
-            published_at = None
-            if published_at_str:
-                try:
-                    published_at = datetime.fromisoformat(published_at_str.replace('Z', '+00:00'))
-                except:
-                    pass
+            published_at = parse_iso_datetime(published_at_str)
 
             # Get fallback image from Unsplash if no image provided
             photographer_name = None
@@ -151,9 +153,6 @@ async def update_stock_news(
                     photographer_username = unsplash_data["photographer_username"]
                     photographer_url = unsplash_data["photographer_url"]
                     unsplash_download_location = unsplash_data["download_location"]
-
-                    # Trigger download event (required by Unsplash API)
-                    image_fetcher.trigger_download(unsplash_download_location)
                     logger.info(f"Using Unsplash fallback image for {symbol} by {photographer_name}")
 
             # Save to database
@@ -181,12 +180,20 @@ async def update_stock_news(
                     "fetched_at": saved_article.fetched_at.isoformat()
                 })
                 saved_count += 1
+                if unsplash_download_location:
+                    download_events.append(unsplash_download_location)
+            else:
+                logger.info(f"Skipping duplicate article for {symbol}: {url}")
+                skipped_count += 1
 
         except Exception as e:
             logger.error(f"Error saving article for {symbol}: {str(e)}")
             # Continue with next article
             continue
 
+    # Trigger download events (required by Unsplash API)
+    image_fetcher.trigger_downloads(download_events)
+
     logger.info(f"Saved {saved_count} of {len(articles)} articles for {symbol} (skipped {skipped_count} duplicates)")
 
     return {
@@ -215,7 +222,7 @@ async def update_stock_news(
         }
     }
 )
-async def update_all_stock_news(
+def update_all_stock_news(
     limit: int = Query(
         5,
         ge=1,
@@ -249,7 +256,7 @@ async def update_all_stock_news(
     """
     # Get all active stocks
     active_stocks = db.get_all_stocks(only_active=True)
-    total_stocks = len(db.get_all_stocks(only_active=False))
+    total_stocks = db.count_all_stocks()
 
     if not active_stocks:
         return {
@@ -272,6 +279,27 @@ async def update_all_stock_news(
     news_fetcher = NewsFetcher()
     image_fetcher = ImageFetcher()
 
+    # Fetch news for every stock concurrently, then fallback images for the
+    # companies that have articles without one (one search per company)
+    articles_by_company = news_fetcher.get_articles_many(
+        [stock.company_name for stock in active_stocks], limit=limit
+    )
+    fallback_images = image_fetcher.get_fallback_images(
+        name for name, articles in articles_by_company.items()
+        if any(article.get("title") and not article.get("urlToImage") for article in articles)
+    )
+
+    # Articles already stored, checked for every stock in a single query
+    existing_urls = db.existing_news_urls([
+        (stock.id, article.get("url"))
+        for stock in active_stocks
+        for article in articles_by_company[stock.company_name]
+    ])
+
+    # Unsplash download events for the fallback images actually saved; sent
+    # together after the loop so they don't hold up the database writes
+    download_events = []
+
     # Update each stock
     for stock in active_stocks:
         result = {
@@ -285,8 +313,8 @@ async def update_all_stock_news(
         }
 
         try:
-            # Fetch news from News API
-            articles = news_fetcher.get_articles(stock.company_name, limit=limit)
+            # News fetched above from News API
+            articles = articles_by_company[stock.company_name]
             result["articles_fetched"] = len(articles)
 
             # Save articles to database
@@ -304,20 +332,14 @@ async def update_all_stock_news(
                     source = article.get("source", {}).get("name")
                     published_at_str = article.get("publishedAt")
 
-                    # Check if article already exists (duplicate detection by URL)
-                    if url and db.has_news_article_by_url(stock.symbol, url):
+                    # Skip known duplicates before any Unsplash lookup
+                    if url and (stock.id, url) in existing_urls:
                         logger.info(f"Skipping duplicate article for {stock.symbol}: {url}")
                         skipped_count += 1
                         continue
 
                     # Parse published_at date
-                    from datetime import datetime
-                    published_at = None
-                    if published_at_str:
-                        try:
-                            published_at = datetime.fromisoformat(published_at_str.replace('Z', '+00:00'))
-                        except:
-                            pass
+                    published_at = parse_iso_datetime(published_at_str)
 
                     # Get fallback image from Unsplash if no image provided
                     photographer_name = None
@@ -326,7 +348,7 @@ async def update_all_stock_news(
                     unsplash_download_location = None
 
                     if not image_url:
-                        unsplash_data = image_fetcher.get_fallback_image(stock.company_name)
+                        unsplash_data = fallback_images.get(stock.company_name)
                         if unsplash_data:
                             image_url = unsplash_data["image_url"]
                             photographer_name = unsplash_data["photographer_name"]
@@ -334,9 +356,6 @@ async def update_all_stock_news(
                             photographer_url = unsplash_data["photographer_url"]
                             unsplash_download_location = unsplash_data["download_location"]
 
-                            # Trigger download event (required by Unsplash API)
-                            image_fetcher.trigger_download(unsplash_download_location)
-
                     # Save to database
                     saved_article = db.save_news_article(
                         symbol=stock.symbol,
@@ -354,6 +373,10 @@ async def update_all_stock_news(
 
                     if saved_article:
                         saved_count += 1
+                        if unsplash_download_location:
+                            download_events.append(unsplash_download_location)
+                    else:
+                        skipped_count += 1
 
                 except Exception as e:
                     logger.error(f"Error saving article for {stock.symbol}: {str(e)}")
@@ -372,6 +395,9 @@ async def update_all_stock_news(
 
         results.append(result)
 
+    # Trigger download events (required by Unsplash API)
+    image_fetcher.trigger_downloads(download_events)
+
     # Return summary
     return {
         "message": f"Updated news for {updated_count} of {len(active_stocks)} active stocks",
@@ -20,6 +20,32 @@ router = APIRouter(
 )
 
 
+def _format_price(value) -> str:
+    """Format a closing price for a message, or "N/A" if it is missing."""
+    return f"${value:.2f}" if value is not None else "N/A"
+
+
+def _format_alert_message(stock, alert) -> str:
+    """
+    Build the notification text for an alert.
+
+    price_before and price_after are nullable (create_alert defaults them
+    to None), so missing prices are shown as "N/A".
+    """
+    direction = "increased" if alert.percentage_change > 0 else "decreased"
+    arrow = "📈" if alert.percentage_change > 0 else "📉"
+
+    return (
+        f"{arrow} STOCK ALERT: {stock.symbol}\n\n"
+        f"Company: {stock.company_name}\n"
+        f"Price {direction} by {abs(alert.percentage_change):.2f}%\n\n"
+        f"Previous Close: {_format_price(alert.price_before)}\n"
+        f"Current Close: {_format_price(alert.price_after)}\n"
+        f"Threshold: {alert.threshold_at_time:.2f}%\n\n"
+        f"This alert was triggered because the price change exceeded your configured threshold."
+    )
+
+
 # =============================================================================
 # POST /api/alerts/{alert_id}/send - Send notification for a specific alert
 # =============================================================================
@@ -43,7 +69,7 @@ router = APIRouter(
         }
     }
 )
-async def send_alert_notification(
+def send_alert_notification(
     alert_id: int,
     use_whatsapp: bool = Query(
         True,
@@ -73,101 +99,85 @@ async def send_alert_notification(
     - **notification_type**: "whatsapp" or "sms"
     - **sent**: Whether the notification was sent successfully
     """
-    # Get alert from database
-    with db.get_session() as session:
-        from ...database.models import Alert
-        alert = session.query(Alert).filter(Alert.id == alert_id).first()
+    # Get alert and stock by primary key in one short session, closed
+    # before calling Twilio
+    from ...database.models import Alert, Stock
+    with db.get_session(write=False) as session:
+        alert = session.get(Alert, alert_id)
+        stock = session.get(Stock, alert.stock_id) if alert else None
+        session.expunge_all()
+
+    if not alert:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Alert with ID {alert_id} not found"
+        )
 
-        if not alert:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Alert with ID {alert_id} not found"
-            )
+    if not stock:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Stock with ID {alert.stock_id} not found"
+        )
 
-        # Get stock information
-        stock = db.get_stock_by_id(alert.stock_id)
-        if not stock:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Stock with ID {alert.stock_id} not found"
-            )
+    # Format notification message
+    symbol = stock.symbol
+    percentage_change = alert.percentage_change
+    message_body = _format_alert_message(stock, alert)
+
+    # Initialize notifier
+    notifier = Notifier(use_whatsapp=use_whatsapp)
 
-        # Format notification message
-        symbol = stock.symbol
-        company_name = stock.company_name
-        percentage_change = alert.percentage_change
-        price_before = alert.price_before
-        price_after = alert.price_after
-        threshold = alert.threshold_at_time
-
-        # Determine if it's an increase or decrease
-        direction = "increased" if percentage_change > 0 else "decreased"
-        arrow = "📈" if percentage_change > 0 else "📉"
-
-        message_body = (
-            f"{arrow} STOCK ALERT: {symbol}\n\n"
-            f"Company: {company_name}\n"
-            f"Price {direction} by {abs(percentage_change):.2f}%\n\n"
-            f"Previous Close: ${price_before:.2f}\n"
-            f"Current Close: ${price_after:.2f}\n"
-            f"Threshold: {threshold:.2f}%\n\n"
-            f"This alert was triggered because the price change exceeded your configured threshold."
+    # Check if Twilio credentials are configured
+    if not notifier.account_sid or not notifier.auth_token:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Twilio credentials not configured. Please set TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN in environment variables."
         )
 
-        # Initialize notifier
-        notifier = Notifier(use_whatsapp=use_whatsapp)
+    # Send notification
+    try:
+        success = notifier.send_message(message_body)
+        notification_type = "whatsapp" if use_whatsapp else "sms"
+
+        # Update alert status in database
+        db.update_alert_status(
+            alert_id=alert_id,
+            message_sent=success,
+            notification_type=notification_type,
+            error_message=None if success else "Failed to send notification"
+        )
 
-        # Check if Twilio credentials are configured
-        if not notifier.account_sid or not notifier.auth_token:
+        if success:
+            logger.info(f"Notification sent successfully for alert {alert_id} via {notification_type}")
+            return {
+                "message": f"Notification sent successfully via {notification_type}",
+                "alert_id": alert_id,
+                "notification_type": notification_type,
+                "sent": True,
+                "symbol": symbol,
+                "percentage_change": percentage_change
+            }
+        else:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Twilio credentials not configured. Please set TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN in environment variables."
+                detail="Failed to send notification. Check Twilio credentials and logs."
             )
 
-        # Send notification
-        try:
-            success = notifier.send_message(message_body)
-            notification_type = "whatsapp" if use_whatsapp else "sms"
+    except Exception as e:
+        logger.error(f"Error sending notification for alert {alert_id}: {str(e)}")
 
-            # Update alert status in database
-            db.update_alert_status(
-                alert_id=alert_id,
-                message_sent=success,
-                notification_type=notification_type,
-                error_message=None if success else "Failed to send notification"
-            )
-
-            if success:
-                logger.info(f"Notification sent successfully for alert {alert_id} via {notification_type}")
-                return {
-                    "message": f"Notification sent successfully via {notification_type}",
-                    "alert_id": alert_id,
-                    "notification_type": notification_type,
-                    "sent": True,
-                    "symbol": symbol,
-                    "percentage_change": percentage_change
-                }
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail="Failed to send notification. Check Twilio credentials and logs."
-                )
-
-        except Exception as e:
-            logger.error(f"Error sending notification for alert {alert_id}: {str(e)}")
-
-            # Update alert with error
-            db.update_alert_status(
-                alert_id=alert_id,
-                message_sent=False,
-                notification_type="whatsapp" if use_whatsapp else "sms",
-                error_message=str(e)
-            )
+        # Update alert with error
+        db.update_alert_status(
+            alert_id=alert_id,
+            message_sent=False,
+            notification_type="whatsapp" if use_whatsapp else "sms",
+            error_message=str(e)
+        )
 
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=f"Failed to send notification: {str(e)}"
-            )
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Failed to send notification: {str(e)}"
+        )
 
 
 # =============================================================================
@@ -185,7 +195,7 @@ async def send_alert_notification(
         }
     }
 )
-async def send_pending_alerts(
+def send_pending_alerts(
     use_whatsapp: bool = Query(
         True,
         description="Send via WhatsApp (true) or SMS (false)"
@@ -251,7 +261,11 @@ async def send_pending_alerts(
     failed_count = 0
     results = []
 
-    # Send notification for each alert
+    # Load all stocks once instead of one lookup per alert
+    stocks_by_id = {stock.id: stock for stock in db.get_all_stocks()}
+
+    # Build the message for each alert
+    to_send = []
     for alert in pending_alerts:
         result = {
             "alert_id": alert.id,
@@ -260,53 +274,24 @@ async def send_pending_alerts(
             "percentage_change": alert.percentage_change,
             "error": None
         }
+        results.append(result)
 
         try:
             # Get stock information
-            stock = db.get_stock_by_id(alert.stock_id)
+            stock = stocks_by_id.get(alert.stock_id)
             if not stock:
                 result["error"] = f"Stock with ID {alert.stock_id} not found"
                 failed_count += 1
-                results.append(result)
                 continue
 
             result["symbol"] = stock.symbol
 
             # Format notification message
-            direction = "increased" if alert.percentage_change > 0 else "decreased"
-            arrow = "📈" if alert.percentage_change > 0 else "📉"
-
-            message_body = (
-                f"{arrow} STOCK ALERT: {stock.symbol}\n\n"
-                f"Company: {stock.company_name}\n"
-                f"Price {direction} by {abs(alert.percentage_change):.2f}%\n\n"
-                f"Previous Close: ${alert.price_before:.2f}\n"
-                f"Current Close: ${alert.price_after:.2f}\n"
-                f"Threshold: {alert.threshold_at_time:.2f}%\n\n"
-                f"This alert was triggered because the price change exceeded your configured threshold."
-            )
-
-            # Send notification
-            success = notifier.send_message(message_body)
-
-            # Update alert status
-            db.update_alert_status(
-                alert_id=alert.id,
-                message_sent=success,
-                notification_type=notification_type,
-                error_message=None if success else "Failed to send notification"
-            )
-
-            if success:
-                result["success"] = True
-                sent_count += 1
-                logger.info(f"Notification sent for alert {alert.id} ({stock.symbol})")
-            else:
-                result["error"] = "Failed to send notification"
-                failed_count += 1
+            message_body = _format_alert_message(stock, alert)
 
         except Exception as e:
-            logger.error(f"Error sending notification for alert {alert.id}: {str(e)}")
+            # A malformed alert must not keep the others from being sent
+            logger.error(f"Error preparing notification for alert {alert.id}: {str(e)}")
             result["error"] = str(e)
             failed_count += 1
 
@@ -317,8 +302,35 @@ async def send_pending_alerts(
                 notification_type=notification_type,
                 error_message=str(e)
             )
+            continue
 
-        results.append(result)
+        to_send.append((alert, result, message_body))
+
+    # Send all notifications concurrently (Twilio has no batch endpoint)
+    outcomes = notifier.send_many([message_body for _, _, message_body in to_send])
+
+    # Update each alert's status
+    for (alert, result, _), success in zip(to_send, outcomes):
+        try:
+            db.update_alert_status(
+                alert_id=alert.id,
+                message_sent=success,
+                notification_type=notification_type,
+                error_message=None if success else "Failed to send notification"
+            )
+        except Exception as e:
+            logger.error(f"Error updating alert {alert.id} after sending: {str(e)}")
+            result["error"] = str(e)
+            failed_count += 1
+            continue
+
+        if success:
+            result["success"] = True
+            sent_count += 1
+            logger.info(f"Notification sent for alert {alert.id} ({result['symbol']})")
+        else:
+            result["error"] = "Failed to send notification"
+            failed_count += 1
 
     # Return summary
     return {
@@ -4,20 +4,34 @@ Router para endpoints de histórico de precios.
 Este módulo contiene todos los endpoints relacionados con los precios históricos
 de los stocks:
 - Obtener histórico de precios de un stock
+- Obtener el histórico en formato columnar
 - Obtener el último precio registrado
 - Añadir precio manualmente (para testing/simulación)
+- Añadir varios precios en bloque (carga de históricos)
 """
 
+from bisect import bisect_left, insort
+from contextlib import closing
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from datetime import datetime
+from typing import List
 
 from ...database import DatabaseService
 from ..dependencies import get_db
+from ..orjson_response import ORJSONResponse
 from ..schemas import (
     PriceHistoryCreate,
     PriceHistoryResponse,
     PriceHistoryListResponse,
-    ErrorResponse
+    PriceHistoryBulkResponse,
+    PriceHistoryBulkCreateResponse,
+    ErrorResponse,
+    PRICE_LIST_ADAPTER,
+    construct_from_orm,
+    ERROR_EXAMPLE,
+    PRICE_EXAMPLE,
+    PRICE_LIST_EXAMPLE,
+    PRICE_BULK_EXAMPLE
 )
 
 # Crear router sin prefijo (se añadirá en main.py)
@@ -38,15 +52,17 @@ router = APIRouter(
     responses={
         200: {
             "description": "Histórico obtenido exitosamente",
-            "model": PriceHistoryListResponse
+            "model": PriceHistoryListResponse,
+            "content": {"application/json": {"example": PRICE_LIST_EXAMPLE}}
         },
         404: {
             "description": "Stock no encontrado",
-            "model": ErrorResponse
+            "model": ErrorResponse,
+            "content": {"application/json": {"example": ERROR_EXAMPLE}}
         }
     }
 )
-async def get_price_history(
+def get_price_history(
     symbol: str,
     days: int = Query(
         30,
@@ -80,14 +96,94 @@ async def get_price_history(
         )
 
     # Obtener histórico
-    prices = db.get_price_history(symbol, days=days)
+    prices = db.get_price_history_rows(symbol, days=days)
+
+    return ORJSONResponse({
+        "symbol": symbol.upper(),
+        "total": len(prices),
+        "prices": PRICE_LIST_ADAPTER.dump_python(
+            [construct_from_orm(PriceHistoryResponse, price) for price in prices],
+            mode="json"
+        )
+    })
+
+
+# =============================================================================
+# GET /api/stocks/{symbol}/prices/bulk - Histórico en formato columnar
+# =============================================================================
+
+@router.get(
+    "/stocks/{symbol}/prices/bulk",
+    response_model=PriceHistoryBulkResponse,
+    summary="Obtener histórico de precios (columnar)",
+    description="Obtiene el histórico de precios de un stock como listas paralelas, una por campo.",
+    responses={
+        200: {
+            "description": "Histórico obtenido exitosamente",
+            "model": PriceHistoryBulkResponse,
+            "content": {"application/json": {"example": PRICE_BULK_EXAMPLE}}
+        },
+        404: {
+            "description": "Stock no encontrado",
+            "model": ErrorResponse,
+            "content": {"application/json": {"example": ERROR_EXAMPLE}}
+        }
+    }
+)
+def get_price_history_bulk(
+    symbol: str,
+    days: int = Query(
+        30,
+        ge=1,
+        le=365,
+        description="Número de días hacia atrás (1-365, default: 30)"
+    ),
+    db: DatabaseService = Depends(get_db)
+):
+    """
+    Obtiene el histórico de precios de un stock en formato columnar.
+
+    Mismos datos que GET /api/stocks/{symbol}/prices, pero en lugar de una
+    lista de objetos devuelve una lista por campo. Pensado para gráficas e
+    históricos largos.
+
+    Parámetros:
+    - **symbol**: Símbolo del stock (ej: TSLA, AAPL)
+    - **days**: Número de días hacia atrás (default: 30, máx: 365)
+
+    Retorna:
+    - **symbol**, **total**
+    - **ids**, **dates**, **close_prices**, **previous_closes**,
+      **percentage_changes**: listas paralelas (más reciente primero)
 
-    return PriceHistoryListResponse(
-        symbol=symbol.upper(),
-        total=len(prices),
-        prices=prices
+    Errores:
+    - **404**: Si el stock no existe
+    """
+    # Verificar que el stock existe
+    stock = db.get_stock_by_symbol(symbol)
+    if not stock:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Stock con símbolo '{symbol.upper()}' no encontrado"
+        )
+
+    rows = db.get_price_history_rows(symbol, days=days)
+
+    # Transponer las filas en columnas
+    ids, _, dates, close_prices, previous_closes, percentage_changes, _ = (
+        zip(*rows) if rows else ((),) * 7
     )
 
+    return ORJSONResponse({
+        "symbol": symbol.upper(),
+        "total": len(rows),
+        "ids": ids,
+        "dates": dates,
+        "close_prices": close_prices,
+        "previous_closes": previous_closes,
+        "percentage_changes": percentage_changes
+    })
+
 
 # =============================================================================
 # GET /api/stocks/{symbol}/prices/latest - Obtener último precio
@@ -95,21 +191,23 @@ async def get_price_history(
 
 @router.get(
     "/stocks/{symbol}/prices/latest",
-    response_model=PriceHistoryResponse,
+    response_model=None,  # Se devuelve ya serializada; schema en responses
     summary="Obtener último precio",
     description="Obtiene el precio más reciente registrado de un stock.",
     responses={
         200: {
             "description": "Último precio obtenido",
-            "model": PriceHistoryResponse
+            "model": PriceHistoryResponse,
+            "content": {"application/json": {"example": PRICE_EXAMPLE}}
         },
         404: {
             "description": "Stock no encontrado o sin precios registrados",
-            "model": ErrorResponse
+            "model": ErrorResponse,
+            "content": {"application/json": {"example": ERROR_EXAMPLE}}
         }
     }
 )
-async def get_latest_price(
+def get_latest_price(
     symbol: str,
     db: DatabaseService = Depends(get_db)
 ):
@@ -134,17 +232,19 @@ async def get_latest_price(
         )
 
     # Obtener último precio (buscar en todos los registros, no limitar por días)
-    # Usamos un rango amplio para asegurar que encontramos el más reciente
-    prices = db.get_price_history(symbol, days=365)
+    # Usamos un rango amplio para asegurar que encontramos el más reciente.
+    # El primer elemento es el más reciente (orden DESC en la BD), así que
+    # basta con leer ese
+    with closing(db.iter_price_history(symbol, days=365)) as prices:
+        latest = next(prices, None)
 
-    if not prices:
+    if not latest:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"No hay precios registrados para '{symbol.upper()}'"
         )
 
-    # El primer elemento es el más reciente (orden DESC en la BD)
-    return prices[0]
+    return ORJSONResponse(construct_from_orm(PriceHistoryResponse, latest).model_dump(mode="json"))
 
 
 # =============================================================================
@@ -153,18 +253,20 @@ async def get_latest_price(
 
 @router.post(
     "/stocks/{symbol}/prices",
-    response_model=PriceHistoryResponse,
+    response_model=None,  # Se devuelve ya serializada; schema en responses
     status_code=status.HTTP_201_CREATED,
     summary="Añadir precio manualmente",
     description="Añade un registro de precio manualmente. Útil para testing o carga inicial de datos.",
     responses={
         201: {
             "description": "Precio añadido exitosamente",
-            "model": PriceHistoryResponse
+            "model": PriceHistoryResponse,
+            "content": {"application/json": {"example": PRICE_EXAMPLE}}
         },
         404: {
             "description": "Stock no encontrado",
-            "model": ErrorResponse
+            "model": ErrorResponse,
+            "content": {"application/json": {"example": ERROR_EXAMPLE}}
         },
         400: {
             "description": "Error al añadir el precio",
@@ -172,7 +274,7 @@ async def get_latest_price(
         }
     }
 )
-async def add_price_manually(
+def add_price_manually(
     symbol: str,
     price_data: PriceHistoryCreate,
     db: DatabaseService = Depends(get_db)
@@ -213,28 +315,25 @@ async def add_price_manually(
         )
 
     # Obtener el precio anterior más cercano a la fecha proporcionada
-    # (para calcular previous_close y percentage_change)
-    existing_prices = db.get_price_history(symbol, days=365)
+    # (para calcular previous_close y percentage_change). El histórico llega
+    # del más reciente al más antiguo: el primero anterior a la fecha es el
+    # más cercano y no hace falta leer el resto
+    with closing(db.iter_price_history(symbol, days=365)) as existing_prices:
+        previous_price = next(
+            (p for p in existing_prices if p.date < price_data.date),
+            None
+        )
 
     previous_close = None
     percentage_change = None
 
-    if existing_prices:
-        # Buscar el precio más cercano anterior a la fecha proporcionada
-        previous_prices = [
-            p for p in existing_prices
-            if p.date < price_data.date
-        ]
-
-        if previous_prices:
-            # El más reciente de los anteriores
-            previous_price = previous_prices[0]
-            previous_close = previous_price.close_price
+    if previous_price:
+        previous_close = previous_price.close_price
 
-            # Calcular cambio porcentual
-            percentage_change = (
-                (price_data.close_price - previous_close) / previous_close * 100
-            )
+        # Calcular cambio porcentual
+        percentage_change = (
+            (price_data.close_price - previous_close) / previous_close * 100
+        )
 
     # Añadir el precio
     try:
@@ -252,10 +351,121 @@ async def add_price_manually(
                 detail="Error al añadir el precio"
             )
 
-        return price
+        return ORJSONResponse(
+            construct_from_orm(PriceHistoryResponse, price).model_dump(mode="json"),
+            status_code=status.HTTP_201_CREATED
+        )
 
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Error al añadir el precio: {str(e)}"
         )
+
+
+# =============================================================================
+# POST /api/stocks/{symbol}/prices/bulk - Añadir precios en bloque
+# =============================================================================
+
+@router.post(
+    "/stocks/{symbol}/prices/bulk",
+    response_model=PriceHistoryBulkCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Añadir precios en bloque",
+    description="Añade varios registros de precio en una sola operación. Útil para cargar históricos.",
+    responses={
+        201: {
+            "description": "Precios añadidos exitosamente",
+            "model": PriceHistoryBulkCreateResponse
+        },
+        404: {
+            "description": "Stock no encontrado",
+            "model": ErrorResponse,
+            "content": {"application/json": {"example": ERROR_EXAMPLE}}
+        },
+        400: {
+            "description": "Error al añadir los precios",
+            "model": ErrorResponse
+        }
+    }
+)
+def add_prices_bulk(
+    symbol: str,
+    prices_data: List[PriceHistoryCreate],
+    db: DatabaseService = Depends(get_db)
+):
+    """
+    Añade varios registros de precio de una vez.
+
+    Equivale a llamar a POST /api/stocks/{symbol}/prices por cada precio,
+    pero con un único INSERT en la base de datos.
+
+    Parámetros:
+    - **symbol**: Símbolo del stock
+
+    Body (JSON): lista de objetos con
+    - **date**: Fecha del precio (ISO 8601)
+    - **close_price**: Precio de cierre (debe ser > 0)
+
+    Para cada precio se calculan **previous_close** y **percentage_change**
+    a partir del precio anterior más cercano, ya sea de la BD o de la propia
+    lista.
+
+    Retorna:
+    - **symbol**: Símbolo del stock
+    - **inserted**: Número de registros añadidos
+    - **ids**: IDs de los registros, ordenados por fecha
+
+    Errores:
+    - **404**: Si el stock no existe
+    - **400**: Si hay error al añadir los precios
+    """
+    # Verificar que el stock existe
+    stock = db.get_stock_by_symbol(symbol)
+    if not stock:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Stock con símbolo '{symbol.upper()}' no encontrado"
+        )
+
+    # Precios conocidos ordenados por fecha: los de la BD y, a medida que se
+    # procesan, los de la petición (mismo rango que el endpoint individual)
+    timeline = sorted(
+        (row.date, row.close_price)
+        for row in db.get_price_history_rows(symbol, days=365)
+    )
+
+    rows = []
+    for price_data in sorted(prices_data, key=lambda p: p.date):
+        previous_close = None
+        percentage_change = None
+
+        # Último precio con fecha estrictamente anterior
+        position = bisect_left(timeline, (price_data.date,))
+        if position:
+            previous_close = timeline[position - 1][1]
+            percentage_change = (
+                (price_data.close_price - previous_close) / previous_close * 100
+            )
+
+        rows.append({
+            "symbol": symbol,
+            "date": price_data.date,
+            "close_price": price_data.close_price,
+            "previous_close": previous_close,
+            "percentage_change": percentage_change
+        })
+        insort(timeline, (price_data.date, price_data.close_price))
+
+    try:
+        ids = db.bulk_add_price_history(rows)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Error al añadir los precios: {str(e)}"
+        )
+
+    return ORJSONResponse(
+        {"symbol": symbol.upper(), "inserted": len(ids), "ids": ids},
+        status_code=status.HTTP_201_CREATED
+    )
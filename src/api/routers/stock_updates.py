@@ -5,10 +5,12 @@ Handles fetching real-time stock prices from Alpha Vantage API
 and updating the database with new price data and alerts.
 """
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status
 import logging
 
+from ...config import config
 from ...database import DatabaseService
 from ...stock_fetcher import StockFetcher
 from ..dependencies import get_db
@@ -80,7 +82,7 @@ router = APIRouter(
         }
     }
 )
-async def update_stock_price(
+def update_stock_price(
     symbol: str,
     db: DatabaseService = Depends(get_db)
 ):
@@ -286,7 +288,7 @@ async def update_stock_price(
         }
     }
 )
-async def update_all_stock_prices(
+def update_all_stock_prices(
     db: DatabaseService = Depends(get_db)
 ):
     """
@@ -317,7 +319,7 @@ async def update_all_stock_prices(
     """
     # Get all active stocks
     active_stocks = db.get_all_stocks(only_active=True)
-    total_stocks = len(db.get_all_stocks(only_active=False))
+    total_stocks = db.count_all_stocks()
 
     if not active_stocks:
         return {
@@ -330,89 +332,45 @@ async def update_all_stock_prices(
             "results": []
         }
 
-    # Initialize counters
-    updated_count = 0
-    failed_count = 0
-    alerts_count = 0
-    results = []
-
     # Initialize fetcher once
     fetcher = StockFetcher()
 
-    # Update each stock
-    for stock in active_stocks:
-        result = {
-            "symbol": stock.symbol,
-            "success": False,
-            "price": None,
-            "change": None,
-            "alert_triggered": False,
-            "alert_already_exists": False,
-            "error": None
-        }
+    # DB writes run on a small thread pool so they overlap with the next
+    # Alpha Vantage fetch; workers never exceed the connection pool size
+    workers = max(1, min(config.DB_WRITE_WORKERS, config.DB_POOL_SIZE))
+    pending = []
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="price-writer") as db_pool:
+        for stock in active_stocks:
+            result = _new_update_result(stock.symbol)
 
-        try:
-            # Fetch price from Alpha Vantage
-            percentage_change, yesterday_close, day_before_close, dates = fetcher.get_percentage_change(stock.symbol)
+            try:
+                # Fetch price from Alpha Vantage
+                percentage_change, yesterday_close, day_before_close, dates = fetcher.get_percentage_change(stock.symbol)
+            except Exception as e:
+                logger.error(f"Error updating {stock.symbol}: {str(e)}")
+                result["error"] = str(e)
+                pending.append(_completed(result))
+                continue
 
             if percentage_change is None or yesterday_close is None:
                 result["error"] = "No data returned from Alpha Vantage"
-                failed_count += 1
-                results.append(result)
+                pending.append(_completed(result))
                 continue
 
             # Parse date
             price_date = datetime.strptime(dates[0], "%Y-%m-%d") if dates else datetime.utcnow()
 
-            # Save price
-            price_record = db.add_price_history(
-                symbol=stock.symbol,
-                date=price_date,
-                close_price=yesterday_close,
-                previous_close=day_before_close,
-                percentage_change=percentage_change
-            )
-
-            if price_record:
-                result["success"] = True
-                result["price"] = yesterday_close
-                result["change"] = percentage_change
-                updated_count += 1
-
-                # Check for alert
-                if abs(percentage_change) >= stock.threshold:
-                    # Check if alert already exists with these prices
-                    if not db.has_alert_for_price_date(stock.symbol, price_date, day_before_close, yesterday_close):
-                        alert = db.create_alert(
-                            symbol=stock.symbol,
-                            percentage_change=percentage_change,
-                            threshold_at_time=stock.threshold,
-                            price_before=day_before_close,
-                            price_after=yesterday_close,
-                            message_sent=False,
-                            notification_type=None,
-                            error_message=None
-                        )
-
-                        if alert:
-                            result["alert_triggered"] = True
-                            alerts_count += 1
-                    else:
-                        logger.info(
-                            f"Alert for {stock.symbol} with prices {day_before_close} -> {yesterday_close} already exists, skipping"
-                        )
-                        result["alert_already_exists"] = True
-
-            else:
-                result["error"] = "Failed to save price to database"
-                failed_count += 1
+            pending.append(db_pool.submit(
+                _persist_price_update,
+                db, stock, result, price_date, percentage_change, yesterday_close, day_before_close
+            ))
 
-        except Exception as e:
-            logger.error(f"Error updating {stock.symbol}: {str(e)}")
-            result["error"] = str(e)
-            failed_count += 1
+        results = [future.result() for future in pending]
 
-        results.append(result)
+    updated_count = sum(1 for r in results if r["success"])
+    failed_count = len(results) - updated_count
+    alerts_count = sum(1 for r in results if r["alert_triggered"])
 
     # Return summary
     return {
@@ -424,3 +382,85 @@ async def update_all_stock_prices(
         "alerts_triggered": alerts_count,
         "results": results
     }
+
+
+def _new_update_result(symbol: str) -> dict:
+    """Build the per-stock result entry returned by update-all-prices."""
+    return {
+        "symbol": symbol,
+        "success": False,
+        "price": None,
+        "change": None,
+        "alert_triggered": False,
+        "alert_already_exists": False,
+        "error": None
+    }
+
+
+def _completed(result: dict) -> Future:
+    """Wrap an already final result so it can be collected with the DB writes."""
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+def _persist_price_update(
+    db: DatabaseService,
+    stock,
+    result: dict,
+    price_date: datetime,
+    percentage_change: float,
+    yesterday_close: float,
+    day_before_close: float
+) -> dict:
+    """
+    Save the fetched price and, if needed, the alert for one stock.
+
+    Runs on the update-all-prices writer pool; errors are recorded in the
+    result instead of being raised so one stock never aborts the batch.
+    """
+    try:
+        price_record = db.add_price_history(
+            symbol=stock.symbol,
+            date=price_date,
+            close_price=yesterday_close,
+            previous_close=day_before_close,
+            percentage_change=percentage_change
+        )
+
+        if not price_record:
+            result["error"] = "Failed to save price to database"
+            return result
+
+        result["success"] = True
+        result["price"] = yesterday_close
+        result["change"] = percentage_change
+
+        # Check for alert
+        if abs(percentage_change) >= stock.threshold:
+            # Check if alert already exists with these prices
+            if not db.has_alert_for_price_date(stock.symbol, price_date, day_before_close, yesterday_close):
+                alert = db.create_alert(
+                    symbol=stock.symbol,
+                    percentage_change=percentage_change,
+                    threshold_at_time=stock.threshold,
+                    price_before=day_before_close,
+                    price_after=yesterday_close,
+                    message_sent=False,
+                    notification_type=None,
+                    error_message=None
+                )
+
+                if alert:
+                    result["alert_triggered"] = True
+            else:
+                logger.info(
+                    f"Alert for {stock.symbol} with prices {day_before_close} -> {yesterday_close} already exists, skipping"
+                )
+                result["alert_already_exists"] = True
+
+    except Exception as e:
+        logger.error(f"Error updating {stock.symbol}: {str(e)}")
+        result["error"] = str(e)
+
+    return result
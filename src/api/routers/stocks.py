@@ -14,13 +14,20 @@ from typing import Optional
 
 from ...database import DatabaseService
 from ..dependencies import get_db
+from ..orjson_response import ORJSONResponse
 from ..schemas import (
     StockCreate,
     StockUpdate,
     StockResponse,
     StockListResponse,
     MessageResponse,
-    ErrorResponse
+    ErrorResponse,
+    STOCK_LIST_ADAPTER,
+    construct_from_orm,
+    ERROR_EXAMPLE,
+    MESSAGE_EXAMPLE,
+    STOCK_EXAMPLE,
+    STOCK_LIST_EXAMPLE
 )
 
 # Crear router con prefijo y tags
@@ -43,11 +50,12 @@ router = APIRouter(
     responses={
         200: {
             "description": "Lista de stocks obtenida exitosamente",
-            "model": StockListResponse
+            "model": StockListResponse,
+            "content": {"application/json": {"example": STOCK_LIST_EXAMPLE}}
         }
     }
 )
-async def list_stocks(
+def list_stocks(
     only_active: bool = Query(
         False,
         description="Si es True, solo devuelve stocks activos"
@@ -64,12 +72,15 @@ async def list_stocks(
     - **total**: Número total de stocks
     - **stocks**: Lista de objetos Stock
     """
-    stocks = db.get_all_stocks(only_active=only_active)
+    stocks = db.get_stock_rows(only_active=only_active)
 
-    return StockListResponse(
-        total=len(stocks),
-        stocks=stocks
-    )
+    return ORJSONResponse({
+        "total": len(stocks),
+        "stocks": STOCK_LIST_ADAPTER.dump_python(
+            [construct_from_orm(StockResponse, stock) for stock in stocks],
+            mode="json"
+        )
+    })
 
 
 # =============================================================================
@@ -78,21 +89,23 @@ async def list_stocks(
 
 @router.get(
     "/{symbol}",
-    response_model=StockResponse,
+    response_model=None,  # Se devuelve ya serializada; schema en responses
     summary="Obtener stock por símbolo",
     description="Obtiene los detalles de un stock específico por su símbolo.",
     responses={
         200: {
             "description": "Stock encontrado",
-            "model": StockResponse
+            "model": StockResponse,
+            "content": {"application/json": {"example": STOCK_EXAMPLE}}
         },
         404: {
             "description": "Stock no encontrado",
-            "model": ErrorResponse
+            "model": ErrorResponse,
+            "content": {"application/json": {"example": ERROR_EXAMPLE}}
         }
     }
 )
-async def get_stock(
+def get_stock(
     symbol: str,
     db: DatabaseService = Depends(get_db)
 ):
@@ -116,7 +129,7 @@ async def get_stock(
             detail=f"Stock con símbolo '{symbol.upper()}' no encontrado"
         )
 
-    return stock
+    return ORJSONResponse(construct_from_orm(StockResponse, stock).model_dump(mode="json"))
 
 
 # =============================================================================
@@ -125,14 +138,15 @@ async def get_stock(
 
 @router.post(
     "",
-    response_model=StockResponse,
+    response_model=None,  # Se devuelve ya serializada; schema en responses
     status_code=status.HTTP_201_CREATED,
     summary="Crear nuevo stock",
     description="Crea un nuevo stock en el sistema para monitoreo.",
     responses={
         201: {
             "description": "Stock creado exitosamente",
-            "model": StockResponse
+            "model": StockResponse,
+            "content": {"application/json": {"example": STOCK_EXAMPLE}}
         },
         400: {
             "description": "Error de validación o stock ya existe",
@@ -140,7 +154,7 @@ async def get_stock(
         }
     }
 )
-async def create_stock(
+def create_stock(
     stock_data: StockCreate,
     db: DatabaseService = Depends(get_db)
 ):
@@ -175,7 +189,10 @@ async def create_stock(
             threshold=stock_data.threshold,
             is_active=stock_data.is_active
         )
-        return stock
+        return ORJSONResponse(
+            construct_from_orm(StockResponse, stock).model_dump(mode="json"),
+            status_code=status.HTTP_201_CREATED
+        )
 
     except Exception as e:
         raise HTTPException(
@@ -190,17 +207,19 @@ async def create_stock(
 
 @router.put(
     "/{symbol}",
-    response_model=StockResponse,
+    response_model=None,  # Se devuelve ya serializada; schema en responses
     summary="Actualizar stock",
     description="Actualiza los datos de un stock existente.",
     responses={
         200: {
             "description": "Stock actualizado exitosamente",
-            "model": StockResponse
+            "model": StockResponse,
+            "content": {"application/json": {"example": STOCK_EXAMPLE}}
         },
         404: {
             "description": "Stock no encontrado",
-            "model": ErrorResponse
+            "model": ErrorResponse,
+            "content": {"application/json": {"example": ERROR_EXAMPLE}}
         },
         400: {
             "description": "Error de validación",
@@ -208,7 +227,7 @@ async def create_stock(
         }
     }
 )
-async def update_stock(
+def update_stock(
     symbol: str,
     stock_data: StockUpdate,
     db: DatabaseService = Depends(get_db)
@@ -251,7 +270,7 @@ async def update_stock(
     # Actualizar
     try:
         updated_stock = db.update_stock(symbol, **update_data)
-        return updated_stock
+        return ORJSONResponse(construct_from_orm(StockResponse, updated_stock).model_dump(mode="json"))
 
     except Exception as e:
         raise HTTPException(
@@ -272,15 +291,17 @@ async def update_stock(
     responses={
         200: {
             "description": "Stock eliminado exitosamente",
-            "model": MessageResponse
+            "model": MessageResponse,
+            "content": {"application/json": {"example": MESSAGE_EXAMPLE}}
         },
         404: {
             "description": "Stock no encontrado",
-            "model": ErrorResponse
+            "model": ErrorResponse,
+            "content": {"application/json": {"example": ERROR_EXAMPLE}}
         }
     }
 )
-async def delete_stock(
+def delete_stock(
     symbol: str,
     db: DatabaseService = Depends(get_db)
 ):
@@ -310,10 +331,10 @@ async def delete_stock(
             detail=f"Stock con símbolo '{symbol.upper()}' no encontrado"
         )
 
-    return MessageResponse(
-        message=f"Stock '{symbol.upper()}' eliminado correctamente",
-        detail="Todos los datos relacionados (precios, alertas, noticias) también fueron eliminados"
-    )
+    return ORJSONResponse({
+        "message": f"Stock '{symbol.upper()}' eliminado correctamente",
+        "detail": "Todos los datos relacionados (precios, alertas, noticias) también fueron eliminados"
+    })
 
 
 # =============================================================================
@@ -322,21 +343,23 @@ async def delete_stock(
 
 @router.patch(
     "/{symbol}/toggle",
-    response_model=StockResponse,
+    response_model=None,  # Se devuelve ya serializada; schema en responses
     summary="Activar/Desactivar stock",
     description="Cambia el estado de activación de un stock (toggle).",
     responses={
         200: {
             "description": "Estado cambiado exitosamente",
-            "model": StockResponse
+            "model": StockResponse,
+            "content": {"application/json": {"example": STOCK_EXAMPLE}}
         },
         404: {
             "description": "Stock no encontrado",
-            "model": ErrorResponse
+            "model": ErrorResponse,
+            "content": {"application/json": {"example": ERROR_EXAMPLE}}
         }
     }
 )
-async def toggle_stock_active(
+def toggle_stock_active(
     symbol: str,
     db: DatabaseService = Depends(get_db)
 ):
@@ -366,4 +389,4 @@ async def toggle_stock_active(
     new_state = not stock.is_active
     updated_stock = db.update_stock(symbol, is_active=new_state)
 
-    return updated_stock
+    return ORJSONResponse(construct_from_orm(StockResponse, updated_stock).model_dump(mode="json"))
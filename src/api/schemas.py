@@ -10,8 +10,55 @@ Pydantic valida automáticamente los tipos y formatos.
 """
 
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, Field, ConfigDict
+from typing import Any, Optional, Type, TypeVar
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter, field_validator
+
+
+ResponseModelT = TypeVar("ResponseModelT", bound=BaseModel)
+
+# Configuración compartida por los schemas que se crean desde objetos SQLAlchemy.
+# Son inmutables: solo se construyen a partir de la BD y se serializan.
+_ORM_CONFIG = ConfigDict(from_attributes=True, frozen=True)
+
+# Decimales que se guardan en la BD (ver las columnas Numeric de models.py).
+# Los valores de entrada se redondean al validar para que lo que se devuelve
+# coincida con lo almacenado.
+THRESHOLD_DECIMALS = 2
+PRICE_DECIMALS = 4
+
+
+def construct_from_orm(model: Type[ResponseModelT], obj: Any) -> ResponseModelT:
+    """
+    Construye un schema de respuesta a partir de un objeto de la BD sin validarlo.
+
+    Los datos que devuelve SQLAlchemy ya tienen los tipos correctos, así que
+    model_construct evita repetir la validación campo a campo en cada fila.
+    Solo debe usarse con datos de la BD; los bodies de las peticiones se
+    siguen validando con normalidad.
+
+    Args:
+        model: Clase del schema de respuesta (ej: StockResponse)
+        obj: Objeto ORM (o fila) con un atributo por cada campo del schema
+
+    Returns:
+        Instancia del schema con los valores del objeto
+    """
+    return model.model_construct(
+        **{name: getattr(obj, name) for name in model.model_fields}
+    )
+
+
+def _round_threshold(value: float) -> float:
+    """
+    Redondea un umbral a THRESHOLD_DECIMALS decimales.
+
+    Se aplica después de gt=0, así que un umbral como 0.001 quedaría en 0;
+    en ese caso se rechaza igual que un umbral no positivo.
+    """
+    value = round(value, THRESHOLD_DECIMALS)
+    if value <= 0:
+        raise ValueError(f"El umbral debe ser > 0 con {THRESHOLD_DECIMALS} decimales")
+    return value
 
 
 # =============================================================================
@@ -46,6 +93,12 @@ class StockBase(BaseModel):
         examples=[5.0]
     )
 
+    @field_validator("threshold")
+    @classmethod
+    def round_threshold(cls, value: float) -> float:
+        """Redondea el umbral a la precisión de la columna."""
+        return _round_threshold(value)
+
 
 class StockCreate(StockBase):
     """
@@ -84,6 +137,12 @@ class StockUpdate(BaseModel):
         description="Nuevo estado de activación"
     )
 
+    @field_validator("threshold")
+    @classmethod
+    def round_threshold(cls, value: Optional[float]) -> Optional[float]:
+        """Redondea el umbral a la precisión de la columna."""
+        return None if value is None else _round_threshold(value)
+
 
 class StockResponse(StockBase):
     """
@@ -110,20 +169,7 @@ class StockResponse(StockBase):
     )
 
     # Configuración de Pydantic v2
-    model_config = ConfigDict(
-        from_attributes=True,  # Permite crear desde objetos SQLAlchemy
-        json_schema_extra={
-            "example": {
-                "id": 1,
-                "symbol": "TSLA",
-                "company_name": "Tesla Inc",
-                "threshold": 5.0,
-                "is_active": True,
-                "created_at": "2024-01-15T10:30:00",
-                "updated_at": "2024-01-15T10:30:00"
-            }
-        }
-    )
+    model_config = _ORM_CONFIG  # Permite crear desde objetos SQLAlchemy
 
 
 # =============================================================================
@@ -145,34 +191,6 @@ class StockListResponse(BaseModel):
         description="Lista de stocks"
     )
 
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "total": 2,
-                "stocks": [
-                    {
-                        "id": 1,
-                        "symbol": "TSLA",
-                        "company_name": "Tesla Inc",
-                        "threshold": 5.0,
-                        "is_active": True,
-                        "created_at": "2024-01-15T10:30:00",
-                        "updated_at": "2024-01-15T10:30:00"
-                    },
-                    {
-                        "id": 2,
-                        "symbol": "AAPL",
-                        "company_name": "Apple Inc",
-                        "threshold": 3.0,
-                        "is_active": True,
-                        "created_at": "2024-01-15T10:31:00",
-                        "updated_at": "2024-01-15T10:31:00"
-                    }
-                ]
-            }
-        }
-    )
-
 
 # =============================================================================
 # SCHEMAS PARA MENSAJES Y ERRORES
@@ -193,15 +211,6 @@ class MessageResponse(BaseModel):
         description="Detalles adicionales opcionales"
     )
 
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "message": "Stock eliminado correctamente",
-                "detail": "El stock TSLA fue eliminado junto con sus datos relacionados"
-            }
-        }
-    )
-
 
 class ErrorResponse(BaseModel):
     """
@@ -222,16 +231,6 @@ class ErrorResponse(BaseModel):
         description="Detalles técnicos del error"
     )
 
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "error": "NotFound",
-                "message": "Stock no encontrado",
-                "detail": "El stock con símbolo 'XYZ' no existe en la base de datos"
-            }
-        }
-    )
-
 
 # =============================================================================
 # SCHEMAS PARA PRICE HISTORY
@@ -241,7 +240,9 @@ class PriceHistoryBase(BaseModel):
     """
     Schema base para PriceHistory.
 
-    Contiene los campos comunes del histórico de precios.
+    Contiene los campos comunes del histórico de precios. Solo se usa en
+    respuestas (datos que ya vienen de la BD), por eso no lleva restricciones
+    como gt=0: la validación de entrada está en PriceHistoryCreate.
     """
     date: datetime = Field(
         ...,
@@ -249,12 +250,10 @@ class PriceHistoryBase(BaseModel):
     )
     close_price: float = Field(
         ...,
-        gt=0,
-        description="Precio de cierre (debe ser > 0)"
+        description="Precio de cierre"
     )
     previous_close: Optional[float] = Field(
         None,
-        gt=0,
         description="Precio de cierre anterior"
     )
     percentage_change: Optional[float] = Field(
@@ -267,7 +266,7 @@ class PriceHistoryCreate(BaseModel):
     """
     Schema para crear un registro de precio.
 
-    Usado en: POST /api/stocks/{symbol}/prices
+    Usado en: POST /api/stocks/{symbol}/prices y /prices/bulk
     Solo requiere date y close_price, el resto se calcula automáticamente.
     """
     date: datetime = Field(
@@ -281,6 +280,15 @@ class PriceHistoryCreate(BaseModel):
         examples=[250.75]
     )
 
+    @field_validator("close_price")
+    @classmethod
+    def round_close_price(cls, value: float) -> float:
+        """Redondea el precio a la precisión de la columna."""
+        value = round(value, PRICE_DECIMALS)
+        if value <= 0:
+            raise ValueError(f"El precio debe ser > 0 con {PRICE_DECIMALS} decimales")
+        return value
+
 
 class PriceHistoryResponse(PriceHistoryBase):
     """
@@ -302,20 +310,7 @@ class PriceHistoryResponse(PriceHistoryBase):
         description="Fecha de creación del registro"
     )
 
-    model_config = ConfigDict(
-        from_attributes=True,
-        json_schema_extra={
-            "example": {
-                "id": 1,
-                "stock_id": 1,
-                "date": "2024-01-15T00:00:00",
-                "close_price": 250.75,
-                "previous_close": 245.50,
-                "percentage_change": 2.14,
-                "created_at": "2024-01-15T10:30:00"
-            }
-        }
-    )
+    model_config = _ORM_CONFIG
 
 
 class PriceHistoryListResponse(BaseModel):
@@ -337,24 +332,62 @@ class PriceHistoryListResponse(BaseModel):
         description="Lista de precios históricos"
     )
 
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "symbol": "TSLA",
-                "total": 30,
-                "prices": [
-                    {
-                        "id": 1,
-                        "stock_id": 1,
-                        "date": "2024-01-15T00:00:00",
-                        "close_price": 250.75,
-                        "previous_close": 245.50,
-                        "percentage_change": 2.14,
-                        "created_at": "2024-01-15T10:30:00"
-                    }
-                ]
-            }
-        }
+
+class PriceHistoryBulkResponse(BaseModel):
+    """
+    Schema para el histórico de precios en formato columnar.
+
+    Usado en: GET /api/stocks/{symbol}/prices/bulk
+    Cada campo es una lista con un valor por registro (mismo índice = mismo
+    registro), lo que evita un objeto por fila en históricos largos.
+    """
+    symbol: str = Field(
+        ...,
+        description="Símbolo del stock"
+    )
+    total: int = Field(
+        ...,
+        description="Número total de registros"
+    )
+    ids: list[int] = Field(
+        ...,
+        description="IDs de los registros"
+    )
+    dates: list[datetime] = Field(
+        ...,
+        description="Fechas de los precios"
+    )
+    close_prices: list[float] = Field(
+        ...,
+        description="Precios de cierre"
+    )
+    previous_closes: list[Optional[float]] = Field(
+        ...,
+        description="Precios de cierre anteriores"
+    )
+    percentage_changes: list[Optional[float]] = Field(
+        ...,
+        description="Cambios porcentuales"
+    )
+
+
+class PriceHistoryBulkCreateResponse(BaseModel):
+    """
+    Schema de respuesta para la carga de precios en bloque.
+
+    Usado en: POST /api/stocks/{symbol}/prices/bulk
+    """
+    symbol: str = Field(
+        ...,
+        description="Símbolo del stock"
+    )
+    inserted: int = Field(
+        ...,
+        description="Número de registros insertados"
+    )
+    ids: list[int] = Field(
+        ...,
+        description="IDs de los registros insertados, ordenados por fecha"
     )
 
 
@@ -409,23 +442,7 @@ class AlertResponse(BaseModel):
         description="Fecha y hora en que se disparó la alerta"
     )
 
-    model_config = ConfigDict(
-        from_attributes=True,
-        json_schema_extra={
-            "example": {
-                "id": 1,
-                "stock_id": 1,
-                "percentage_change": 6.5,
-                "threshold_at_time": 5.0,
-                "price_before": 250.00,
-                "price_after": 266.25,
-                "message_sent": True,
-                "notification_type": "whatsapp",
-                "error_message": None,
-                "triggered_at": "2024-01-15T10:30:00"
-            }
-        }
-    )
+    model_config = _ORM_CONFIG
 
 
 class AlertListResponse(BaseModel):
@@ -443,28 +460,6 @@ class AlertListResponse(BaseModel):
         description="Lista de alertas"
     )
 
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "total": 5,
-                "alerts": [
-                    {
-                        "id": 1,
-                        "stock_id": 1,
-                        "percentage_change": 6.5,
-                        "threshold_at_time": 5.0,
-                        "price_before": 250.00,
-                        "price_after": 266.25,
-                        "message_sent": True,
-                        "notification_type": "whatsapp",
-                        "error_message": None,
-                        "triggered_at": "2024-01-15T10:30:00"
-                    }
-                ]
-            }
-        }
-    )
-
 
 # =============================================================================
 # SCHEMAS PARA DASHBOARD
@@ -493,17 +488,6 @@ class DashboardSummaryResponse(BaseModel):
         description="Fecha de la última actualización de precios"
     )
 
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "total_stocks": 8,
-                "active_stocks": 7,
-                "recent_alerts_24h": 3,
-                "last_price_update": "2024-01-15T14:30:00"
-            }
-        }
-    )
-
 
 # =============================================================================
 # SCHEMAS PARA NEWS ARTICLES
@@ -609,20 +593,7 @@ class NewsArticleResponse(BaseModel):
         description="Unsplash download endpoint (for tracking)"
     )
 
-    model_config = ConfigDict(
-        from_attributes=True,
-        json_schema_extra={
-            "example": {
-                "id": 1,
-                "stock_id": 1,
-                "title": "Tesla anuncia nuevo modelo eléctrico",
-                "description": "La compañía ha revelado detalles sobre su próximo vehículo...",
-                "url": "https://example.com/tesla-news",
-                "published_at": "2024-01-15T10:00:00",
-                "fetched_at": "2024-01-15T10:30:00"
-            }
-        }
-    )
+    model_config = _ORM_CONFIG
 
 
 class NewsArticleListResponse(BaseModel):
@@ -644,22 +615,168 @@ class NewsArticleListResponse(BaseModel):
         description="Lista de noticias"
     )
 
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "symbol": "TSLA",
-                "total": 5,
-                "news": [
-                    {
-                        "id": 1,
-                        "stock_id": 1,
-                        "title": "Tesla anuncia nuevo modelo eléctrico",
-                        "description": "La compañía ha revelado detalles...",
-                        "url": "https://example.com/tesla-news",
-                        "published_at": "2024-01-15T10:00:00",
-                        "fetched_at": "2024-01-15T10:30:00"
-                    }
-                ]
-            }
+
+# =============================================================================
+# ADAPTERS PARA SERIALIZAR LISTAS
+# =============================================================================
+# Los endpoints de listado serializan las filas directamente con estos
+# adapters (creados una sola vez al importar el módulo) en lugar de
+# instanciar el schema contenedor (StockListResponse, etc.) en cada request.
+
+STOCK_LIST_ADAPTER = TypeAdapter(list[StockResponse])
+PRICE_LIST_ADAPTER = TypeAdapter(list[PriceHistoryResponse])
+ALERT_LIST_ADAPTER = TypeAdapter(list[AlertResponse])
+NEWS_LIST_ADAPTER = TypeAdapter(list[NewsArticleResponse])
+
+
+# =============================================================================
+# EJEMPLOS PARA LA DOCUMENTACIÓN (OpenAPI)
+# =============================================================================
+# Los ejemplos se adjuntan en los decoradores de las rutas (argumento
+# responses) en lugar de en el model_config de cada schema, así que solo
+# se usan al generar la documentación.
+
+STOCK_EXAMPLE = {
+    "id": 1,
+    "symbol": "TSLA",
+    "company_name": "Tesla Inc",
+    "threshold": 5.0,
+    "is_active": True,
+    "created_at": "2024-01-15T10:30:00",
+    "updated_at": "2024-01-15T10:30:00"
+}
+
+STOCK_LIST_EXAMPLE = {
+    "total": 2,
+    "stocks": [
+        {
+            "id": 1,
+            "symbol": "TSLA",
+            "company_name": "Tesla Inc",
+            "threshold": 5.0,
+            "is_active": True,
+            "created_at": "2024-01-15T10:30:00",
+            "updated_at": "2024-01-15T10:30:00"
+        },
+        {
+            "id": 2,
+            "symbol": "AAPL",
+            "company_name": "Apple Inc",
+            "threshold": 3.0,
+            "is_active": True,
+            "created_at": "2024-01-15T10:31:00",
+            "updated_at": "2024-01-15T10:31:00"
         }
-    )
+    ]
+}
+
+MESSAGE_EXAMPLE = {
+    "message": "Stock eliminado correctamente",
+    "detail": "El stock TSLA fue eliminado junto con sus datos relacionados"
+}
+
+ERROR_EXAMPLE = {
+    "error": "NotFound",
+    "message": "Stock no encontrado",
+    "detail": "El stock con símbolo 'XYZ' no existe en la base de datos"
+}
+
+PRICE_EXAMPLE = {
+    "id": 1,
+    "stock_id": 1,
+    "date": "2024-01-15T00:00:00",
+    "close_price": 250.75,
+    "previous_close": 245.50,
+    "percentage_change": 2.14,
+    "created_at": "2024-01-15T10:30:00"
+}
+
+PRICE_LIST_EXAMPLE = {
+    "symbol": "TSLA",
+    "total": 30,
+    "prices": [
+        {
+            "id": 1,
+            "stock_id": 1,
+            "date": "2024-01-15T00:00:00",
+            "close_price": 250.75,
+            "previous_close": 245.50,
+            "percentage_change": 2.14,
+            "created_at": "2024-01-15T10:30:00"
+        }
+    ]
+}
+
+PRICE_BULK_EXAMPLE = {
+    "symbol": "TSLA",
+    "total": 2,
+    "ids": [2, 1],
+    "dates": ["2024-01-15T00:00:00", "2024-01-14T00:00:00"],
+    "close_prices": [250.75, 245.50],
+    "previous_closes": [245.50, None],
+    "percentage_changes": [2.14, None]
+}
+
+ALERT_EXAMPLE = {
+    "id": 1,
+    "stock_id": 1,
+    "percentage_change": 6.5,
+    "threshold_at_time": 5.0,
+    "price_before": 250.00,
+    "price_after": 266.25,
+    "message_sent": True,
+    "notification_type": "whatsapp",
+    "error_message": None,
+    "triggered_at": "2024-01-15T10:30:00"
+}
+
+ALERT_LIST_EXAMPLE = {
+    "total": 5,
+    "alerts": [
+        {
+            "id": 1,
+            "stock_id": 1,
+            "percentage_change": 6.5,
+            "threshold_at_time": 5.0,
+            "price_before": 250.00,
+            "price_after": 266.25,
+            "message_sent": True,
+            "notification_type": "whatsapp",
+            "error_message": None,
+            "triggered_at": "2024-01-15T10:30:00"
+        }
+    ]
+}
+
+DASHBOARD_SUMMARY_EXAMPLE = {
+    "total_stocks": 8,
+    "active_stocks": 7,
+    "recent_alerts_24h": 3,
+    "last_price_update": "2024-01-15T14:30:00"
+}
+
+NEWS_ARTICLE_EXAMPLE = {
+    "id": 1,
+    "stock_id": 1,
+    "title": "Tesla anuncia nuevo modelo eléctrico",
+    "description": "La compañía ha revelado detalles sobre su próximo vehículo...",
+    "url": "https://example.com/tesla-news",
+    "published_at": "2024-01-15T10:00:00",
+    "fetched_at": "2024-01-15T10:30:00"
+}
+
+NEWS_LIST_EXAMPLE = {
+    "symbol": "TSLA",
+    "total": 5,
+    "news": [
+        {
+            "id": 1,
+            "stock_id": 1,
+            "title": "Tesla anuncia nuevo modelo eléctrico",
+            "description": "La compañía ha revelado detalles...",
+            "url": "https://example.com/tesla-news",
+            "published_at": "2024-01-15T10:00:00",
+            "fetched_at": "2024-01-15T10:30:00"
+        }
+    ]
+}
@@ -34,6 +34,24 @@ class Config:
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///stock_monitor.db")
     DATABASE_ECHO = False  # Set to True for SQL query debugging
 
+    # Connection pool sizing (ignored for SQLite, which uses a single-thread pool).
+    # update-all-prices writes from several workers at once, so the pool must
+    # cover the worker count plus the API's own concurrent requests:
+    # pool_size connections stay open, max_overflow extra ones are opened
+    # under bursts, pool_timeout is how long a request waits for a free
+    # connection and pool_recycle drops connections before the server does.
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds
+    # Test each pooled connection with a lightweight ping before handing it
+    # out, so connections dropped while idle are replaced instead of failing
+    # the request that picks them up
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    # Threads persisting prices/alerts while the next stock is being fetched
+    # (capped at DB_POOL_SIZE so writers never wait on the pool)
+    DB_WRITE_WORKERS = int(os.getenv("DB_WRITE_WORKERS", "4"))
+
     # API Endpoints
     ALPHA_VANTAGE_ENDPOINT = "https://www.alphavantage.co/query"
     NEWS_API_ENDPOINT = "https://newsapi.org/v2/everything"
@@ -42,10 +60,30 @@ class Config:
     # Request Settings
     API_TIMEOUT = 10  # seconds
     REQUEST_DELAY = 1  # seconds between API calls
+    FETCH_WORKERS = 8  # concurrent requests when fetching for many stocks
+    ALPHA_VANTAGE_WORKERS = int(os.getenv("ALPHA_VANTAGE_WORKERS", "5"))  # concurrent Alpha Vantage calls in the scheduler
+    # Fetch scheduled prices with REALTIME_BULK_QUOTES (premium plans only),
+    # falling back to one request per symbol for anything it misses
+    ALPHA_VANTAGE_BULK_QUOTES = os.getenv("ALPHA_VANTAGE_BULK_QUOTES", "false").lower() == "true"
+    UNSPLASH_CACHE_TTL = 3600  # seconds a fallback image search is reused
+    ALPHA_VANTAGE_CACHE_TTL = 3600  # seconds a daily price series is reused
+    TWILIO_SEND_WORKERS = 4  # concurrent Twilio requests when sending pending alerts
+
+    # Pooled HTTP session shared by the fetchers (see src/http_session.py)
+    HTTP_POOL_CONNECTIONS = 10  # hosts kept in the pool
+    HTTP_POOL_MAXSIZE = 20  # keep-alive connections per host
+    HTTP_MAX_RETRIES = 3  # retries on connection errors, 429 and 5xx
+    HTTP_BACKOFF_FACTOR = 0.3  # seconds, doubled on each retry
 
     # Logging Settings
     LOG_MAX_BYTES = 10 * 1024 * 1024  # 10 MB
     LOG_BACKUP_COUNT = 5
+    LOG_FILE_LEVEL = os.getenv("LOG_FILE_LEVEL", "DEBUG").upper()  # e.g. INFO to skip DEBUG records entirely
+    LOG_CONSOLE_LEVEL = os.getenv("LOG_CONSOLE_LEVEL", "INFO").upper()
+    # Log file records below this level are buffered and written in chunks:
+    # faster, but the file lags behind and a hard kill loses the buffer.
+    # INFO (or DEBUG) writes every record out as it is logged
+    LOG_FLUSH_LEVEL = os.getenv("LOG_FLUSH_LEVEL", "WARNING").upper()
     LOG_FORMAT_FILE = '%(asctime)s | %(levelname)-8s | %(funcName)-20s | %(message)s'
     LOG_FORMAT_CONSOLE = '%(levelname)-8s | %(message)s'
     LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
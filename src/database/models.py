@@ -8,24 +8,95 @@ Define las tablas y relaciones para almacenar:
 - Noticias archivadas
 """
 
-from datetime import datetime
 from sqlalchemy import (
     Column,
     Integer,
     String,
-    Float,
+    Numeric,
     DateTime,
     Boolean,
     Text,
     ForeignKey,
+    Index,
+    TypeDecorator,
     create_engine
 )
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import DeclarativeBase, relationship
+from sqlalchemy.sql.functions import FunctionElement
 
-# Base declarativa para todos los modelos
-# Todos los modelos heredarán de esta clase
-Base = declarative_base()
+class Base(DeclarativeBase):
+    """
+    Base declarativa para todos los modelos.
+
+    Todos los modelos heredarán de esta clase.
+
+    eager_defaults hace que los valores generados por la BD (id, created_at,
+    updated_at...) se lean en el propio INSERT/UPDATE (con RETURNING cuando
+    la BD lo soporta), de modo que el objeto queda completo tras el flush sin
+    necesidad de un session.refresh().
+    """
+    __mapper_args__ = {"eager_defaults": True}
+
+
+class FloatNumeric(TypeDecorator):
+    """
+    Columna NUMERIC(precision, scale) que se lee siempre como float.
+
+    Numeric(asdecimal=False) no basta: en SQLite los valores enteros
+    (p. ej. un umbral de 5) vuelven como int. Aquí se convierten a float
+    al leerlos, en cualquier base de datos.
+    """
+    impl = Numeric
+    cache_ok = True
+
+    def __init__(self, precision: int, scale: int):
+        super().__init__(precision, scale, asdecimal=False)
+
+    def process_result_value(self, value, dialect):
+        return float(value) if value is not None else None
+
+
+class utcnow(FunctionElement):
+    """
+    Fecha y hora actuales en UTC, calculadas por la base de datos.
+
+    Las columnas de fecha son DateTime sin zona horaria y el servicio las
+    compara con datetime.utcnow(), así que el valor guardado tiene que ser
+    UTC. now() de PostgreSQL en una columna sin zona horaria queda en la
+    zona de la sesión, y CURRENT_TIMESTAMP de SQLite pierde las fracciones
+    de segundo (filas creadas en el mismo segundo empatarían al ordenar).
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _compile_utcnow(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _compile_utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow, "sqlite")
+def _compile_utcnow_sqlite(element, compiler, **kw):
+    # 'now' es UTC en SQLite; %f incluye los milisegundos
+    return "STRFTIME('%Y-%m-%d %H:%M:%f', 'now')"
+
+
+def _timestamp_column(**kwargs) -> Column:
+    """
+    Columna de fecha rellenada por la base de datos con utcnow().
+
+    server_default declara el valor por defecto en el DDL de las tablas
+    nuevas; default=utcnow() lo incluye además en el propio INSERT, de modo
+    que las tablas creadas antes de este cambio (sin DEFAULT en la columna)
+    también lo reciben. En ningún caso se ejecuta código Python por fila.
+    """
+    return Column(DateTime, default=utcnow(), server_default=utcnow(), **kwargs)
 
 
 class Stock(Base):
@@ -41,22 +112,28 @@ class Stock(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     symbol = Column(String(10), unique=True, nullable=False, index=True)  # Ej: TSLA, AAPL
     company_name = Column(String(100), nullable=False)  # Ej: Tesla Inc
-    threshold = Column(Float, nullable=False)  # Umbral de alerta en porcentaje
+    threshold = Column(FloatNumeric(5, 2), nullable=False)  # Umbral de alerta en porcentaje
     is_active = Column(Boolean, default=True)  # Si está activo para monitoreo
-    created_at = Column(DateTime, default=datetime.utcnow)  # Fecha de creación
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = _timestamp_column()  # Fecha de creación
+    updated_at = _timestamp_column(onupdate=utcnow())
+
+    # Relaciones. Solo propagan el guardado: el borrado de los datos
+    # relacionados lo hace DatabaseService.delete_stock con DELETEs explícitos,
+    # así una actualización del stock nunca tiene que recorrer sus colecciones.
 
     # Relaciones: Un stock tiene muchos precios históricos
-    price_history = relationship('PriceHistory', back_populates='stock', cascade='all, delete-orphan')
+    price_history = relationship('PriceHistory', back_populates='stock', cascade='save-update')
 
     # Relaciones: Un stock tiene muchas alertas
-    alerts = relationship('Alert', back_populates='stock', cascade='all, delete-orphan')
+    alerts = relationship('Alert', back_populates='stock', cascade='save-update')
 
     # Relaciones: Un stock tiene muchas noticias
-    news_articles = relationship('NewsArticle', back_populates='stock', cascade='all, delete-orphan')
+    news_articles = relationship('NewsArticle', back_populates='stock', cascade='save-update')
 
     def __repr__(self):
         """Representación legible del objeto Stock."""
+        if not __debug__:
+            return f"<Stock id={self.id}>"
         return f"<Stock(symbol='{self.symbol}', company='{self.company_name}', threshold={self.threshold}%)>"
 
 
@@ -68,21 +145,30 @@ class PriceHistory(Base):
     para cada día que se consulta el stock.
     """
     __tablename__ = 'price_history'
+    __table_args__ = (
+        # Histórico de un stock ordenado por fecha (GET /stocks/{symbol}/prices)
+        Index('ix_price_history_stock_date', 'stock_id', 'date'),
+    )
 
     # Columnas de la tabla
     id = Column(Integer, primary_key=True, autoincrement=True)
-    stock_id = Column(Integer, ForeignKey('stocks.id'), nullable=False)  # Referencia al stock
+    stock_id = Column(Integer, ForeignKey('stocks.id', ondelete='CASCADE'), nullable=False)  # Referencia al stock
     date = Column(DateTime, nullable=False, index=True)  # Fecha del precio
-    close_price = Column(Float, nullable=False)  # Precio de cierre
-    previous_close = Column(Float)  # Precio de cierre anterior
-    percentage_change = Column(Float)  # Cambio porcentual calculado
-    created_at = Column(DateTime, default=datetime.utcnow)  # Cuándo se guardó este registro
+    close_price = Column(FloatNumeric(12, 4), nullable=False)  # Precio de cierre
+    previous_close = Column(FloatNumeric(12, 4))  # Precio de cierre anterior
+    percentage_change = Column(FloatNumeric(10, 4))  # Cambio porcentual calculado
+    # Cuándo se guardó este registro. Indexada para el último precio del
+    # dashboard (ORDER BY created_at DESC LIMIT 1), que se resuelve recorriendo
+    # el índice hacia atrás.
+    created_at = _timestamp_column(index=True)
 
     # Relación inversa: Este precio pertenece a un stock
     stock = relationship('Stock', back_populates='price_history')
 
     def __repr__(self):
         """Representación legible del objeto PriceHistory."""
+        if not __debug__:
+            return f"<PriceHistory id={self.id}>"
         change_str = f"{self.percentage_change:+.2f}%" if self.percentage_change is not None else "N/A"
         return (f"<PriceHistory(stock_id={self.stock_id}, date={self.date.date()}, "
                 f"price=${self.close_price:.2f}, change={change_str})>")
@@ -96,15 +182,21 @@ class Alert(Base):
     incluyendo el motivo, el cambio detectado y si se envió exitosamente.
     """
     __tablename__ = 'alerts'
+    __table_args__ = (
+        # Alertas de un stock ordenadas por fecha (GET /alerts/{symbol})
+        Index('ix_alerts_stock_triggered', 'stock_id', 'triggered_at'),
+        # Detección de alertas duplicadas (has_alert_for_price_date)
+        Index('ix_alerts_stock_prices', 'stock_id', 'price_before', 'price_after'),
+    )
 
     # Columnas de la tabla
     id = Column(Integer, primary_key=True, autoincrement=True)
-    stock_id = Column(Integer, ForeignKey('stocks.id'), nullable=False)
-    triggered_at = Column(DateTime, default=datetime.utcnow, index=True)  # Cuándo se disparó
-    percentage_change = Column(Float, nullable=False)  # Cambio que causó la alerta
-    threshold_at_time = Column(Float, nullable=False)  # Umbral configurado en ese momento
-    price_before = Column(Float)  # Precio anterior
-    price_after = Column(Float)  # Precio nuevo
+    stock_id = Column(Integer, ForeignKey('stocks.id', ondelete='CASCADE'), nullable=False)
+    triggered_at = _timestamp_column(index=True)  # Cuándo se disparó
+    percentage_change = Column(FloatNumeric(10, 4), nullable=False)  # Cambio que causó la alerta
+    threshold_at_time = Column(FloatNumeric(5, 2), nullable=False)  # Umbral configurado en ese momento
+    price_before = Column(FloatNumeric(12, 4))  # Precio anterior
+    price_after = Column(FloatNumeric(12, 4))  # Precio nuevo
     message_sent = Column(Boolean, default=False)  # Si se envió el mensaje
     notification_type = Column(String(20))  # 'whatsapp' o 'sms'
     error_message = Column(Text)  # Si hubo error al enviar
@@ -114,6 +206,8 @@ class Alert(Base):
 
     def __repr__(self):
         """Representación legible del objeto Alert."""
+        if not __debug__:
+            return f"<Alert id={self.id}>"
         sent = "✓" if self.message_sent else "✗"
         return (f"<Alert({sent} stock_id={self.stock_id}, "
                 f"change={self.percentage_change:+.2f}%, at={self.triggered_at.date()})>")
@@ -127,17 +221,24 @@ class NewsArticle(Base):
     permitiendo consultar el contexto histórico.
     """
     __tablename__ = 'news_articles'
+    __table_args__ = (
+        # Noticias de un stock, las últimas guardadas primero (GET /stocks/{symbol}/news)
+        Index('ix_news_stock_fetched', 'stock_id', 'fetched_at'),
+        # Una misma URL solo se guarda una vez por stock (las noticias sin
+        # URL no cuentan: NULL nunca choca con el índice único)
+        Index('ux_news_stock_url', 'stock_id', 'url', unique=True),
+    )
 
     # Columnas de la tabla
     id = Column(Integer, primary_key=True, autoincrement=True)
-    stock_id = Column(Integer, ForeignKey('stocks.id'), nullable=False)
+    stock_id = Column(Integer, ForeignKey('stocks.id', ondelete='CASCADE'), nullable=False)
     title = Column(String(500), nullable=False)  # Título de la noticia
     description = Column(Text)  # Descripción o resumen
     url = Column(String(1000))  # URL a la noticia original
     image_url = Column(String(1000))  # URL de la imagen de la noticia
     source = Column(String(200))  # Fuente de la noticia (ej: "Bloomberg", "Reuters")
     published_at = Column(DateTime)  # Fecha de publicación de la noticia
-    fetched_at = Column(DateTime, default=datetime.utcnow)  # Cuándo la obtuvimos
+    fetched_at = _timestamp_column()  # Cuándo la obtuvimos
 
     # Unsplash attribution (required by Unsplash API Guidelines when using fallback images)
     photographer_name = Column(String(200))  # Photographer's name from Unsplash
@@ -150,6 +251,8 @@ class NewsArticle(Base):
 
     def __repr__(self):
         """Representación legible del objeto NewsArticle."""
+        if not __debug__:
+            return f"<NewsArticle id={self.id}>"
         return f"<NewsArticle(stock_id={self.stock_id}, title='{self.title[:50]}...')>"
 
 
@@ -6,19 +6,44 @@ Proporciona una interfaz limpia para interactuar con la persistencia de datos.
 """
 
 import logging
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 from contextlib import contextmanager
 
-from sqlalchemy import create_engine, desc
+from sqlalchemy import and_, case, create_engine, delete, desc, exists, func, insert, or_, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine, Row, make_url
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import SQLAlchemyError
 
-from .models import Base, Stock, PriceHistory, Alert, NewsArticle
+from .models import Base, Stock, PriceHistory, Alert, NewsArticle, utcnow
 from ..config import config
 
 logger = logging.getLogger(__name__)
 
+# Segundos durante los que se reutiliza el total de stocks cacheado
+STOCK_COUNT_CACHE_TTL = 30
+
+# Segundos durante los que se reutiliza el resumen del dashboard
+DASHBOARD_CACHE_TTL = 30
+
+# Segundos durante los que se reutiliza el ID resuelto para un símbolo
+STOCK_ID_CACHE_TTL = 300
+
+# Cache (BD, símbolo) -> (instante de expiración, ID del stock), compartida
+# por todos los servicios del proceso: si uno elimina y recrea un stock, los
+# demás (p. ej. API y scheduler) dejan de usar el ID antiguo
+_stock_id_cache: Dict[Tuple[str, str], Tuple[float, int]] = {}
+_stock_id_cache_lock = threading.Lock()
+
+
+def clear_stock_id_cache() -> None:
+    """Vacía la cache de IDs de stock compartida (útil en tests)."""
+    with _stock_id_cache_lock:
+        _stock_id_cache.clear()
+
 
 class DatabaseService:
     """
@@ -28,36 +53,96 @@ class DatabaseService:
     de base de datos. Maneja la conexión, sesiones y transacciones.
     """
 
-    def __init__(self, database_url: Optional[str] = None):
+    def __init__(
+        self,
+        database_url: Optional[str] = None,
+        engine_options: Optional[Dict[str, Any]] = None,
+        engine: Optional[Engine] = None,
+    ):
         """
         Inicializa el servicio de base de datos.
 
         Args:
             database_url: URL de conexión a la base de datos.
                          Si no se proporciona, usa la configuración por defecto.
+            engine_options: Argumentos extra para create_engine (p. ej.
+                           poolclass=StaticPool en los tests); tienen
+                           prioridad sobre los calculados aquí.
+            engine: Engine ya creado que se reutiliza en lugar de crear
+                    uno nuevo (p. ej. uno compartido entre tests).
         """
-        # Usar URL proporcionada o la de configuración
+        # Usar URL proporcionada, la del engine recibido o la de configuración
+        if engine is not None:
+            database_url = database_url or str(engine.url)
         self.database_url = database_url or config.DATABASE_URL
 
-        # Configurar engine según el tipo de base de datos
-        engine_kwargs = {"echo": config.DATABASE_ECHO}
+        # Configurar engine según el tipo de base de datos.
+        # insertmanyvalues_page_size: filas por sentencia en los INSERT
+        # multi-fila con RETURNING (ver bulk_add_price_history)
+        engine_kwargs = {
+            "echo": config.DATABASE_ECHO,
+            "insertmanyvalues_page_size": 1000,
+        }
 
         # SQLite requiere check_same_thread=False para FastAPI
         # PostgreSQL y otras bases de datos no necesitan este parámetro
         if self.database_url.startswith("sqlite"):
             engine_kwargs["connect_args"] = {"check_same_thread": False}
+        else:
+            # Pool dimensionado para las escrituras en paralelo de
+            # update-all-prices (ver Config.DB_POOL_*)
+            engine_kwargs.update(
+                pool_size=config.DB_POOL_SIZE,
+                max_overflow=config.DB_MAX_OVERFLOW,
+                pool_timeout=config.DB_POOL_TIMEOUT,
+                pool_recycle=config.DB_POOL_RECYCLE,
+                pool_pre_ping=config.DB_POOL_PRE_PING,
+            )
+
+            # Con psycopg2, los executemany que no son INSERT (UPDATE/DELETE
+            # con varios parámetros) se agrupan con execute_batch en lugar de
+            # enviarse fila a fila. Los INSERT ya van en bloques de
+            # insertmanyvalues_page_size filas.
+            if make_url(self.database_url).get_dialect().driver == "psycopg2":
+                engine_kwargs.update(
+                    executemany_mode="values_plus_batch",
+                    executemany_batch_page_size=500,
+                )
 
-        # Crear engine de SQLAlchemy
-        self.engine = create_engine(self.database_url, **engine_kwargs)
+        if engine_options:
+            engine_kwargs.update(engine_options)
+
+        # Crear engine de SQLAlchemy (salvo que se reciba uno ya creado)
+        self.engine = engine if engine is not None else create_engine(self.database_url, **engine_kwargs)
 
         # Crear fábrica de sesiones
         # Las sesiones son la forma de interactuar con la BD en SQLAlchemy
         self.SessionLocal = sessionmaker(
             autocommit=False,  # Las transacciones se controlan manualmente
             autoflush=False,   # No hacer flush automático
+            # Los objetos devueltos siguen siendo válidos tras el commit: sus
+            # atributos no se expiran, así que no hace falta recargarlos
+            expire_on_commit=False,
             bind=self.engine
         )
 
+        # Cache del total de stocks: (instante de expiración, total)
+        self._stock_count_cache: Optional[Tuple[float, int]] = None
+
+        # Cache del resumen del dashboard: (instante de expiración, resumen)
+        self._dashboard_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+
+        # Ámbito de esta BD en la cache compartida de IDs de stock. Las BD en
+        # memoria son distintas en cada engine aunque compartan la URL
+        url = self.engine.url
+        self._stock_id_scope = url.render_as_string(hide_password=True)
+        if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+            self._stock_id_scope += f"#{id(self.engine)}"
+
+        # Índices de los modelos que no se pudieron crear en la BD (ver
+        # _create_missing_indexes); sin ux_news_stock_url no hay ON CONFLICT
+        self._missing_indexes: Set[str] = set()
+
         logger.info(f"DatabaseService inicializado con: {self.database_url}")
 
     def create_tables(self):
@@ -65,6 +150,8 @@ class DatabaseService:
         Crea todas las tablas definidas en los modelos.
 
         Este método es idempotente: si las tablas ya existen, no hace nada.
+        También crea los índices que falten en tablas ya existentes (ver
+        _create_missing_indexes).
         """
         try:
             Base.metadata.create_all(self.engine)
@@ -73,6 +160,28 @@ class DatabaseService:
             logger.error(f"Error al crear tablas: {str(e)}")
             raise
 
+        self._create_missing_indexes()
+
+    def _create_missing_indexes(self):
+        """
+        Crea los índices de los modelos que no existan todavía en la BD.
+
+        create_all() solo crea índices junto con tablas nuevas, así que los
+        índices añadidos después a los modelos no llegarían a una base de
+        datos existente. Un índice que no se pueda crear (p. ej. uno único
+        sobre filas ya duplicadas) se registra como warning sin impedir el
+        arranque, y se anota en _missing_indexes para que las operaciones
+        que dependen de él usen un camino alternativo.
+        """
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                try:
+                    index.create(bind=self.engine, checkfirst=True)
+                    self._missing_indexes.discard(index.name)
+                except SQLAlchemyError as e:
+                    logger.warning(f"No se pudo crear el índice {index.name}: {str(e)}")
+                    self._missing_indexes.add(index.name)
+
     def drop_tables(self):
         """
         Elimina todas las tablas de la base de datos.
@@ -88,23 +197,31 @@ class DatabaseService:
             raise
 
     @contextmanager
-    def get_session(self) -> Session:
+    def get_session(self, write: bool = True) -> Session:
         """
         Context manager para obtener una sesión de base de datos.
 
         Garantiza que la sesión se cierre correctamente incluso si hay errores.
 
+        Las sesiones de solo lectura (write=False) no hacen COMMIT al salir:
+        al cerrarse la sesión la transacción termina con un ROLLBACK, que no
+        tiene nada que deshacer ni escribir en el log de la BD.
+
         Uso:
             with db_service.get_session() as session:
                 stock = session.query(Stock).first()
 
+        Args:
+            write: Si la sesión modifica datos y debe confirmarse al salir
+
         Yields:
             Session de SQLAlchemy
         """
         session = self.SessionLocal()
         try:
             yield session
-            session.commit()  # Commit automático si todo va bien
+            if write:
+                session.commit()  # Commit automático si todo va bien
         except Exception as e:
             session.rollback()  # Rollback si hay error
             logger.error(f"Error en sesión de BD: {str(e)}")
@@ -112,6 +229,79 @@ class DatabaseService:
         finally:
             session.close()  # Siempre cerrar la sesión
 
+    def _insert_ignoring_conflicts(self, model, index_elements: List[str]):
+        """
+        Construye un INSERT que ignora las filas duplicadas.
+
+        En PostgreSQL y SQLite genera INSERT ... ON CONFLICT (...) DO NOTHING,
+        de modo que la comprobación de duplicados la hace la propia BD en la
+        misma sentencia. En otros motores devuelve un INSERT normal y el
+        duplicado se notifica con IntegrityError.
+
+        Args:
+            model: Modelo en el que insertar
+            index_elements: Columnas de la restricción única
+
+        Returns:
+            Sentencia INSERT lista para añadir .values() y .returning()
+        """
+        dialect_insert = {
+            "postgresql": postgresql.insert,
+            "sqlite": sqlite.insert,
+        }.get(self.engine.dialect.name)
+
+        if dialect_insert is None:
+            return insert(model)
+        return dialect_insert(model).on_conflict_do_nothing(index_elements=index_elements)
+
+    def _get_stock_id(self, session: Session, symbol: str) -> Optional[int]:
+        """
+        Obtiene el ID de un stock dentro de una sesión ya abierta.
+
+        Las operaciones que solo necesitan el ID lo resuelven en la misma
+        sesión (y transacción) que la operación principal, en lugar de abrir
+        otra sesión con get_stock_by_symbol.
+
+        Los IDs encontrados se cachean durante STOCK_ID_CACHE_TTL segundos
+        (los stocks cambian muy poco) en una cache compartida por todos los
+        servicios del proceso sobre la misma BD, y se invalidan al crear,
+        actualizar o eliminar el stock desde cualquiera de ellos. Los
+        símbolos inexistentes no se cachean.
+
+        Args:
+            session: Sesión activa
+            symbol: Símbolo del stock
+
+        Returns:
+            ID del stock o None si no existe
+        """
+        key = (self._stock_id_scope, symbol.upper())
+
+        with _stock_id_cache_lock:
+            cached = _stock_id_cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        stock_id = session.execute(
+            select(Stock.id).where(Stock.symbol == key[1])
+        ).scalar()
+
+        if stock_id is not None:
+            with _stock_id_cache_lock:
+                _stock_id_cache[key] = (time.monotonic() + STOCK_ID_CACHE_TTL, stock_id)
+        return stock_id
+
+    def _forget_stock_ids(self, *symbols: str) -> None:
+        """
+        Elimina símbolos de la cache compartida de IDs de stock.
+
+        Args:
+            symbols: Símbolos cuyo ID ha podido cambiar
+        """
+        with _stock_id_cache_lock:
+            for symbol in symbols:
+                _stock_id_cache.pop((self._stock_id_scope, symbol.upper()), None)
+
     # =========================================================================
     # OPERACIONES CRUD PARA STOCK
     # =========================================================================
@@ -138,22 +328,70 @@ class DatabaseService:
         Raises:
             SQLAlchemyError: Si hay error al insertar
         """
-        with self.get_session() as session:
-            stock = Stock(
-                symbol=symbol.upper(),  # Normalizar a mayúsculas
-                company_name=company_name,
-                threshold=threshold,
-                is_active=is_active
-            )
-            session.add(stock)
-            session.flush()  # Forzar el INSERT para obtener el ID
+        # INSERT ... RETURNING: el stock completo (ID y fechas incluidos)
+        # vuelve en la misma sentencia
+        stmt = insert(Stock).values(
+            symbol=symbol.upper(),  # Normalizar a mayúsculas
+            company_name=company_name,
+            threshold=threshold,
+            is_active=is_active
+        ).returning(Stock)
 
-            # Forzar la carga de todos los atributos antes de hacer expunge
-            session.refresh(stock)
+        with self.get_session() as session:
+            stock = session.scalars(stmt).one()
 
             logger.info(f"Stock creado: {stock}")
-            session.expunge(stock)  # Ahora sí podemos hacer expunge
-            return stock
+            session.expunge(stock)  # Detach para poder usarlo fuera de la sesión
+
+        self._stock_count_cache = None
+        self._dashboard_cache = None
+        self._forget_stock_ids(stock.symbol)
+        return stock
+
+    def bulk_create_stocks(self, rows: List[Dict[str, Any]]) -> List[Stock]:
+        """
+        Crea varios stocks en una sola operación.
+
+        Inserta todos los stocks con un INSERT multi-fila con RETURNING,
+        en una misma transacción.
+
+        Args:
+            rows: Diccionarios con 'symbol', 'company_name' y 'threshold',
+                  y opcionalmente 'is_active' (True por defecto)
+
+        Returns:
+            Objetos Stock creados, en el orden de las filas
+
+        Raises:
+            SQLAlchemyError: Si hay error al insertar (p. ej. un símbolo duplicado)
+        """
+        if not rows:
+            return []
+
+        mappings = [
+            {
+                'symbol': row['symbol'].upper(),  # Normalizar a mayúsculas
+                'company_name': row['company_name'],
+                'threshold': row['threshold'],
+                'is_active': row.get('is_active', True)
+            }
+            for row in rows
+        ]
+
+        with self.get_session() as session:
+            stocks = list(session.scalars(
+                insert(Stock).returning(Stock, sort_by_parameter_order=True),
+                mappings
+            ))
+            for stock in stocks:
+                session.expunge(stock)  # Detach para poder usarlos fuera de la sesión
+
+        self._stock_count_cache = None
+        self._dashboard_cache = None
+        self._forget_stock_ids(*(stock.symbol for stock in stocks))
+
+        logger.info(f"{len(stocks)} stocks creados en bloque")
+        return stocks
 
     def get_stock_by_symbol(self, symbol: str) -> Optional[Stock]:
         """
@@ -165,15 +403,14 @@ class DatabaseService:
         Returns:
             Objeto Stock o None si no existe
         """
-        with self.get_session() as session:
+        with self.get_session(write=False) as session:
             stock = session.query(Stock).filter(
                 Stock.symbol == symbol.upper()
             ).first()
 
             if stock:
-                # Forzar la carga de todos los atributos antes de hacer expunge
-                session.refresh(stock)
-                # Hacer detach para poder usar fuera de la sesión
+                # La consulta ya carga todas las columnas: basta con hacer
+                # detach para poder usar el objeto fuera de la sesión
                 session.expunge(stock)
 
             return stock
@@ -188,15 +425,13 @@ class DatabaseService:
         Returns:
             Objeto Stock o None si no existe
         """
-        with self.get_session() as session:
-            stock = session.query(Stock).filter(
-                Stock.id == stock_id
-            ).first()
+        with self.get_session(write=False) as session:
+            # Búsqueda por clave primaria (pasa antes por el identity map)
+            stock = session.get(Stock, stock_id)
 
             if stock:
-                # Forzar la carga de todos los atributos antes de hacer expunge
-                session.refresh(stock)
-                # Hacer detach para poder usar fuera de la sesión
+                # La consulta ya carga todas las columnas: basta con hacer
+                # detach para poder usar el objeto fuera de la sesión
                 session.expunge(stock)
 
             return stock
@@ -211,7 +446,7 @@ class DatabaseService:
         Returns:
             Lista de objetos Stock
         """
-        with self.get_session() as session:
+        with self.get_session(write=False) as session:
             query = session.query(Stock)
 
             if only_active:
@@ -219,13 +454,50 @@ class DatabaseService:
 
             stocks = query.order_by(Stock.symbol).all()
 
-            # Forzar la carga de todos los atributos antes de hacer expunge
-            for stock in stocks:
-                session.refresh(stock)
-                session.expunge(stock)
+            # Las consultas ya cargan todas las columnas: basta con hacer
+            # detach para poder usar los objetos fuera de la sesión
+            session.expunge_all()
 
             return stocks
 
+    def get_stock_rows(self, only_active: bool = False) -> List[Row]:
+        """
+        Obtiene todos los stocks como filas (tuplas) en lugar de objetos ORM.
+
+        Args:
+            only_active: Si True, solo devuelve stocks activos
+
+        Returns:
+            Lista de filas con las columnas de la tabla stocks, ordenada por símbolo
+        """
+        stmt = select(*Stock.__table__.c)
+
+        if only_active:
+            stmt = stmt.where(Stock.is_active == True)
+
+        with self.get_session(write=False) as session:
+            return session.execute(stmt.order_by(Stock.symbol)).all()
+
+    def count_all_stocks(self) -> int:
+        """
+        Cuenta todos los stocks (activos e inactivos) con un SELECT COUNT(*).
+
+        El resultado se cachea durante STOCK_COUNT_CACHE_TTL segundos y se
+        invalida al crear o eliminar stocks desde este servicio.
+
+        Returns:
+            Número total de stocks
+        """
+        cached = self._stock_count_cache
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        with self.get_session(write=False) as session:
+            total = session.query(func.count(Stock.id)).scalar() or 0
+
+        self._stock_count_cache = (time.monotonic() + STOCK_COUNT_CACHE_TTL, total)
+        return total
+
     def update_stock(
         self,
         symbol: str,
@@ -241,36 +513,46 @@ class DatabaseService:
         Returns:
             Stock actualizado o None si no existe
         """
+        # Actualizar solo los campos proporcionados que son columnas del modelo
+        values = {key: value for key, value in kwargs.items() if key in Stock.__table__.c}
+        if not values:
+            # Sin campos que actualizar el UPDATE quedaría vacío: se toca solo
+            # updated_at. En el resto de casos lo rellena el onupdate de la
+            # columna con utcnow() del servidor, sin parámetro adicional.
+            values['updated_at'] = utcnow()
+
+        # UPDATE ... RETURNING: una sola sentencia, sin SELECT previo
+        stmt = (
+            update(Stock)
+            .where(Stock.symbol == symbol.upper())
+            .values(**values)
+            .returning(Stock)
+        )
+
         with self.get_session() as session:
-            stock = session.query(Stock).filter(
-                Stock.symbol == symbol.upper()
-            ).first()
+            stock = session.scalars(stmt).one_or_none()
 
             if not stock:
                 logger.warning(f"Stock {symbol} no encontrado para actualizar")
                 return None
 
-            # Actualizar campos proporcionados
-            for key, value in kwargs.items():
-                if hasattr(stock, key):
-                    setattr(stock, key, value)
-
-            stock.updated_at = datetime.utcnow()
-            session.flush()
-
-            # Forzar la carga de todos los atributos antes de hacer expunge
-            session.refresh(stock)
-
             logger.info(f"Stock actualizado: {stock}")
             session.expunge(stock)
-            return stock
+
+        self._dashboard_cache = None
+        self._forget_stock_ids(symbol)
+        return stock
 
     def delete_stock(self, symbol: str) -> bool:
         """
         Elimina un stock de la base de datos.
 
-        ⚠️  También eliminará todos los datos relacionados (precios, alertas, noticias)
-        debido a las cascadas definidas en los modelos.
+        ⚠️  También elimina todos los datos relacionados (precios, alertas, noticias).
+        Se borran con un DELETE por tabla en la misma transacción, sin cargar
+        ninguna fila en memoria. Las tablas nuevas declaran además las claves
+        foráneas con ON DELETE CASCADE, pero los DELETE explícitos se
+        mantienen para las BD creadas antes (y SQLite, que no aplica las
+        claves foráneas por defecto).
 
         Args:
             symbol: Símbolo del stock a eliminar
@@ -278,18 +560,24 @@ class DatabaseService:
         Returns:
             True si se eliminó, False si no existía
         """
+        stock_id = select(Stock.id).where(Stock.symbol == symbol.upper()).scalar_subquery()
+
         with self.get_session() as session:
-            stock = session.query(Stock).filter(
-                Stock.symbol == symbol.upper()
-            ).first()
+            for model in (PriceHistory, Alert, NewsArticle):
+                session.execute(delete(model).where(model.stock_id == stock_id))
 
-            if not stock:
+            result = session.execute(delete(Stock).where(Stock.symbol == symbol.upper()))
+
+            if result.rowcount == 0:
                 logger.warning(f"Stock {symbol} no encontrado para eliminar")
                 return False
 
-            session.delete(stock)
             logger.info(f"Stock eliminado: {symbol}")
-            return True
+
+        self._stock_count_cache = None
+        self._dashboard_cache = None
+        self._forget_stock_ids(symbol)
+        return True
 
     # =========================================================================
     # OPERACIONES PARA PRICE HISTORY
@@ -316,14 +604,14 @@ class DatabaseService:
         Returns:
             Objeto PriceHistory creado o None si el stock no existe
         """
-        stock = self.get_stock_by_symbol(symbol)
-        if not stock:
-            logger.error(f"No se puede añadir precio: stock {symbol} no existe")
-            return None
-
         with self.get_session() as session:
+            stock_id = self._get_stock_id(session, symbol)
+            if stock_id is None:
+                logger.error(f"No se puede añadir precio: stock {symbol} no existe")
+                return None
+
             price = PriceHistory(
-                stock_id=stock.id,
+                stock_id=stock_id,
                 date=date,
                 close_price=close_price,
                 previous_close=previous_close,
@@ -332,12 +620,67 @@ class DatabaseService:
             session.add(price)
             session.flush()
 
-            # Forzar la carga de todos los atributos antes de hacer expunge
-            session.refresh(price)
-
             logger.debug(f"Precio histórico añadido: {price}")
             session.expunge(price)
-            return price
+
+        self._dashboard_cache = None
+        return price
+
+    def bulk_add_price_history(self, rows: List[Dict[str, Any]]) -> List[int]:
+        """
+        Añade varios registros de precio histórico en una sola operación.
+
+        Resuelve todos los símbolos con una única consulta e inserta los
+        registros con un INSERT multi-fila con RETURNING (sin crear objetos
+        ORM ni hacer un refresh por fila), todo en una misma transacción.
+
+        Args:
+            rows: Diccionarios con 'symbol', 'date' y 'close_price', y
+                  opcionalmente 'previous_close' y 'percentage_change'
+
+        Returns:
+            IDs de los registros insertados, en el orden de las filas. Las
+            filas de stocks que no existen se descartan.
+        """
+        if not rows:
+            return []
+
+        symbols = {row['symbol'].upper() for row in rows}
+
+        with self.get_session() as session:
+            stock_ids = dict(session.execute(
+                select(Stock.symbol, Stock.id).where(Stock.symbol.in_(symbols))
+            ).all())
+
+            mappings = [
+                {
+                    'stock_id': stock_ids[row['symbol'].upper()],
+                    'date': row['date'],
+                    'close_price': row['close_price'],
+                    'previous_close': row.get('previous_close'),
+                    'percentage_change': row.get('percentage_change')
+                }
+                for row in rows
+                if row['symbol'].upper() in stock_ids
+            ]
+
+            ids = []
+            if mappings:
+                ids = list(session.scalars(
+                    insert(PriceHistory).returning(
+                        PriceHistory.id, sort_by_parameter_order=True
+                    ),
+                    mappings
+                ))
+
+        self._dashboard_cache = None
+
+        skipped = symbols - stock_ids.keys()
+        if skipped:
+            logger.error(f"Precios descartados: stocks {sorted(skipped)} no existen")
+
+        logger.debug(f"{len(ids)} precios históricos añadidos en bloque")
+        return ids
 
     def get_price_history(
         self,
@@ -354,25 +697,107 @@ class DatabaseService:
         Returns:
             Lista de PriceHistory ordenada por fecha (más reciente primero)
         """
-        stock = self.get_stock_by_symbol(symbol)
-        if not stock:
-            return []
-
         cutoff_date = datetime.utcnow() - timedelta(days=days)
 
-        with self.get_session() as session:
-            prices = session.query(PriceHistory).filter(
-                PriceHistory.stock_id == stock.id,
+        with self.get_session(write=False) as session:
+            prices = session.query(PriceHistory).join(
+                Stock, Stock.id == PriceHistory.stock_id
+            ).filter(
+                Stock.symbol == symbol.upper(),
                 PriceHistory.date >= cutoff_date
             ).order_by(desc(PriceHistory.date)).all()
 
-            # Forzar la carga de todos los atributos antes de hacer expunge
-            for price in prices:
-                session.refresh(price)
-                session.expunge(price)
+            # Las consultas ya cargan todas las columnas: basta con hacer
+            # detach para poder usar los objetos fuera de la sesión
+            session.expunge_all()
 
             return prices
 
+    def iter_price_history(
+        self,
+        symbol: str,
+        days: int = 30,
+        batch_size: int = 500
+    ) -> Iterator[PriceHistory]:
+        """
+        Recorre el histórico de precios de un stock sin cargarlo entero.
+
+        A diferencia de get_price_history, los registros se leen de la BD en
+        bloques de batch_size (cursor del lado del servidor en PostgreSQL),
+        así que la memoria no crece con el tamaño del histórico y el
+        consumidor puede parar en cuanto encuentra lo que busca.
+
+        La sesión sigue abierta mientras se itera; conviene cerrar el
+        iterador (contextlib.closing) si no se consume entero.
+
+        Args:
+            symbol: Símbolo del stock
+            days: Número de días hacia atrás
+            batch_size: Registros leídos por bloque
+
+        Yields:
+            PriceHistory ordenados por fecha (más reciente primero)
+        """
+        cutoff_date = datetime.utcnow() - timedelta(days=days)
+
+        stmt = (
+            select(PriceHistory)
+            .join(Stock, Stock.id == PriceHistory.stock_id)
+            .where(
+                Stock.symbol == symbol.upper(),
+                PriceHistory.date >= cutoff_date
+            )
+            .order_by(desc(PriceHistory.date))
+            .execution_options(yield_per=batch_size)
+        )
+
+        with self.get_session(write=False) as session:
+            yield from session.scalars(stmt)
+
+    def get_price_history_rows(
+        self,
+        symbol: str,
+        days: int = 30
+    ) -> List[Row]:
+        """
+        Obtiene el histórico de precios de un stock como filas (tuplas).
+
+        A diferencia de get_price_history, no construye objetos ORM: ejecuta
+        un select() de columnas y devuelve filas ligeras, pensadas para
+        serializarse directamente en los endpoints de listado.
+
+        Args:
+            symbol: Símbolo del stock
+            days: Número de días hacia atrás
+
+        Returns:
+            Lista de filas (id, stock_id, date, close_price, previous_close,
+            percentage_change, created_at) ordenada por fecha (más reciente
+            primero). Vacía si el stock no existe.
+        """
+        cutoff_date = datetime.utcnow() - timedelta(days=days)
+
+        stmt = (
+            select(
+                PriceHistory.id,
+                PriceHistory.stock_id,
+                PriceHistory.date,
+                PriceHistory.close_price,
+                PriceHistory.previous_close,
+                PriceHistory.percentage_change,
+                PriceHistory.created_at
+            )
+            .join(Stock, Stock.id == PriceHistory.stock_id)
+            .where(
+                Stock.symbol == symbol.upper(),
+                PriceHistory.date >= cutoff_date
+            )
+            .order_by(desc(PriceHistory.date))
+        )
+
+        with self.get_session(write=False) as session:
+            return session.execute(stmt).all()
+
     # =========================================================================
     # OPERACIONES PARA ALERTS
     # =========================================================================
@@ -404,14 +829,14 @@ class DatabaseService:
         Returns:
             Objeto Alert creado o None si el stock no existe
         """
-        stock = self.get_stock_by_symbol(symbol)
-        if not stock:
-            logger.error(f"No se puede crear alerta: stock {symbol} no existe")
-            return None
-
         with self.get_session() as session:
+            stock_id = self._get_stock_id(session, symbol)
+            if stock_id is None:
+                logger.error(f"No se puede crear alerta: stock {symbol} no existe")
+                return None
+
             alert = Alert(
-                stock_id=stock.id,
+                stock_id=stock_id,
                 percentage_change=percentage_change,
                 threshold_at_time=threshold_at_time,
                 price_before=price_before,
@@ -423,12 +848,69 @@ class DatabaseService:
             session.add(alert)
             session.flush()
 
-            # Forzar la carga de todos los atributos antes de hacer expunge
-            session.refresh(alert)
-
             logger.info(f"Alerta registrada: {alert}")
             session.expunge(alert)
-            return alert
+
+        self._dashboard_cache = None
+        return alert
+
+    def bulk_create_alerts(self, rows: List[Dict[str, Any]]) -> List[int]:
+        """
+        Registra varias alertas en una sola operación.
+
+        Igual que bulk_add_price_history: una consulta para resolver los
+        símbolos y un INSERT multi-fila con RETURNING en una misma transacción.
+
+        Args:
+            rows: Diccionarios con 'symbol', 'percentage_change' y
+                  'threshold_at_time', y opcionalmente 'price_before',
+                  'price_after', 'message_sent', 'notification_type' y
+                  'error_message'
+
+        Returns:
+            IDs de las alertas creadas, en el orden de las filas. Las filas
+            de stocks que no existen se descartan.
+        """
+        if not rows:
+            return []
+
+        symbols = {row['symbol'].upper() for row in rows}
+
+        with self.get_session() as session:
+            stock_ids = dict(session.execute(
+                select(Stock.symbol, Stock.id).where(Stock.symbol.in_(symbols))
+            ).all())
+
+            mappings = [
+                {
+                    'stock_id': stock_ids[row['symbol'].upper()],
+                    'percentage_change': row['percentage_change'],
+                    'threshold_at_time': row['threshold_at_time'],
+                    'price_before': row.get('price_before'),
+                    'price_after': row.get('price_after'),
+                    'message_sent': row.get('message_sent', False),
+                    'notification_type': row.get('notification_type'),
+                    'error_message': row.get('error_message')
+                }
+                for row in rows
+                if row['symbol'].upper() in stock_ids
+            ]
+
+            ids = []
+            if mappings:
+                ids = list(session.scalars(
+                    insert(Alert).returning(Alert.id, sort_by_parameter_order=True),
+                    mappings
+                ))
+
+        self._dashboard_cache = None
+
+        skipped = symbols - stock_ids.keys()
+        if skipped:
+            logger.error(f"Alertas descartadas: stocks {sorted(skipped)} no existen")
+
+        logger.info(f"{len(ids)} alertas registradas en bloque")
+        return ids
 
     def has_alert_for_price_date(
         self,
@@ -453,22 +935,54 @@ class DatabaseService:
         Returns:
             True si existe una alerta con esos precios, False en caso contrario
         """
-        stock = self.get_stock_by_symbol(symbol)
-        if not stock:
-            return False
-
-        with self.get_session() as session:
+        with self.get_session(write=False) as session:
             # Buscar alertas del stock con los mismos precios
             # Usamos tolerancia para comparación de floats
             tolerance = 0.001
 
-            alert = session.query(Alert).filter(
-                Alert.stock_id == stock.id,
+            # EXISTS devuelve solo un booleano (resuelto con el índice
+            # ix_alerts_stock_prices) en lugar de cargar la alerta completa
+            return session.scalar(select(exists().where(
+                Alert.stock_id == Stock.id,
+                Stock.symbol == symbol.upper(),
                 Alert.price_before.between(price_before - tolerance, price_before + tolerance),
                 Alert.price_after.between(price_after - tolerance, price_after + tolerance)
-            ).first()
+            )))
+
+    def existing_alert_stock_ids(
+        self,
+        candidates: List[Tuple[int, float, float]]
+    ) -> Set[int]:
+        """
+        Devuelve qué stocks ya tienen una alerta con los mismos precios.
 
-            return alert is not None
+        Versión por lotes de has_alert_for_price_date: comprueba todas las
+        alertas candidatas de una actualización en una sola consulta, con la
+        misma tolerancia en la comparación de precios.
+
+        Args:
+            candidates: Tuplas (stock_id, price_before, price_after)
+
+        Returns:
+            Conjunto con los IDs de los stocks que ya tienen esa alerta
+        """
+        if not candidates:
+            return set()
+
+        tolerance = 0.001
+        conditions = [
+            and_(
+                Alert.stock_id == stock_id,
+                Alert.price_before.between(price_before - tolerance, price_before + tolerance),
+                Alert.price_after.between(price_after - tolerance, price_after + tolerance)
+            )
+            for stock_id, price_before, price_after in candidates
+        ]
+
+        with self.get_session(write=False) as session:
+            return set(session.scalars(
+                select(Alert.stock_id).where(or_(*conditions)).distinct()
+            ))
 
     def get_recent_alerts(
         self,
@@ -487,25 +1001,52 @@ class DatabaseService:
         """
         cutoff_date = datetime.utcnow() - timedelta(days=days)
 
-        with self.get_session() as session:
+        with self.get_session(write=False) as session:
             query = session.query(Alert).filter(
                 Alert.triggered_at >= cutoff_date
             )
 
             if symbol:
-                stock = self.get_stock_by_symbol(symbol)
-                if stock:
-                    query = query.filter(Alert.stock_id == stock.id)
+                query = query.join(Stock, Stock.id == Alert.stock_id).filter(
+                    Stock.symbol == symbol.upper()
+                )
 
             alerts = query.order_by(desc(Alert.triggered_at)).all()
 
-            # Forzar la carga de todos los atributos antes de hacer expunge
-            for alert in alerts:
-                session.refresh(alert)
-                session.expunge(alert)
+            # Las consultas ya cargan todas las columnas: basta con hacer
+            # detach para poder usar los objetos fuera de la sesión
+            session.expunge_all()
 
             return alerts
 
+    def get_recent_alert_rows(
+        self,
+        symbol: Optional[str] = None,
+        days: int = 7
+    ) -> List[Row]:
+        """
+        Obtiene alertas recientes como filas (tuplas) en lugar de objetos ORM.
+
+        Args:
+            symbol: Si se proporciona, filtra por ese stock
+            days: Número de días hacia atrás
+
+        Returns:
+            Lista de filas con las columnas de la tabla alerts, ordenada por
+            fecha (más reciente primero)
+        """
+        cutoff_date = datetime.utcnow() - timedelta(days=days)
+
+        stmt = select(*Alert.__table__.c).where(Alert.triggered_at >= cutoff_date)
+
+        if symbol:
+            stmt = stmt.join(Stock, Stock.id == Alert.stock_id).where(
+                Stock.symbol == symbol.upper()
+            )
+
+        with self.get_session(write=False) as session:
+            return session.execute(stmt.order_by(desc(Alert.triggered_at))).all()
+
     def get_pending_alerts(self) -> List[Alert]:
         """
         Obtiene todas las alertas que no han sido enviadas.
@@ -513,15 +1054,14 @@ class DatabaseService:
         Returns:
             Lista de Alert que tienen message_sent=False
         """
-        with self.get_session() as session:
+        with self.get_session(write=False) as session:
             alerts = session.query(Alert).filter(
                 Alert.message_sent == False
             ).order_by(Alert.triggered_at).all()
 
-            # Forzar la carga de todos los atributos antes de hacer expunge
-            for alert in alerts:
-                session.refresh(alert)
-                session.expunge(alert)
+            # Las consultas ya cargan todas las columnas: basta con hacer
+            # detach para poder usar los objetos fuera de la sesión
+            session.expunge_all()
 
             return alerts
 
@@ -558,7 +1098,6 @@ class DatabaseService:
                 alert.error_message = error_message
 
             session.flush()
-            session.refresh(alert)
 
             logger.info(
                 f"Alerta {alert_id} actualizada: message_sent={message_sent}, "
@@ -594,17 +1133,38 @@ class DatabaseService:
             # Si no hay URL, no podemos verificar duplicados de forma confiable
             return False
 
-        stock = self.get_stock_by_symbol(symbol)
-        if not stock:
-            return False
-
-        with self.get_session() as session:
-            article = session.query(NewsArticle).filter(
-                NewsArticle.stock_id == stock.id,
+        with self.get_session(write=False) as session:
+            # Comprobación con EXISTS sobre el índice único ux_news_stock_url
+            return session.scalar(select(exists().where(
+                NewsArticle.stock_id == Stock.id,
+                Stock.symbol == symbol.upper(),
                 NewsArticle.url == url
-            ).first()
+            )))
 
-            return article is not None
+    def existing_news_urls(self, pairs: List[Tuple[int, str]]) -> Set[Tuple[int, str]]:
+        """
+        Devuelve cuáles de los pares (stock_id, url) ya están guardados.
+
+        Versión por lotes de has_news_article_by_url: comprueba todas las
+        noticias de una actualización en una sola consulta
+        (WHERE (stock_id, url) IN (...)) y el llamador filtra en memoria.
+
+        Args:
+            pairs: Pares (stock_id, url) a comprobar
+
+        Returns:
+            Conjunto con los pares que ya existen en la base de datos
+        """
+        pairs = list({(stock_id, url) for stock_id, url in pairs if url})
+        if not pairs:
+            return set()
+
+        with self.get_session(write=False) as session:
+            rows = session.execute(
+                select(NewsArticle.stock_id, NewsArticle.url)
+                .where(tuple_(NewsArticle.stock_id, NewsArticle.url).in_(pairs))
+            )
+            return {(stock_id, url) for stock_id, url in rows}
 
     def save_news_article(
         self,
@@ -636,33 +1196,56 @@ class DatabaseService:
             photographer_url: URL del perfil del fotógrafo (Unsplash)
             unsplash_download_location: Endpoint para trigger download event (Unsplash)
 
+        Los duplicados (misma URL para el mismo stock) se descartan en el
+        propio INSERT con ON CONFLICT DO NOTHING, así que no hace falta
+        comprobar antes con has_news_article_by_url. Si la BD no tiene el
+        índice único ux_news_stock_url (no se pudo crear), ON CONFLICT no
+        es posible y el duplicado se comprueba con una consulta previa.
+
         Returns:
-            Objeto NewsArticle creado o None si el stock no existe
+            Objeto NewsArticle creado o None si el stock no existe o la
+            noticia ya estaba guardada
         """
-        stock = self.get_stock_by_symbol(symbol)
-        if not stock:
-            logger.error(f"No se puede guardar noticia: stock {symbol} no existe")
-            return None
-
         with self.get_session() as session:
-            article = NewsArticle(
-                stock_id=stock.id,
-                title=title,
-                description=description,
-                url=url,
-                image_url=image_url,
-                source=source,
-                published_at=published_at,
-                photographer_name=photographer_name,
-                photographer_username=photographer_username,
-                photographer_url=photographer_url,
-                unsplash_download_location=unsplash_download_location
+            stock_id = self._get_stock_id(session, symbol)
+            if stock_id is None:
+                logger.error(f"No se puede guardar noticia: stock {symbol} no existe")
+                return None
+
+            if 'ux_news_stock_url' in self._missing_indexes:
+                # Sin índice único: comprobar el duplicado antes del INSERT
+                if url and session.scalar(select(exists().where(
+                    NewsArticle.stock_id == stock_id,
+                    NewsArticle.url == url
+                ))):
+                    logger.debug(f"Noticia duplicada para {symbol}, no se guarda: {url}")
+                    return None
+                news_insert = insert(NewsArticle)
+            else:
+                news_insert = self._insert_ignoring_conflicts(NewsArticle, ['stock_id', 'url'])
+
+            stmt = (
+                news_insert
+                .values(
+                    stock_id=stock_id,
+                    title=title,
+                    description=description,
+                    url=url,
+                    image_url=image_url,
+                    source=source,
+                    published_at=published_at,
+                    photographer_name=photographer_name,
+                    photographer_username=photographer_username,
+                    photographer_url=photographer_url,
+                    unsplash_download_location=unsplash_download_location
+                )
+                .returning(NewsArticle)
             )
-            session.add(article)
-            session.flush()
+            article = session.scalars(stmt).one_or_none()
 
-            # Forzar la carga de todos los atributos antes de hacer expunge
-            session.refresh(article)
+            if article is None:
+                logger.debug(f"Noticia duplicada para {symbol}, no se guarda: {url}")
+                return None
 
             logger.debug(f"Noticia guardada para {symbol}: {title[:50]}...")
             session.expunge(article)
@@ -683,22 +1266,46 @@ class DatabaseService:
         Returns:
             Lista de NewsArticle ordenada por fecha de obtención (más reciente primero)
         """
-        stock = self.get_stock_by_symbol(symbol)
-        if not stock:
-            return []
-
-        with self.get_session() as session:
-            articles = session.query(NewsArticle).filter(
-                NewsArticle.stock_id == stock.id
+        with self.get_session(write=False) as session:
+            articles = session.query(NewsArticle).join(
+                Stock, Stock.id == NewsArticle.stock_id
+            ).filter(
+                Stock.symbol == symbol.upper()
             ).order_by(desc(NewsArticle.fetched_at)).limit(limit).all()
 
-            # Forzar la carga de todos los atributos antes de hacer expunge
-            for article in articles:
-                session.refresh(article)
-                session.expunge(article)
+            # Las consultas ya cargan todas las columnas: basta con hacer
+            # detach para poder usar los objetos fuera de la sesión
+            session.expunge_all()
 
             return articles
 
+    def get_news_rows_for_stock(
+        self,
+        symbol: str,
+        limit: int = 10
+    ) -> List[Row]:
+        """
+        Obtiene noticias de un stock como filas (tuplas) en lugar de objetos ORM.
+
+        Args:
+            symbol: Símbolo del stock
+            limit: Número máximo de noticias a devolver
+
+        Returns:
+            Lista de filas con las columnas de la tabla news_articles, ordenada
+            por fecha de obtención (más reciente primero)
+        """
+        stmt = (
+            select(*NewsArticle.__table__.c)
+            .join(Stock, Stock.id == NewsArticle.stock_id)
+            .where(Stock.symbol == symbol.upper())
+            .order_by(desc(NewsArticle.fetched_at))
+            .limit(limit)
+        )
+
+        with self.get_session(write=False) as session:
+            return session.execute(stmt).all()
+
     # =========================================================================
     # UTILIDADES Y ESTADÍSTICAS
     # =========================================================================
@@ -707,30 +1314,46 @@ class DatabaseService:
         """
         Obtiene un resumen para el dashboard.
 
+        El resumen se cachea durante DASHBOARD_CACHE_TTL segundos y se
+        invalida al modificar stocks, precios o alertas desde este servicio.
+        Las alertas de las últimas 24 horas se cuentan al calcularlo, así que
+        pueden ir hasta DASHBOARD_CACHE_TTL segundos por detrás.
+
         Returns:
             Diccionario con estadísticas generales
         """
-        with self.get_session() as session:
-            total_stocks = session.query(Stock).count()
-            active_stocks = session.query(Stock).filter(Stock.is_active == True).count()
-
-            # Alertas en las últimas 24 horas
-            yesterday = datetime.utcnow() - timedelta(days=1)
-            recent_alerts = session.query(Alert).filter(
-                Alert.triggered_at >= yesterday
-            ).count()
-
-            # Última actualización de precios
-            last_price = session.query(PriceHistory).order_by(
-                desc(PriceHistory.created_at)
-            ).first()
+        cached = self._dashboard_cache
+        if cached is not None and cached[0] > time.monotonic():
+            return dict(cached[1])
+
+        # Alertas en las últimas 24 horas
+        yesterday = datetime.utcnow() - timedelta(days=1)
+
+        # Todas las estadísticas en una sola consulta: los conteos de stocks
+        # como agregados y las alertas/última actualización como subconsultas
+        stmt = select(
+            func.count(Stock.id),
+            func.count(case((Stock.is_active == True, 1))),
+            select(func.count(Alert.id))
+            .where(Alert.triggered_at >= yesterday)
+            .scalar_subquery(),
+            select(func.max(PriceHistory.created_at)).scalar_subquery()
+        )
 
-            return {
-                'total_stocks': total_stocks,
-                'active_stocks': active_stocks,
-                'recent_alerts_24h': recent_alerts,
-                'last_price_update': last_price.created_at if last_price else None
-            }
+        with self.get_session(write=False) as session:
+            total_stocks, active_stocks, recent_alerts, last_price_update = (
+                session.execute(stmt).one()
+            )
+
+        summary = {
+            'total_stocks': total_stocks,
+            'active_stocks': active_stocks,
+            'recent_alerts_24h': recent_alerts,
+            'last_price_update': last_price_update
+        }
+
+        self._dashboard_cache = (time.monotonic() + DASHBOARD_CACHE_TTL, summary)
+        return dict(summary)
 
     def close(self):
         """
@@ -739,4 +1362,10 @@ class DatabaseService:
         Solo necesario si se quiere cerrar explícitamente la conexión.
         """
         self.engine.dispose()
+
+        # Una BD en memoria muere con su engine (y su id() puede reutilizarse)
+        with _stock_id_cache_lock:
+            for key in [k for k in _stock_id_cache if k[0] == self._stock_id_scope]:
+                del _stock_id_cache[key]
+
         logger.info("Conexión de base de datos cerrada")
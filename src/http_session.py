@@ -0,0 +1,84 @@
+"""
+Shared HTTP session module.
+
+Provides one pooled requests.Session for the API fetchers, so repeated
+calls to the same host reuse keep-alive connections instead of opening a
+new TCP+TLS connection per request.
+"""
+
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .config import config
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def create_http_session() -> requests.Session:
+    """
+    Create a requests.Session with connection pooling and retries.
+
+    Transient failures (connection errors, 429 and 5xx responses) are
+    retried with exponential backoff, honouring Retry-After. Once retries
+    are exhausted the last response is returned as-is, so callers keep
+    handling HTTP errors with raise_for_status().
+
+    Returns:
+        Configured requests.Session
+    """
+    retry = Retry(
+        total=config.HTTP_MAX_RETRIES,
+        backoff_factor=config.HTTP_BACKOFF_FACTOR,
+        status_forcelist=(429, 500, 502, 503, 504),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=config.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=config.HTTP_POOL_MAXSIZE,
+        max_retries=retry
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """
+    Get the process-wide HTTP session, creating it on first use.
+
+    Fetchers are instantiated per request/job, so the session lives at
+    module level to keep connections alive between runs.
+
+    Returns:
+        Shared requests.Session
+    """
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_http_session()
+
+    return _session
+
+
+def close_http_session() -> None:
+    """
+    Close the shared HTTP session and its pooled connections.
+
+    Called on application shutdown. A later get_http_session() call
+    creates a new session.
+    """
+    global _session
+
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
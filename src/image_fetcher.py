@@ -7,12 +7,20 @@ https://help.unsplash.com/en/articles/2511245-unsplash-api-guidelines
 """
 
 import logging
+import time
+import orjson
 import requests
-from typing import Optional, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional, Dict, Tuple
 from .config import config
+from .http_session import get_http_session
 
 logger = logging.getLogger(__name__)
 
+# Search results per company name: (expiry time, image data). Module level
+# because fetchers are created per request/job.
+_image_cache: Dict[str, Tuple[float, Dict[str, str]]] = {}
+
 
 class ImageFetcher:
     """
@@ -34,6 +42,7 @@ class ImageFetcher:
         self.api_key = api_key or config.UNSPLASH_ACCESS_KEY
         self.endpoint = config.UNSPLASH_API_ENDPOINT
         self.timeout = config.API_TIMEOUT
+        self.session = get_http_session()
 
     def get_fallback_image(self, company_name: str) -> Optional[Dict[str, str]]:
         """
@@ -44,6 +53,9 @@ class ImageFetcher:
         2. Returns a random photo from results
         3. Includes photographer attribution data (required by Unsplash)
 
+        Found images are cached per company for config.UNSPLASH_CACHE_TTL
+        seconds; failed or empty searches are retried on the next call.
+
         Args:
             company_name: Name of the company to search for
 
@@ -62,6 +74,13 @@ class ImageFetcher:
             logger.warning("Unsplash API key not configured, skipping image fetch")
             return None
 
+        # The chosen photo is stable, so reuse recent searches. Only the
+        # search is cached: callers still trigger a download event per use.
+        cached = _image_cache.get(company_name)
+        if cached is not None and cached[0] > time.monotonic():
+            logger.debug(f"Using cached fallback image for {company_name}")
+            return dict(cached[1])
+
         logger.debug(f"Fetching fallback image for {company_name}")
 
         # Search for photos related to company
@@ -81,14 +100,14 @@ class ImageFetcher:
         try:
             # Search for photos
             search_url = f"{self.endpoint}/search/photos"
-            response = requests.get(
+            response = self.session.get(
                 search_url,
                 params=search_params,
                 headers=headers,
                 timeout=self.timeout
             )
             response.raise_for_status()
-            search_data = response.json()
+            search_data = orjson.loads(response.content)
 
             # Check if we got results
             results = search_data.get("results", [])
@@ -118,7 +137,10 @@ class ImageFetcher:
                 f"{image_data['photographer_name']}"
             )
 
-            return image_data
+            _image_cache[company_name] = (
+                time.monotonic() + config.UNSPLASH_CACHE_TTL, image_data
+            )
+            return dict(image_data)
 
         except requests.exceptions.RequestException as e:
             logger.error(
@@ -126,13 +148,38 @@ class ImageFetcher:
                 exc_info=True
             )
             return None
-        except (KeyError, IndexError) as e:
+        except (KeyError, IndexError, orjson.JSONDecodeError) as e:
             logger.error(
                 f"Error parsing Unsplash response for {company_name}: {str(e)}",
                 exc_info=True
             )
             return None
 
+    def get_fallback_images(
+        self, company_names: Iterable[str]
+    ) -> Dict[str, Optional[Dict[str, str]]]:
+        """
+        Get fallback images for several companies concurrently.
+
+        Searches run on a small thread pool (up to config.FETCH_WORKERS at a
+        time). Download events are not triggered here: call
+        trigger_download() when each image is actually used.
+
+        Args:
+            company_names: Names of the companies (duplicates are fetched once)
+
+        Returns:
+            Dictionary mapping each company name to its image data, or None
+            if no image was found (same format as get_fallback_image)
+        """
+        names = list(dict.fromkeys(company_names))
+        if not names:
+            return {}
+
+        workers = min(config.FETCH_WORKERS, len(names))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-fetch") as pool:
+            return dict(zip(names, pool.map(self.get_fallback_image, names)))
+
     def trigger_download(self, download_location: str) -> bool:
         """
         Trigger Unsplash download event.
@@ -160,7 +207,7 @@ class ImageFetcher:
         }
 
         try:
-            response = requests.get(
+            response = self.session.get(
                 download_location,
                 headers=headers,
                 timeout=self.timeout
@@ -175,3 +222,25 @@ class ImageFetcher:
                 exc_info=True
             )
             return False
+
+    def trigger_downloads(self, download_locations: Iterable[str]) -> int:
+        """
+        Trigger Unsplash download events for several used photos concurrently.
+
+        Lets callers save articles first and report every fallback image
+        they used afterwards, instead of waiting on Unsplash per article.
+        Each location is triggered once per entry, as each one is a use.
+
+        Args:
+            download_locations: download_location URLs of the photos used
+
+        Returns:
+            Number of download events triggered successfully
+        """
+        locations = [location for location in download_locations if location]
+        if not locations:
+            return 0
+
+        workers = min(config.FETCH_WORKERS, len(locations))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-download") as pool:
+            return sum(pool.map(self.trigger_download, locations))
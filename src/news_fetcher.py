@@ -5,10 +5,13 @@ Handles all interactions with the News API for financial news articles.
 """
 
 import logging
-import requests
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Dict, Optional
+
+import orjson
 
 from .config import config
+from .http_session import get_http_session
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +29,7 @@ class NewsFetcher:
         self.api_key = api_key or config.NEWS_API_KEY
         self.endpoint = config.NEWS_API_ENDPOINT
         self.timeout = config.API_TIMEOUT
+        self.session = get_http_session()
 
     def get_articles(
         self, company_name: str, limit: int = 3
@@ -51,13 +55,13 @@ class NewsFetcher:
         }
 
         try:
-            response = requests.get(
+            response = self.session.get(
                 self.endpoint,
                 params=parameters,
                 timeout=self.timeout
             )
             response.raise_for_status()
-            news_data = response.json()
+            news_data = orjson.loads(response.content)
 
             if news_data.get("status") == "ok":
                 articles = news_data.get("articles", [])
@@ -76,3 +80,30 @@ class NewsFetcher:
                 exc_info=True
             )
             return []
+
+    def get_articles_many(
+        self, company_names: Iterable[str], limit: int = 3
+    ) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Get news articles for several companies concurrently.
+
+        Requests run on a small thread pool (up to config.FETCH_WORKERS at a
+        time) over the shared HTTP session, so N companies take roughly the
+        time of the slowest request instead of the sum of all of them.
+
+        Args:
+            company_names: Names of the companies (duplicates are fetched once)
+            limit: Number of articles to retrieve per company
+
+        Returns:
+            Dictionary mapping each company name to its list of articles
+            (empty list on error, as in get_articles)
+        """
+        names = list(dict.fromkeys(company_names))
+        if not names:
+            return {}
+
+        workers = min(config.FETCH_WORKERS, len(names))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="news-fetch") as pool:
+            articles = pool.map(lambda name: self.get_articles(name, limit=limit), names)
+            return dict(zip(names, articles))
@@ -5,11 +5,14 @@ Handles sending alerts via WhatsApp or SMS using Twilio.
 """
 
 import logging
-from typing import Optional
-from twilio.rest import Client
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Optional
 
 from .config import config
 
+if TYPE_CHECKING:
+    from twilio.rest import Client
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,12 +43,18 @@ class Notifier:
         self.to_number = to_number or config.MY_PHONE_NUMBER
         self.use_whatsapp = use_whatsapp
 
-        self._client: Optional[Client] = None
+        self._client: Optional["Client"] = None
 
     @property
-    def client(self) -> Optional[Client]:
-        """Get or create Twilio client."""
+    def client(self) -> Optional["Client"]:
+        """
+        Get or create Twilio client.
+
+        twilio is imported here rather than at module level, so importing
+        this module costs nothing until a message is actually sent.
+        """
         if self._client is None and self.account_sid and self.auth_token:
+            from twilio.rest import Client
             self._client = Client(self.account_sid, self.auth_token)
         return self._client
 
@@ -88,3 +97,31 @@ class Notifier:
         except Exception as e:
             logger.error(f"Error sending message: {str(e)}", exc_info=True)
             return False
+
+    def send_many(self, message_bodies: List[str]) -> List[bool]:
+        """
+        Send several messages concurrently.
+
+        Twilio has no batch endpoint, so the requests are overlapped on a
+        small thread pool (up to config.TWILIO_SEND_WORKERS at a time) over
+        the shared Twilio client. Twilio queues the messages and applies
+        the per-number sending rate on its side.
+
+        Args:
+            message_bodies: Contents of the messages
+
+        Returns:
+            One result per message, in the same order (see send_message)
+        """
+        if not message_bodies:
+            return []
+
+        if len(message_bodies) == 1:
+            return [self.send_message(message_bodies[0])]
+
+        # Create the client once before the workers share it
+        _ = self.client
+
+        workers = min(config.TWILIO_SEND_WORKERS, len(message_bodies))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="twilio-send") as pool:
+            return list(pool.map(self.send_message, message_bodies))
@@ -6,17 +6,64 @@ la actualización automática de precios de stocks cada 15 minutos.
 """
 
 import logging
-from typing import Optional
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
-from datetime import datetime
-
+import os
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Iterator, Optional
+from datetime import datetime, timezone
+
+from .config import config
 from .database.service import DatabaseService
-from .stock_fetcher import StockFetcher
+from .image_fetcher import ImageFetcher
+from .news_fetcher import NewsFetcher
+from .stock_fetcher import StockFetcher, clear_quote_cache
+from .utils import parse_iso_datetime
+
+if TYPE_CHECKING:
+    from apscheduler.schedulers.background import BackgroundScheduler
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin bloqueo entre procesos
+    fcntl = None
 
 logger = logging.getLogger(__name__)
 
 
+@contextmanager
+def _exclusive_lock(name: str) -> Iterator[bool]:
+    """
+    Intenta tomar un bloqueo exclusivo entre procesos, sin esperar.
+
+    Usa flock sobre un fichero en el directorio temporal, que el sistema
+    libera aunque el proceso muera. En plataformas sin fcntl siempre se
+    considera adquirido.
+
+    Args:
+        name: Nombre del bloqueo (uno por job)
+
+    Yields:
+        True si se ha adquirido el bloqueo, False si lo tiene otro proceso
+    """
+    if fcntl is None:
+        yield True
+        return
+
+    path = os.path.join(tempfile.gettempdir(), f"stock_alert_{name}.lock")
+    with open(path, "w") as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            yield False
+            return
+
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
 class PriceUpdateScheduler:
     """
     Scheduler para actualizaciones automáticas de precios.
@@ -37,8 +84,10 @@ class PriceUpdateScheduler:
         self.db_service = db_service
         self.hour = hour
         self.minute = minute
-        self.scheduler: Optional[BackgroundScheduler] = None
+        self.scheduler: Optional["BackgroundScheduler"] = None
         self.stock_fetcher = StockFetcher()
+        self.news_fetcher = NewsFetcher()
+        self.image_fetcher = ImageFetcher()
 
     def start(self):
         """
@@ -51,18 +100,28 @@ class PriceUpdateScheduler:
             logger.warning("Scheduler already started")
             return
 
+        # APScheduler se importa aquí para no cargarlo si el scheduler no arranca
+        from apscheduler.executors.pool import ThreadPoolExecutor as JobThreadPoolExecutor
+        from apscheduler.schedulers.background import BackgroundScheduler
+        from apscheduler.triggers.cron import CronTrigger
+
+        # Los jobs solo coordinan: las descargas usan sus propios pools de
+        # hilos. Dos hilos bastan para que precios y noticias no se bloqueen
+        # entre sí (el executor por defecto de APScheduler crea hasta 10).
         self.scheduler = BackgroundScheduler(
             timezone="UTC",
+            executors={'default': JobThreadPoolExecutor(max_workers=2)},
             job_defaults={
                 'coalesce': True,  # Combinar ejecuciones perdidas
                 'max_instances': 1,  # Solo una instancia del job a la vez
-                'misfire_grace_time': 3600  # 1 hora de gracia para ejecuciones perdidas
+                'misfire_grace_time': 300  # 5 minutos de gracia para ejecuciones perdidas
             }
         )
 
         # Añadir job de actualización de precios (diario)
         self.scheduler.add_job(
-            func=self._update_all_prices_job,
+            func=self._run_exclusive,
+            args=('update_stock_prices', self._update_all_prices_job),
             trigger=CronTrigger(hour=self.hour, minute=self.minute, timezone="UTC"),
             id='update_stock_prices',
             name='Update all stock prices',
@@ -71,15 +130,25 @@ class PriceUpdateScheduler:
 
         # Añadir job de actualización de noticias (diario a las 08:00 UTC)
         self.scheduler.add_job(
-            func=self._update_all_news_job,
+            func=self._run_exclusive,
+            args=('update_stock_news', self._update_all_news_job),
             trigger=CronTrigger(hour=8, minute=0, timezone="UTC"),
             id='update_stock_news',
             name='Update all stock news',
             replace_existing=True
         )
 
+        # Vaciar la caché de cotizaciones al cambiar de día (00:00 UTC)
+        self.scheduler.add_job(
+            func=clear_quote_cache,
+            trigger=CronTrigger(hour=0, minute=0, timezone="UTC"),
+            id='clear_quote_cache',
+            name='Clear cached stock quotes',
+            replace_existing=True
+        )
+
         self.scheduler.start()
-        logger.info(f"Scheduler started - will update prices daily at {self.hour:02d}:{self.minute:02d} UTC")
+        logger.info("Scheduler started - will update prices daily at %02d:%02d UTC", self.hour, self.minute)
 
     def stop(self):
         """
@@ -95,6 +164,24 @@ class PriceUpdateScheduler:
         self.scheduler = None
         logger.info("Scheduler stopped")
 
+    def _run_exclusive(self, job_id: str, job: Callable[[], None]):
+        """
+        Ejecuta un job solo si ningún otro proceso lo está ejecutando.
+
+        Cada worker de uvicorn arranca su propio scheduler, así que sin este
+        bloqueo el mismo job se ejecutaría una vez por proceso, repitiendo
+        las llamadas a las APIs externas.
+
+        Args:
+            job_id: ID del job (nombre del bloqueo)
+            job: Función del job
+        """
+        with _exclusive_lock(job_id) as acquired:
+            if not acquired:
+                logger.info("Job %s already running in another process, skipping", job_id)
+                return
+            job()
+
     def _update_all_prices_job(self):
         """
         Job que actualiza precios de todos los stocks activos.
@@ -105,7 +192,7 @@ class PriceUpdateScheduler:
         """
         try:
             logger.info("=" * 70)
-            logger.info(f"SCHEDULED PRICE UPDATE - {datetime.utcnow().isoformat()}")
+            logger.info("SCHEDULED PRICE UPDATE - %s", datetime.now(timezone.utc).isoformat(timespec="seconds"))
             logger.info("=" * 70)
 
             # Obtener stocks activos
@@ -115,138 +202,180 @@ class PriceUpdateScheduler:
                 logger.info("No active stocks to update")
                 return
 
-            logger.info(f"Updating prices for {len(stocks)} active stocks")
+            logger.info("Updating prices for %d active stocks", len(stocks))
 
-            updated = 0
             failed = 0
-            alerts_triggered = 0
-
-            # Actualizar cada stock
-            for stock in stocks:
-                try:
-                    # Obtener cambio porcentual y precios usando StockFetcher
-                    percentage_change, yesterday_close, day_before_close, dates = \
-                        self.stock_fetcher.get_percentage_change(stock.symbol)
+            price_rows = []
+            alert_candidates = []
+
+            # Descargar los precios en paralelo (la espera es I/O de red). Los
+            # resultados se recogen en este hilo y se escriben en bloque al
+            # final, así las sesiones nunca se comparten entre hilos.
+            # Con ALPHA_VANTAGE_BULK_QUOTES se piden primero todas las cotizaciones
+            # en bloque; solo los símbolos que falten se piden uno a uno.
+            bulk_quotes = {}
+            if config.ALPHA_VANTAGE_BULK_QUOTES:
+                bulk_quotes = self.stock_fetcher.get_bulk_quotes(stock.symbol for stock in stocks)
+
+            workers = max(1, min(config.ALPHA_VANTAGE_WORKERS, len(stocks)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="price-fetch") as executor:
+                futures = {}
+                for stock in stocks:
+                    quote = bulk_quotes.get(stock.symbol)
+                    if quote is not None:
+                        future = Future()
+                        future.set_result(quote)
+                    else:
+                        future = executor.submit(self.stock_fetcher.get_percentage_change, stock.symbol)
+                    futures[future] = stock
+
+                for future in as_completed(futures):
+                    stock = futures[future]
+                    try:
+                        # Cambio porcentual y precios obtenidos por StockFetcher
+                        percentage_change, yesterday_close, day_before_close, dates = future.result()
+                    except Exception as e:
+                        logger.error("Error updating %s: %s", stock.symbol, e)
+                        failed += 1
+                        continue
 
                     if percentage_change is None or yesterday_close is None:
-                        logger.error(f"Failed to get price for {stock.symbol}")
+                        logger.error("Failed to get price for %s", stock.symbol)
                         failed += 1
                         continue
 
                     current_price = yesterday_close
                     previous_price = day_before_close if day_before_close else yesterday_close
-
-                    # Guardar precio en histórico
-                    self.db_service.add_price_to_history(
-                        symbol=stock.symbol,
-                        close_price=current_price,
-                        previous_close=previous_price,
-                        percentage_change=percentage_change
-                    )
-
-                    logger.info(f"✓ {stock.symbol}: ${current_price:.2f} ({percentage_change:+.2f}%)")
-                    updated += 1
-
-                    # Verificar si se debe crear alerta
+                    price_date = datetime.strptime(dates[0], "%Y-%m-%d") if dates else datetime.utcnow()
+
+                    price_rows.append({
+                        'symbol': stock.symbol,
+                        'date': price_date,
+                        'close_price': current_price,
+                        'previous_close': previous_price,
+                        'percentage_change': percentage_change
+                    })
+                    logger.info("✓ %s: $%.2f (%+.2f%%)", stock.symbol, current_price, percentage_change)
+
+                    # Candidata a alerta si supera el umbral
                     if abs(percentage_change) >= stock.threshold:
-                        # Verificar si ya existe alerta similar reciente
-                        existing_alert = self.db_service.check_existing_alert(
-                            stock_id=stock.id,
-                            price_before=previous_price,
-                            price_after=current_price,
-                            hours=24
-                        )
+                        alert_candidates.append((stock, {
+                            'symbol': stock.symbol,
+                            'percentage_change': percentage_change,
+                            'threshold_at_time': stock.threshold,
+                            'price_before': previous_price,
+                            'price_after': current_price
+                        }))
+
+            # Guardar todos los precios en una sola transacción
+            updated = len(self.db_service.bulk_add_price_history(price_rows))
+            failed += len(price_rows) - updated
+
+            # Descartar las alertas ya registradas para el mismo cierre
+            # (una sola consulta para todas las candidatas)
+            existing_alerts = self.db_service.existing_alert_stock_ids([
+                (stock.id, alert_row['price_before'], alert_row['price_after'])
+                for stock, alert_row in alert_candidates
+            ])
+            new_alerts = []
+            for stock, alert_row in alert_candidates:
+                if stock.id in existing_alerts:
+                    logger.info("  Alert already exists for %s", stock.symbol)
+                    continue
+                new_alerts.append((stock, alert_row))
 
-                        if not existing_alert:
-                            # Crear nueva alerta
-                            self.db_service.create_alert(
-                                stock_id=stock.id,
-                                threshold_at_time=stock.threshold,
-                                percentage_change=percentage_change,
-                                price_before=previous_price,
-                                price_after=current_price
-                            )
+            # Crear todas las alertas nuevas en una sola transacción
+            self.db_service.bulk_create_alerts([alert_row for _, alert_row in new_alerts])
+            alerts_triggered = len(new_alerts)
 
-                            logger.warning(
-                                f"🚨 ALERT: {stock.symbol} changed {percentage_change:+.2f}% "
-                                f"(threshold: {stock.threshold}%)"
-                            )
-                            alerts_triggered += 1
-
-                            # Trigger immediate news update
-                            try:
-                                logger.info(f"Fetching news for {stock.symbol} due to alert...")
-                                from .news_fetcher import NewsFetcher
-                                from .image_fetcher import ImageFetcher
-                                
-                                nf = NewsFetcher()
-                                img_f = ImageFetcher()
-                                
-                                articles = nf.get_articles(stock.company_name, limit=3)
-                                if articles:
-                                    saved_news = 0
-                                    for article in articles:
-                                        try:
-                                            # Skip if no title
-                                            if not article.get("title"): continue
-                                            
-                                            # Check duplicate
-                                            if article.get("url") and self.db_service.has_news_article_by_url(stock.symbol, article.get("url")):
-                                                continue
-
-                                            # Get image if needed
-                                            image_url = article.get("urlToImage")
-                                            photographer_name = None
-                                            photographer_username = None
-                                            photographer_url = None
-                                            unsplash_download_location = None
-
-                                            if not image_url:
-                                                unsplash_data = img_f.get_fallback_image(stock.company_name)
-                                                if unsplash_data:
-                                                    image_url = unsplash_data["image_url"]
-                                                    photographer_name = unsplash_data["photographer_name"]
-                                                    photographer_username = unsplash_data["photographer_username"]
-                                                    photographer_url = unsplash_data["photographer_url"]
-                                                    unsplash_download_location = unsplash_data["download_location"]
-                                                    img_f.trigger_download(unsplash_download_location)
-
-                                            # Save
-                                            self.db_service.save_news_article(
-                                                symbol=stock.symbol,
-                                                title=article.get("title"),
-                                                description=article.get("description"),
-                                                url=article.get("url"),
-                                                image_url=image_url,
-                                                source=article.get("source", {}).get("name"),
-                                                published_at=datetime.fromisoformat(article.get("publishedAt").replace('Z', '+00:00')) if article.get("publishedAt") else None,
-                                                photographer_name=photographer_name,
-                                                photographer_username=photographer_username,
-                                                photographer_url=photographer_url,
-                                                unsplash_download_location=unsplash_download_location
-                                            )
-                                            saved_news += 1
-                                        except Exception:
-                                            continue
-                                    logger.info(f"Saved {saved_news} news articles for {stock.symbol}")
-                            except Exception as e:
-                                logger.error(f"Error fetching news for alert: {str(e)}")
-
-                        else:
-                            logger.info(f"  Alert already exists for {stock.symbol}")
-
-                except Exception as e:
-                    logger.error(f"Error updating {stock.symbol}: {str(e)}")
-                    failed += 1
-                    continue
+            for stock, alert_row in new_alerts:
+                logger.warning(
+                    "🚨 ALERT: %s changed %+.2f%% (threshold: %s%%)",
+                    stock.symbol, alert_row['percentage_change'], stock.threshold
+                )
+                # Trigger immediate news update
+                self._fetch_news_for_alert(stock)
 
             # Log resumen
             logger.info("=" * 70)
-            logger.info(f"UPDATE COMPLETE - Updated: {updated}, Failed: {failed}, Alerts: {alerts_triggered}")
+            logger.info("UPDATE COMPLETE - Updated: %d, Failed: %d, Alerts: %d", updated, failed, alerts_triggered)
             logger.info("=" * 70)
 
         except Exception as e:
-            logger.error(f"Error in scheduled price update: {str(e)}", exc_info=True)
+            logger.error("Error in scheduled price update: %s", e, exc_info=True)
+
+    def _fetch_news_for_alert(self, stock):
+        """
+        Descarga y guarda noticias de un stock que acaba de disparar una alerta.
+
+        Los errores se registran en el log sin interrumpir el job de precios.
+
+        Args:
+            stock: Stock que ha disparado la alerta
+        """
+        try:
+            logger.info("Fetching news for %s due to alert...", stock.symbol)
+            articles = self.news_fetcher.get_articles(stock.company_name, limit=3)
+            if articles:
+                saved_news = 0
+                download_events = []
+
+                # Check duplicates for all articles with one query
+                existing_urls = self.db_service.existing_news_urls(
+                    [(stock.id, article.get("url")) for article in articles]
+                )
+
+                for article in articles:
+                    try:
+                        # Skip if no title
+                        if not article.get("title"): continue
+
+                        # Check duplicate
+                        if article.get("url") and (stock.id, article.get("url")) in existing_urls:
+                            continue
+
+                        # Get image if needed
+                        image_url = article.get("urlToImage")
+                        photographer_name = None
+                        photographer_username = None
+                        photographer_url = None
+                        unsplash_download_location = None
+
+                        if not image_url:
+                            unsplash_data = self.image_fetcher.get_fallback_image(stock.company_name)
+                            if unsplash_data:
+                                image_url = unsplash_data["image_url"]
+                                photographer_name = unsplash_data["photographer_name"]
+                                photographer_username = unsplash_data["photographer_username"]
+                                photographer_url = unsplash_data["photographer_url"]
+                                unsplash_download_location = unsplash_data["download_location"]
+
+                        # Save
+                        saved_article = self.db_service.save_news_article(
+                            symbol=stock.symbol,
+                            title=article.get("title"),
+                            description=article.get("description"),
+                            url=article.get("url"),
+                            image_url=image_url,
+                            source=article.get("source", {}).get("name"),
+                            published_at=parse_iso_datetime(article.get("publishedAt")),
+                            photographer_name=photographer_name,
+                            photographer_username=photographer_username,
+                            photographer_url=photographer_url,
+                            unsplash_download_location=unsplash_download_location
+                        )
+                        if saved_article:
+                            saved_news += 1
+                            if unsplash_download_location:
+                                download_events.append(unsplash_download_location)
+                    except Exception:
+                        continue
+
+                # Registrar el uso de las imágenes de Unsplash (requerido por su API)
+                self.image_fetcher.trigger_downloads(download_events)
+                logger.info("Saved %d news articles for %s", saved_news, stock.symbol)
+        except Exception as e:
+            logger.error("Error fetching news for alert: %s", e)
 
     def _update_all_news_job(self):
         """
@@ -257,7 +386,7 @@ class PriceUpdateScheduler:
         """
         try:
             logger.info("=" * 70)
-            logger.info(f"SCHEDULED NEWS UPDATE - {datetime.utcnow().isoformat()}")
+            logger.info("SCHEDULED NEWS UPDATE - %s", datetime.now(timezone.utc).isoformat(timespec="seconds"))
             logger.info("=" * 70)
 
             # Obtener stocks activos
@@ -267,31 +396,45 @@ class PriceUpdateScheduler:
                 logger.info("No active stocks to update news for")
                 return
 
-            logger.info(f"Updating news for {len(stocks)} active stocks")
-
-            # Inicializar fetchers
-            from .news_fetcher import NewsFetcher
-            from .image_fetcher import ImageFetcher
-            
-            news_fetcher = NewsFetcher()
-            image_fetcher = ImageFetcher()
+            logger.info("Updating news for %d active stocks", len(stocks))
 
             updated = 0
             failed = 0
             total_saved = 0
 
-            # Actualizar cada stock
+            # Descargar en paralelo las noticias de todos los stocks (limit 5 por
+            # stock para no saturar la API) y las imágenes de respaldo de las
+            # compañías con noticias sin imagen (una búsqueda por compañía)
+            articles_by_company = self.news_fetcher.get_articles_many(
+                [stock.company_name for stock in stocks], limit=5
+            )
+            fallback_images = self.image_fetcher.get_fallback_images(
+                name for name, articles in articles_by_company.items()
+                if any(article.get("title") and not article.get("urlToImage") for article in articles)
+            )
+
+            # Noticias ya guardadas de todos los stocks, en una sola consulta
+            existing_urls = self.db_service.existing_news_urls([
+                (stock.id, article.get("url"))
+                for stock in stocks
+                for article in articles_by_company[stock.company_name]
+            ])
+
+            # Eventos de descarga de Unsplash de las imágenes usadas; se envían
+            # al final, en paralelo, para no frenar el guardado en BD
+            download_events = []
+
+            # Guardar las noticias de cada stock
             for stock in stocks:
                 try:
-                    # Obtener noticias (limit 5 por stock para no saturar API)
-                    articles = news_fetcher.get_articles(stock.company_name, limit=5)
-                    
+                    articles = articles_by_company[stock.company_name]
+
                     if not articles:
-                        logger.info(f"No news found for {stock.symbol}")
+                        logger.info("No news found for %s", stock.symbol)
                         continue
 
                     saved_count = 0
-                    
+
                     for article in articles:
                         try:
                             title = article.get("title")
@@ -299,38 +442,30 @@ class PriceUpdateScheduler:
                                 continue
 
                             url = article.get("url")
-                            
-                            # Verificar duplicados por URL
-                            if url and self.db_service.has_news_article_by_url(stock.symbol, url):
+                            image_url = article.get("urlToImage")
+
+                            # Saltar duplicados conocidos; los que se cuelen los
+                            # descarta el propio INSERT
+                            if url and (stock.id, url) in existing_urls:
                                 continue
 
                             # Parsear fecha
-                            published_at_str = article.get("publishedAt")
-                            published_at = None
-                            if published_at_str:
-                                try:
-                                    published_at = datetime.fromisoformat(published_at_str.replace('Z', '+00:00'))
-                                except:
-                                    pass
+                            published_at = parse_iso_datetime(article.get("publishedAt"))
 
                             # Obtener imagen fallback si es necesario
-                            image_url = article.get("urlToImage")
                             photographer_name = None
                             photographer_username = None
                             photographer_url = None
                             unsplash_download_location = None
 
                             if not image_url:
-                                unsplash_data = image_fetcher.get_fallback_image(stock.company_name)
+                                unsplash_data = fallback_images.get(stock.company_name)
                                 if unsplash_data:
                                     image_url = unsplash_data["image_url"]
                                     photographer_name = unsplash_data["photographer_name"]
                                     photographer_username = unsplash_data["photographer_username"]
                                     photographer_url = unsplash_data["photographer_url"]
                                     unsplash_download_location = unsplash_data["download_location"]
-                                    
-                                    # Trigger download event
-                                    image_fetcher.trigger_download(unsplash_download_location)
 
                             # Guardar en BD
                             saved_article = self.db_service.save_news_article(
@@ -349,30 +484,35 @@ class PriceUpdateScheduler:
 
                             if saved_article:
                                 saved_count += 1
+                                if unsplash_download_location:
+                                    download_events.append(unsplash_download_location)
 
                         except Exception as e:
-                            logger.error(f"Error saving article for {stock.symbol}: {str(e)}")
+                            logger.error("Error saving article for %s: %s", stock.symbol, e)
                             continue
                     
                     if saved_count > 0:
-                        logger.info(f"✓ {stock.symbol}: Saved {saved_count} new articles")
+                        logger.info("✓ %s: Saved %d new articles", stock.symbol, saved_count)
                         updated += 1
                         total_saved += saved_count
                     else:
-                        logger.info(f"- {stock.symbol}: No new articles")
+                        logger.info("- %s: No new articles", stock.symbol)
 
                 except Exception as e:
-                    logger.error(f"Error updating news for {stock.symbol}: {str(e)}")
+                    logger.error("Error updating news for %s: %s", stock.symbol, e)
                     failed += 1
                     continue
 
+            # Registrar el uso de las imágenes de Unsplash (requerido por su API)
+            self.image_fetcher.trigger_downloads(download_events)
+
             # Log resumen
             logger.info("=" * 70)
-            logger.info(f"NEWS UPDATE COMPLETE - Updated: {updated}, Failed: {failed}, Total Saved: {total_saved}")
+            logger.info("NEWS UPDATE COMPLETE - Updated: %d, Failed: %d, Total Saved: %d", updated, failed, total_saved)
             logger.info("=" * 70)
 
         except Exception as e:
-            logger.error(f"Error in scheduled news update: {str(e)}", exc_info=True)
+            logger.error("Error in scheduled news update: %s", e, exc_info=True)
 
 
 # Instancia global del scheduler (se inicializa en startup de FastAPI)
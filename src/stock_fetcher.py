@@ -4,14 +4,31 @@ Stock data fetching module.
 Handles all interactions with the Alpha Vantage API for stock price data.
 """
 
+import itertools
 import logging
+import time
+
+import orjson
 import requests
-from typing import Optional, Tuple, List
+from typing import Dict, Iterable, Optional, Tuple, List
 
 from .config import config
+from .http_session import get_http_session
 
 logger = logging.getLogger(__name__)
 
+# REALTIME_BULK_QUOTES accepts up to 100 comma-separated symbols per call
+BULK_QUOTES_MAX_SYMBOLS = 100
+
+# Parsed daily series per symbol: (expiry time, ETag, get_percentage_change
+# result). Module level because fetchers are created per request/job.
+_quote_cache: Dict[str, Tuple[float, Optional[str], tuple]] = {}
+
+
+def clear_quote_cache() -> None:
+    """Drop every cached quote (the scheduler does this daily at 00:00 UTC)."""
+    _quote_cache.clear()
+
 
 class StockFetcher:
     """Fetches stock price data from Alpha Vantage API."""
@@ -26,6 +43,7 @@ class StockFetcher:
         self.api_key = api_key or config.ALPHA_VANTAGE_API_KEY
         self.endpoint = config.ALPHA_VANTAGE_ENDPOINT
         self.timeout = config.API_TIMEOUT
+        self.session = get_http_session()
 
     def get_percentage_change(
         self, symbol: str
@@ -33,6 +51,11 @@ class StockFetcher:
         """
         Get the percentage change of a stock between yesterday and the day before.
 
+        The daily series changes once per trading day, so successful results
+        are reused for config.ALPHA_VANTAGE_CACHE_TTL seconds. After that the
+        series is requested again with If-None-Match when the previous
+        response carried an ETag, and a 304 keeps the cached result.
+
         Args:
             symbol: Stock ticker symbol (e.g., 'TSLA')
 
@@ -40,7 +63,13 @@ class StockFetcher:
             Tuple of (percentage_change, yesterday_close, day_before_close, dates)
             Returns (None, None, None, None) if error occurs
         """
-        logger.debug(f"Fetching stock data for {symbol}")
+        cache_key = symbol.upper()
+        cached = _quote_cache.get(cache_key)
+        if cached is not None and cached[0] > time.monotonic():
+            logger.debug("Using cached stock data for %s", symbol)
+            return cached[2]
+
+        logger.debug("Fetching stock data for %s", symbol)
 
         parameters = {
             "function": "TIME_SERIES_DAILY",
@@ -48,24 +77,44 @@ class StockFetcher:
             "apikey": self.api_key
         }
 
+        headers = {}
+        if cached is not None and cached[1]:
+            headers["If-None-Match"] = cached[1]
+
         try:
-            response = requests.get(
+            response = self.session.get(
                 self.endpoint,
                 params=parameters,
+                headers=headers,
                 timeout=self.timeout
             )
+
+            if response.status_code == 304 and cached is not None:
+                logger.debug("Stock data for %s not modified", symbol)
+                _quote_cache[cache_key] = (
+                    time.monotonic() + config.ALPHA_VANTAGE_CACHE_TTL, cached[1], cached[2]
+                )
+                return cached[2]
+
             response.raise_for_status()
-            stock_data = response.json()
+            stock_data = orjson.loads(response.content)
 
             if "Time Series (Daily)" not in stock_data:
-                logger.warning(
-                    f"No time series data for {symbol}. Response: {stock_data}"
+                # Rate limits and bad symbols come back as a one-line message;
+                # the full payload is only formatted when debugging
+                message = (
+                    stock_data.get("Note")
+                    or stock_data.get("Information")
+                    or stock_data.get("Error Message")
                 )
+                logger.warning("No time series data for %s: %s", symbol, message)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Alpha Vantage response for %s: %s", symbol, stock_data)
                 return None, None, None, None
 
             # Get the two most recent days of data
             daily_data = stock_data["Time Series (Daily)"]
-            recent_dates = list(daily_data.keys())[:2]
+            recent_dates = list(itertools.islice(daily_data, 2))
 
             yesterday_close = float(daily_data[recent_dates[0]]["4. close"])
             day_before_yesterday_close = float(daily_data[recent_dates[1]]["4. close"])
@@ -74,13 +123,92 @@ class StockFetcher:
             difference = yesterday_close - day_before_yesterday_close
             percentage_change = (difference / day_before_yesterday_close) * 100
 
-            logger.info(f"{symbol}: ${yesterday_close:.2f} ({percentage_change:+.2f}%)")
-            return percentage_change, yesterday_close, day_before_yesterday_close, recent_dates
+            logger.info("%s: $%.2f (%+.2f%%)", symbol, yesterday_close, percentage_change)
+            result = (percentage_change, yesterday_close, day_before_yesterday_close, recent_dates)
+            _quote_cache[cache_key] = (
+                time.monotonic() + config.ALPHA_VANTAGE_CACHE_TTL,
+                response.headers.get("ETag"),
+                result
+            )
+            return result
 
         except requests.exceptions.Timeout:
-            logger.error(f"Timeout fetching data for {symbol}")
+            logger.error("Timeout fetching data for %s", symbol)
+            return None, None, None, None
+
+        # Expected failures (HTTP errors, malformed or short series) are logged
+        # in one line; only unexpected errors get a traceback
+        except requests.exceptions.RequestException as e:
+            logger.error("Error fetching data for %s: %s", symbol, e)
+            return None, None, None, None
+
+        except (orjson.JSONDecodeError, KeyError, IndexError, ValueError) as e:
+            logger.error("Error parsing data for %s: %s: %s", symbol, type(e).__name__, e)
             return None, None, None, None
 
         except Exception as e:
-            logger.error(f"Error fetching data for {symbol}: {str(e)}", exc_info=True)
+            logger.error("Error fetching data for %s: %s", symbol, e, exc_info=True)
             return None, None, None, None
+
+    def get_bulk_quotes(
+        self, symbols: Iterable[str]
+    ) -> Dict[str, Tuple[float, float, float, Optional[List[str]]]]:
+        """
+        Get the latest quote for many symbols with REALTIME_BULK_QUOTES.
+
+        One request covers up to BULK_QUOTES_MAX_SYMBOLS symbols, instead of
+        one TIME_SERIES_DAILY request per symbol. The endpoint requires a
+        premium Alpha Vantage plan. Symbols missing from the response, and
+        every symbol of a request that fails, are left out of the result so
+        callers can fall back to get_percentage_change().
+
+        Args:
+            symbols: Stock ticker symbols
+
+        Returns:
+            Dict of symbol -> (percentage_change, close, previous_close, dates),
+            the same tuple shape as get_percentage_change()
+        """
+        names = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        quotes = {}
+
+        for start in range(0, len(names), BULK_QUOTES_MAX_SYMBOLS):
+            chunk = names[start:start + BULK_QUOTES_MAX_SYMBOLS]
+            parameters = {
+                "function": "REALTIME_BULK_QUOTES",
+                "symbol": ",".join(chunk),
+                "apikey": self.api_key
+            }
+
+            try:
+                response = self.session.get(
+                    self.endpoint,
+                    params=parameters,
+                    timeout=self.timeout
+                )
+                response.raise_for_status()
+                data = orjson.loads(response.content).get("data")
+            except Exception as e:
+                logger.error("Error fetching bulk quotes for %d symbols: %s", len(chunk), e)
+                continue
+
+            if not data:
+                logger.warning("No bulk quote data for %d symbols", len(chunk))
+                continue
+
+            for quote in data:
+                try:
+                    symbol = quote["symbol"].upper()
+                    close = float(quote["close"])
+                    previous_close = float(quote["previous_close"])
+                    percentage_change = (close - previous_close) / previous_close * 100
+                except (KeyError, TypeError, ValueError, ZeroDivisionError):
+                    logger.warning("Skipping malformed bulk quote: %s", quote)
+                    continue
+
+                timestamp = quote.get("timestamp")
+                dates = [timestamp[:10]] if timestamp else None
+                quotes[symbol] = (percentage_change, close, previous_close, dates)
+
+        logger.info("Bulk quotes returned %d of %d symbols", len(quotes), len(names))
+        return quotes
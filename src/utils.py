@@ -8,13 +8,78 @@ import os
 import csv
 import logging
 from logging.handlers import RotatingFileHandler
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Optional, Union
 
 from .config import config
 
 logger = logging.getLogger(__name__)
 
+# Report building blocks, created once instead of on every call
+_SEP_LINE = "=" * 50
+_ARROWS = ("🔻", "🔺")  # indexed by percentage_change > 0
+
+
+class FastRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that buffers writes and skips most rollover checks.
+
+    The stock handler flushes the stream after every record, and its
+    shouldRollover() formats each record a second time and stats the log
+    file. Here records below the flush level (WARNING by default, see
+    Config.LOG_FLUSH_LEVEL) stay in the stream's write buffer, written out
+    in buffer-sized chunks, on a record at or above that level, rollover or
+    close. The file size is tracked from the formatted messages.
+    While it is more than ROLLOVER_MARGIN bytes under maxBytes no single
+    record can push it over, so the full check is skipped.
+    """
+
+    ROLLOVER_MARGIN = 64 * 1024  # 64 KB
+    FLUSH_LEVEL = logging.WARNING
+
+    _buffering = False
+
+    def __init__(self, *args, flush_level: Union[int, str, None] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if flush_level is not None:
+            self.FLUSH_LEVEL = (
+                logging.getLevelName(flush_level) if isinstance(flush_level, str) else flush_level
+            )
+
+    def _open(self):
+        stream = super()._open()
+        self._approx_size = stream.tell()
+        return stream
+
+    def format(self, record: logging.LogRecord) -> str:
+        msg = super().format(record)
+        # Character count: exact for ASCII, an approximation otherwise
+        self._approx_size += len(msg) + len(self.terminator)
+        return msg
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.stream is not None and self.maxBytes > 0:
+            if self._approx_size < self.maxBytes - self.ROLLOVER_MARGIN:
+                return False
+        rollover = super().shouldRollover(record)
+        if self.stream is not None:
+            # tell() flushed the buffer anyway; resync with the real size
+            self._approx_size = self.stream.tell()
+        return rollover
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Called under the handler lock, so the flag is not shared
+        self._buffering = record.levelno < self.FLUSH_LEVEL
+        try:
+            super().emit(record)
+        finally:
+            self._buffering = False
+
+    def flush(self) -> None:
+        if not self._buffering:
+            super().flush()
+
 
 def setup_logging() -> logging.Logger:
     """
@@ -24,8 +89,7 @@ def setup_logging() -> logging.Logger:
         Configured logger instance
     """
     # Create logs directory if it doesn't exist
-    if not os.path.exists(config.LOG_DIR):
-        os.makedirs(config.LOG_DIR)
+    os.makedirs(config.LOG_DIR, exist_ok=True)
 
     # Log file name with timestamp
     log_file = os.path.join(
@@ -33,11 +97,8 @@ def setup_logging() -> logging.Logger:
         f"stock_monitor_{datetime.now().strftime('%Y%m%d')}.log"
     )
 
-    # Configure root logger
-    root_logger = logging.getLogger()
-    root_logger.setLevel(logging.DEBUG)
-
     # Clear existing handlers
+    root_logger = logging.getLogger()
     root_logger.handlers = []
 
     # File formatter (detailed)
@@ -50,28 +111,70 @@ def setup_logging() -> logging.Logger:
     console_formatter = logging.Formatter(config.LOG_FORMAT_CONSOLE)
 
     # File handler with rotation
-    file_handler = RotatingFileHandler(
+    file_handler = FastRotatingFileHandler(
         log_file,
         maxBytes=config.LOG_MAX_BYTES,
         backupCount=config.LOG_BACKUP_COUNT,
-        encoding='utf-8'
+        encoding='utf-8',
+        flush_level=config.LOG_FLUSH_LEVEL
     )
-    file_handler.setLevel(logging.DEBUG)
+    file_handler.setLevel(config.LOG_FILE_LEVEL)
     file_handler.setFormatter(file_formatter)
 
-    # Console handler (INFO and above)
+    # Console handler (INFO and above by default)
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
+    console_handler.setLevel(config.LOG_CONSOLE_LEVEL)
     console_handler.setFormatter(console_formatter)
 
     # Add handlers to logger
     root_logger.addHandler(file_handler)
     root_logger.addHandler(console_handler)
 
+    # The root level is the lowest handler level, so records no handler
+    # would emit are dropped by isEnabledFor() before they are built
+    root_logger.setLevel(min(h.level for h in root_logger.handlers))
+
     return root_logger
 
 
-def load_stocks_from_csv(csv_file: str) -> List[Dict[str, Any]]:
+def parse_iso_datetime(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse an ISO 8601 timestamp as returned by News API.
+
+    A trailing 'Z' (UTC) is rewritten to '+00:00', which
+    datetime.fromisoformat() does not accept before Python 3.11.
+
+    Args:
+        value: Timestamp string, e.g. '2025-01-10T14:30:00Z'
+
+    Returns:
+        Parsed datetime, or None if the value is empty or not a valid timestamp
+    """
+    if not value:
+        return None
+
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True)
+class StockSpec:
+    """A stock to monitor, as listed in the watchlist CSV."""
+
+    # Declared by hand: dataclass(slots=True) needs Python 3.10
+    __slots__ = ('symbol', 'company_name', 'threshold')
+
+    symbol: str
+    company_name: str
+    threshold: float
+
+
+def load_stocks_from_csv(csv_file: str) -> List[StockSpec]:
     """
     Load list of stocks to monitor from a CSV file.
 
@@ -79,24 +182,37 @@ def load_stocks_from_csv(csv_file: str) -> List[Dict[str, Any]]:
         csv_file: Path to CSV file
 
     Returns:
-        List of stock dictionaries with keys: symbol, company_name, threshold
+        List of StockSpec entries (symbol, company_name, threshold)
     """
     logger.info(f"Loading stocks from {csv_file}")
     stocks = []
 
     try:
         with open(csv_file, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
+            # csv.reader + column indices read once from the header avoids
+            # building an intermediate dict per row (as DictReader does)
+            reader = csv.reader(file)
+            header = [column.strip() for column in next(reader, [])]
+            if not header:
+                logger.warning(f"CSV file is empty: {csv_file}")
+                return []
+
+            i_symbol = header.index('symbol')
+            i_name = header.index('company_name')
+            i_threshold = header.index('threshold')
+
             for row in reader:
-                stocks.append({
-                    'symbol': row['symbol'].strip(),
-                    'company_name': row['company_name'].strip(),
-                    'threshold': float(row['threshold'])
-                })
+                if not row:
+                    continue
+                stocks.append(StockSpec(
+                    row[i_symbol].strip(),
+                    row[i_name].strip(),
+                    float(row[i_threshold])
+                ))
 
         logger.info(
             f"Successfully loaded {len(stocks)} stocks: "
-            f"{[s['symbol'] for s in stocks]}"
+            f"{[s.symbol for s in stocks]}"
         )
         print(f"✅ Cargadas {len(stocks)} acciones desde {csv_file}")
         return stocks
@@ -113,7 +229,7 @@ def load_stocks_from_csv(csv_file: str) -> List[Dict[str, Any]]:
 
 
 def generate_stock_report(
-    stock_info: Dict[str, Any],
+    stock_info: StockSpec,
     percentage_change: float,
     articles: List[Dict[str, str]]
 ) -> str:
@@ -121,29 +237,36 @@ def generate_stock_report(
     Generate a formatted report for a stock with alerts.
 
     Args:
-        stock_info: Stock information dictionary
+        stock_info: Stock being reported
         percentage_change: Percentage change value
         articles: List of news articles
 
     Returns:
         Formatted report string
     """
-    up_down = "🔺" if percentage_change > 0 else "🔻"
+    up_down = _ARROWS[percentage_change > 0]
+
+    # The fixed header is emitted in one formatted literal; only the
+    # variable-length news block is collected and joined
+    header = (
+        f"\n{_SEP_LINE}\n"
+        f"📊 {stock_info.symbol} - {stock_info.company_name}\n"
+        f"{_SEP_LINE}\n"
+        f"Cambio: {up_down} {abs(percentage_change):.2f}%\n"
+        f"Umbral configurado: {stock_info.threshold}%\n\n"
+    )
 
-    report = f"\n{'='*50}\n"
-    report += f"📊 {stock_info['symbol']} - {stock_info['company_name']}\n"
-    report += f"{'='*50}\n"
-    report += f"Cambio: {up_down} {abs(percentage_change):.2f}%\n"
-    report += f"Umbral configurado: {stock_info['threshold']}%\n\n"
+    parts = [header]
+    append = parts.append
 
     if articles:
-        report += "📰 Noticias principales:\n\n"
+        append("📰 Noticias principales:\n\n")
         for i, article in enumerate(articles[:3], 1):
-            report += f"{i}. {article['title']}\n"
+            append(f"{i}. {article['title']}\n")
             if article['description']:
-                report += f"   {article['description'][:100]}...\n"
-            report += f"   🔗 {article['url']}\n\n"
+                append(f"   {article['description'][:100]}...\n")
+            append(f"   🔗 {article['url']}\n\n")
     else:
-        report += "ℹ️  No se encontraron noticias recientes.\n"
+        append("ℹ️  No se encontraron noticias recientes.\n")
 
-    return report
+    return "".join(parts)
@@ -0,0 +1,74 @@
+"""
+Tests para endpoints de notificaciones.
+
+Prueba:
+- POST /api/alerts/send-pending - Enviar alertas pendientes
+
+Twilio no se llama nunca: el Notifier del router se sustituye por un mock.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from src.api.routers import notifications
+
+
+@pytest.fixture
+def mock_notifier():
+    """Notifier con credenciales configuradas cuyos envíos siempre tienen éxito."""
+    with patch.object(notifications, "Notifier") as notifier_class:
+        notifier = notifier_class.return_value
+        notifier.account_sid = "test_sid"
+        notifier.auth_token = "test_token"
+        notifier.send_many.side_effect = lambda bodies: [True] * len(bodies)
+        yield notifier
+
+
+@pytest.mark.api
+class TestSendPendingAlerts:
+    """Tests para POST /api/alerts/send-pending."""
+
+    def test_send_pending_alert_without_prices(self, client, db, sample_stock, mock_notifier):
+        """Test: Una alerta sin precios se envía con N/A y no bloquea las demás."""
+        db.create_alert("TSLA", 6.5, 5.0)
+        db.create_alert("TSLA", -7.0, 5.0, price_before=250.0, price_after=232.5)
+
+        response = client.post("/api/alerts/send-pending")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_pending"] == 2
+        assert data["sent"] == 2
+        assert data["failed"] == 0
+
+        bodies = mock_notifier.send_many.call_args[0][0]
+        assert any("Previous Close: N/A" in body for body in bodies)
+        assert any("Previous Close: $250.00" in body for body in bodies)
+        assert db.get_pending_alerts() == []
+
+    def test_send_pending_alert_formatting_error(self, client, db, sample_stock, mock_notifier):
+        """Test: Un error al preparar una alerta se registra y las demás se envían."""
+        failing = db.create_alert("TSLA", 6.5, 5.0)
+        db.create_alert("TSLA", -7.0, 5.0, price_before=250.0, price_after=232.5)
+
+        format_message = notifications._format_alert_message
+
+        def format_or_fail(stock, alert):
+            if alert.id == failing.id:
+                raise ValueError("mensaje inválido")
+            return format_message(stock, alert)
+
+        with patch.object(notifications, "_format_alert_message", side_effect=format_or_fail):
+            response = client.post("/api/alerts/send-pending")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["sent"] == 1
+        assert data["failed"] == 1
+
+        results = {r["alert_id"]: r for r in data["results"]}
+        assert results[failing.id]["error"] == "mensaje inválido"
+
+        pending = db.get_pending_alerts()
+        assert [a.id for a in pending] == [failing.id]
+        assert pending[0].error_message == "mensaje inválido"
@@ -86,9 +86,9 @@ class TestCreateStock:
     def test_create_stock_success(self, client, sample_stock_data):
         """Test: Crear stock exitosamente."""
         # Usar un símbolo diferente para evitar conflictos
-        sample_stock_data["symbol"] = "NVDA"
+        stock_data = {**sample_stock_data, "symbol": "NVDA"}
 
-        response = client.post("/api/stocks", json=sample_stock_data)
+        response = client.post("/api/stocks", json=stock_data)
 
         assert response.status_code == 201
         data = response.json()
@@ -98,7 +98,7 @@ class TestCreateStock:
 
     def test_create_stock_duplicate(self, client, sample_stock, sample_stock_data):
         """Test: Intentar crear stock duplicado."""
-        response = client.post("/api/stocks", json=sample_stock_data)
+        response = client.post("/api/stocks", json=dict(sample_stock_data))
 
         assert response.status_code == 400
         data = response.json()
@@ -125,6 +125,31 @@ class TestCreateStock:
 
         assert response.status_code == 422
 
+    def test_create_stock_threshold_rounded(self, client):
+        """Test: Threshold se redondea a 2 decimales."""
+        data = {
+            "symbol": "TEST",
+            "company_name": "Test Corp",
+            "threshold": 2.4567
+        }
+
+        response = client.post("/api/stocks", json=data)
+
+        assert response.status_code == 201
+        assert response.json()["threshold"] == 2.46
+
+    def test_create_stock_threshold_rounds_to_zero(self, client):
+        """Test: Threshold que se redondea a 0 es inválido."""
+        data = {
+            "symbol": "TEST",
+            "company_name": "Test Corp",
+            "threshold": 0.001
+        }
+
+        response = client.post("/api/stocks", json=data)
+
+        assert response.status_code == 422
+
     def test_create_stock_uppercase_symbol(self, client):
         """Test: Símbolo se convierte a mayúsculas."""
         data = {
@@ -193,9 +218,9 @@ class TestToggleStock:
 
     def test_toggle_stock_active_to_inactive(self, client, sample_stock):
         """Test: Desactivar stock activo."""
-        # Asegurar que está activo
-        stock = client.get("/api/stocks/TSLA").json()
-        initial_state = stock["is_active"]
+        # Estado inicial: el stock de la fixture se crea activo
+        initial_state = sample_stock.is_active
+        assert initial_state is True
 
         # Toggle
         response = client.patch("/api/stocks/TSLA/toggle")
@@ -206,9 +231,8 @@ class TestToggleStock:
 
     def test_toggle_stock_twice(self, client, sample_stock):
         """Test: Toggle dos veces vuelve al estado original."""
-        # Obtener estado inicial
-        initial = client.get("/api/stocks/TSLA").json()
-        initial_state = initial["is_active"]
+        # Estado inicial, ya cargado en el objeto de la fixture
+        initial_state = sample_stock.is_active
 
         # Toggle 1
         client.patch("/api/stocks/TSLA/toggle")
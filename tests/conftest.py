@@ -10,78 +10,144 @@ por todos los tests del proyecto. Las fixtures proporcionan:
 
 import pytest
 from datetime import datetime, timedelta
+from types import MappingProxyType
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from src.api.main import app
 from src.database import DatabaseService
+from src.database.service import clear_stock_id_cache
 from src.database.models import Base
 from src.api.dependencies import get_db
 
 
 # =============================================================================
-# FIXTURES DE INFRAESTRUCTURA
+# HOOKS
 # =============================================================================
 
-@pytest.fixture(scope="function")
-def test_db():
+def pytest_collection_modifyitems(config, items):
     """
-    Base de datos de prueba temporal (SQLite).
+    Comprueba que todos los tests de API usan la fixture client.
+
+    La fixture client es la que sustituye get_db por la BD de test; un test
+    marcado como api que no la use llegaría a la BD configurada. Se falla
+    en la recolección, antes de ejecutar ningún test.
+    """
+    missing = [
+        item.nodeid
+        for item in items
+        if item.get_closest_marker("api") and "client" not in item.fixturenames
+    ]
+    if missing:
+        raise pytest.UsageError(
+            "Tests de API sin la fixture client (usarían la BD real): "
+            + ", ".join(missing)
+        )
 
-    Crea una BD temporal limpia para cada test. Se elimina
-    automáticamente al finalizar el test.
 
-    Scope: function - Nueva BD para cada test (aislamiento total)
+# =============================================================================
+# FIXTURES DE INFRAESTRUCTURA
+# =============================================================================
+
+@pytest.fixture(scope="session")
+def _engine():
     """
-    import tempfile
-    import os
+    Engine SQLite en memoria compartido por toda la sesión de tests.
 
-    # Crear archivo temporal para BD
-    fd, db_path = tempfile.mkstemp(suffix=".db")
-    os.close(fd)
+    El esquema se crea una sola vez. StaticPool reutiliza una única
+    conexión, así que la BD persiste aunque TestClient la use desde
+    otro hilo.
 
-    # Crear BD con check_same_thread=False para TestClient
-    db = DatabaseService(
-        database_url=f"sqlite:///{db_path}?check_same_thread=False"
+    Scope: session - Un engine y un esquema para todos los tests
+    """
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
     )
 
+    # pysqlite gestiona por su cuenta BEGIN/COMMIT y rompe los SAVEPOINT:
+    # se desactiva y SQLAlchemy emite BEGIN explícitamente
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     # Crear todas las tablas
-    Base.metadata.create_all(bind=db.engine)
+    Base.metadata.create_all(bind=engine)
+
+    yield engine
+
+    # Cleanup: cerrar la conexión libera la BD en memoria
+    engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def test_db(_engine):
+    """
+    Base de datos de prueba en memoria (SQLite), aislada por transacción.
+
+    Cada test corre dentro de una transacción que se deshace al terminar,
+    así que la BD vuelve a quedar vacía sin recrear las tablas. Los COMMIT
+    del código bajo prueba se convierten en SAVEPOINT dentro de ella.
+
+    Scope: function - BD limpia para cada test (aislamiento total)
+    """
+    connection = _engine.connect()
+    transaction = connection.begin()
+
+    db = DatabaseService(engine=_engine)
+    db.SessionLocal = sessionmaker(
+        bind=connection,
+        autoflush=False,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
 
     yield db
 
-    # Cleanup: cerrar conexiones
-    db.engine.dispose()
+    # Cleanup: deshacer todo lo escrito durante el test. Los IDs de stock
+    # cacheados dejan de ser válidos con el rollback
+    transaction.rollback()
+    connection.close()
+    clear_stock_id_cache()
+
+
+@pytest.fixture(scope="session")
+def _client():
+    """
+    TestClient de FastAPI compartido por toda la sesión de tests.
+
+    Se crea sin bloque with para no ejecutar el lifespan de la app
+    (scheduler y create_tables sobre la BD configurada).
 
-    # Eliminar archivo temporal
-    try:
-        os.unlink(db_path)
-    except Exception:
-        pass  # Si ya se eliminó, no hay problema
+    Scope: session - Un único cliente para todos los tests
+    """
+    return TestClient(app)
 
 
 @pytest.fixture(scope="function")
-def client(test_db):
+def client(_client, test_db):
     """
     Cliente de prueba de FastAPI con BD de test.
 
-    Proporciona un TestClient configurado que usa la BD de test
-    en lugar de la BD de producción.
+    Proporciona el TestClient compartido configurado para que use
+    la BD de test en lugar de la BD de producción.
 
-    Scope: function - Nuevo cliente para cada test
+    Scope: function - Override de la BD para cada test
     """
     # Override de la dependencia get_db para usar test_db
-    def override_get_db():
-        return test_db
-
-    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_db] = lambda: test_db
 
-    # Crear cliente
-    test_client = TestClient(app)
-
-    yield test_client
+    yield _client
 
     # Cleanup: restaurar dependencia original
-    app.dependency_overrides.clear()
+    app.dependency_overrides.pop(get_db, None)
 
 
 @pytest.fixture(scope="function")
@@ -101,15 +167,20 @@ def db(test_db):
 # FIXTURES DE DATOS - STOCKS
 # =============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_stock_data():
-    """Datos de ejemplo para crear un stock."""
-    return {
+    """
+    Datos de ejemplo para crear un stock.
+
+    Vista de solo lectura compartida por todos los tests: para enviarla
+    o modificarla, hacer una copia con dict(sample_stock_data).
+    """
+    return MappingProxyType({
         "symbol": "TSLA",
         "company_name": "Tesla Inc",
         "threshold": 5.0,
         "is_active": True
-    }
+    })
 
 
 @pytest.fixture
@@ -144,30 +215,34 @@ def multiple_stocks(db):
         ("GOOGL", "Alphabet Inc", 4.0, False),
     ]
 
-    stocks = []
-    for symbol, name, threshold, is_active in stocks_data:
-        stock = db.create_stock(
-            symbol=symbol,
-            company_name=name,
-            threshold=threshold,
-            is_active=is_active
-        )
-        stocks.append(stock)
-
-    return stocks
+    # Una sola inserción en bloque en lugar de un create_stock por stock
+    return db.bulk_create_stocks([
+        {
+            "symbol": symbol,
+            "company_name": name,
+            "threshold": threshold,
+            "is_active": is_active
+        }
+        for symbol, name, threshold, is_active in stocks_data
+    ])
 
 
 # =============================================================================
 # FIXTURES DE DATOS - PRECIOS
 # =============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_price_data():
-    """Datos de ejemplo para crear un precio."""
-    return {
+    """
+    Datos de ejemplo para crear un precio.
+
+    Vista de solo lectura compartida por todos los tests (la fecha se
+    fija al inicio de la sesión): enviar una copia con dict(...).
+    """
+    return MappingProxyType({
         "date": datetime.now().isoformat(),
         "close_price": 250.75
-    }
+    })
 
 
 @pytest.fixture
@@ -178,18 +253,28 @@ def sample_prices(db, sample_stock):
     Genera precios de los últimos 7 días con variaciones.
     Útil para tests de histórico y cálculos.
     """
-    prices = []
     base_price = 250.0
+    now = datetime.now()
 
+    # Filas ya ordenadas por fecha: previous_close y percentage_change se
+    # calculan aquí y se insertan todas en una sola transacción
+    rows = []
+    previous_close = None
     for i in range(7):
-        date = datetime.now() - timedelta(days=6-i)
         price = base_price + (i * 5)  # Incremento gradual
-
-        db.add_price_history(
-            symbol="TSLA",
-            date=date,
-            close_price=price
-        )
+        rows.append({
+            "symbol": "TSLA",
+            "date": now - timedelta(days=6-i),
+            "close_price": price,
+            "previous_close": previous_close,
+            "percentage_change": (
+                (price - previous_close) / previous_close * 100
+                if previous_close else None
+            )
+        })
+        previous_close = price
+
+    db.bulk_add_price_history(rows)
 
     # Obtener los precios creados
     prices = db.get_price_history("TSLA", days=7)
@@ -257,18 +342,19 @@ def clean_db(db):
 # FIXTURES DE HELPERS
 # =============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def auth_headers():
     """
     Headers de autenticación para tests (placeholder).
 
     En el futuro, cuando se implemente autenticación,
     esta fixture proporcionará los headers necesarios.
+    Vista de solo lectura compartida por todos los tests.
     """
-    return {}
+    return MappingProxyType({})
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def invalid_symbol():
     """Símbolo de stock que no existe, útil para tests de 404."""
     return "NONEXISTENT"
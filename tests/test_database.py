@@ -72,6 +72,15 @@ class TestModels:
         assert stock.created_at is not None
         assert stock.updated_at is not None
 
+    def test_timestamps_are_utc(self, db_service):
+        """Verifica que las fechas generadas por la BD están en UTC."""
+        before = datetime.utcnow() - timedelta(seconds=1)
+        stock = db_service.create_stock('TSLA', 'Tesla Inc', 5.0)
+        after = datetime.utcnow() + timedelta(seconds=1)
+
+        assert before <= stock.created_at <= after
+        assert stock.created_at.tzinfo is None
+
     def test_stock_representation(self, sample_stock):
         """Verifica la representación en string del Stock."""
         repr_str = repr(sample_stock)
@@ -79,6 +88,17 @@ class TestModels:
         assert 'Tesla Inc' in repr_str
         assert '5.0' in repr_str
 
+    def test_numeric_columns_read_as_float(self, db_service, sample_stock):
+        """Verifica que los valores enteros de columnas numéricas se leen como float."""
+        db_service.add_price_history('TSLA', datetime.utcnow(), 250)
+
+        stock = db_service.get_stock_by_symbol('TSLA')
+        price = db_service.get_price_history('TSLA')[0]
+
+        assert type(stock.threshold) is float
+        assert type(price.close_price) is float
+        assert price.previous_close is None
+
     def test_price_history_creation(self, db_service, sample_stock):
         """Verifica que se puede crear un PriceHistory correctamente."""
         now = datetime.utcnow()
@@ -178,6 +198,19 @@ class TestStockCRUD:
         stock = db_service.create_stock('tsla', 'Tesla Inc', 5.0)
         assert stock.symbol == 'TSLA'
 
+    def test_bulk_create_stocks(self, db_service):
+        """Verifica la creación de varios stocks en bloque."""
+        stocks = db_service.bulk_create_stocks([
+            {'symbol': 'tsla', 'company_name': 'Tesla Inc', 'threshold': 5.0},
+            {'symbol': 'AAPL', 'company_name': 'Apple Inc', 'threshold': 3.0, 'is_active': False}
+        ])
+
+        assert [s.symbol for s in stocks] == ['TSLA', 'AAPL']
+        assert stocks[1].is_active is False
+        assert db_service.count_all_stocks() == 2
+        assert db_service.get_stock_by_symbol('TSLA').id == stocks[0].id
+        assert db_service.bulk_create_stocks([]) == []
+
     def test_get_stock_by_symbol(self, db_service, sample_stock):
         """Verifica obtener un stock por su símbolo."""
         stock = db_service.get_stock_by_symbol('TSLA')
@@ -214,6 +247,27 @@ class TestStockCRUD:
         assert len(active_stocks) == 2
         assert all(stock.is_active for stock in active_stocks)
 
+    def test_get_stock_rows(self, db_service, multiple_stocks):
+        """Verifica obtener los stocks como filas, ordenadas por símbolo."""
+        rows = db_service.get_stock_rows(only_active=True)
+
+        assert [row.symbol for row in rows] == ['AAPL', 'TSLA']
+        assert rows[0].company_name == 'Apple Inc'
+
+    def test_count_all_stocks(self, db_service, multiple_stocks):
+        """Verifica contar stocks activos e inactivos."""
+        assert db_service.count_all_stocks() == 3
+
+    def test_count_all_stocks_invalidated_on_mutation(self, db_service, multiple_stocks):
+        """Verifica que el conteo cacheado se invalida al crear y eliminar."""
+        assert db_service.count_all_stocks() == 3
+
+        db_service.create_stock('MSFT', 'Microsoft Corporation', 5.0)
+        assert db_service.count_all_stocks() == 4
+
+        db_service.delete_stock('AAPL')
+        assert db_service.count_all_stocks() == 3
+
     def test_update_stock(self, db_service, sample_stock):
         """Verifica actualizar un stock."""
         updated = db_service.update_stock('TSLA', threshold=6.0, is_active=False)
@@ -260,6 +314,47 @@ class TestStockCRUD:
         assert len(alerts) == 0
         assert len(news) == 0
 
+    def test_stock_id_cache_invalidated_on_delete(self, db_service, sample_stock):
+        """Verifica que un stock eliminado y recreado usa su nuevo ID."""
+        assert db_service.add_price_history('TSLA', datetime.utcnow(), 250.00) is not None
+
+        db_service.delete_stock('TSLA')
+        assert db_service.add_price_history('TSLA', datetime.utcnow(), 250.00) is None
+
+        stock = db_service.create_stock('TSLA', 'Tesla Inc', 5.0)
+        price = db_service.add_price_history('TSLA', datetime.utcnow(), 250.00)
+        assert price.stock_id == stock.id
+
+    def test_stock_id_cache_shared_between_services(self, db_service, sample_stock):
+        """Verifica que otro servicio sobre la misma BD no usa el ID antiguo."""
+        other = DatabaseService(engine=db_service.engine)
+        old_price = other.add_price_history('TSLA', datetime.utcnow(), 250.00)
+
+        # Otro stock intermedio para que el TSLA recreado no reciba el mismo ID
+        db_service.create_stock('AAPL', 'Apple Inc', 3.0)
+        db_service.delete_stock('TSLA')
+        stock = db_service.create_stock('TSLA', 'Tesla Inc', 5.0)
+        assert stock.id != old_price.stock_id
+
+        price = other.add_price_history('TSLA', datetime.utcnow(), 251.00)
+        assert price.stock_id == stock.id
+
+    def test_delete_stock_leaves_no_orphans(self, db_service, sample_stock):
+        """Verifica que no quedan filas huérfanas de otros modelos."""
+        db_service.create_stock('AAPL', 'Apple Inc', 3.0)
+        db_service.add_price_history('TSLA', datetime.utcnow(), 250.00)
+        db_service.add_price_history('AAPL', datetime.utcnow(), 180.00)
+        db_service.create_alert('TSLA', 4.17, 5.0)
+        db_service.save_news_article('TSLA', 'Test News')
+
+        db_service.delete_stock('TSLA')
+
+        with db_service.get_session() as session:
+            assert session.query(PriceHistory).count() == 1
+            assert session.query(Alert).count() == 0
+            assert session.query(NewsArticle).count() == 0
+            assert session.query(Stock).count() == 1
+
 
 # =========================================================================
 # TESTS DE PRICE HISTORY
@@ -288,6 +383,26 @@ class TestPriceHistory:
         price = db_service.add_price_history('NOTEXIST', datetime.utcnow(), 250.00)
         assert price is None
 
+    def test_bulk_add_price_history(self, db_service, sample_stock):
+        """Verifica la inserción en bloque, descartando stocks inexistentes."""
+        now = datetime.utcnow()
+        ids = db_service.bulk_add_price_history([
+            {'symbol': 'TSLA', 'date': now - timedelta(days=1), 'close_price': 240.00},
+            {'symbol': 'tsla', 'date': now, 'close_price': 250.00,
+             'previous_close': 240.00, 'percentage_change': 4.17},
+            {'symbol': 'NOTEXIST', 'date': now, 'close_price': 10.00}
+        ])
+
+        assert len(ids) == 2
+        prices = db_service.get_price_history('TSLA')
+        assert [p.close_price for p in prices] == [250.00, 240.00]
+        assert [p.id for p in prices] == ids[::-1]
+        assert prices[0].previous_close == 240.00
+
+    def test_bulk_add_price_history_empty(self, db_service):
+        """Verifica que una lista vacía no inserta nada."""
+        assert db_service.bulk_add_price_history([]) == []
+
     def test_get_price_history(self, db_service, sample_stock):
         """Verifica obtener histórico de precios."""
         now = datetime.utcnow()
@@ -320,6 +435,16 @@ class TestPriceHistory:
         assert len(prices) == 1
         assert prices[0].close_price == 250.00
 
+    def test_iter_price_history(self, db_service, sample_stock):
+        """Verifica recorrer el histórico por bloques."""
+        now = datetime.utcnow()
+        for i in range(5):
+            db_service.add_price_history('TSLA', now - timedelta(days=i), 250.00 - i)
+
+        prices = list(db_service.iter_price_history('TSLA', days=30, batch_size=2))
+
+        assert [p.close_price for p in prices] == [250.00, 249.00, 248.00, 247.00, 246.00]
+
     def test_get_price_history_nonexistent_stock(self, db_service):
         """Verifica que devuelve lista vacía si el stock no existe."""
         prices = db_service.get_price_history('NOTEXIST')
@@ -353,6 +478,42 @@ class TestAlerts:
         alert = db_service.create_alert('NOTEXIST', 4.17, 5.0)
         assert alert is None
 
+    def test_bulk_create_alerts(self, db_service, sample_stock):
+        """Verifica el registro de alertas en bloque, descartando stocks inexistentes."""
+        ids = db_service.bulk_create_alerts([
+            {'symbol': 'tsla', 'percentage_change': 6.5, 'threshold_at_time': 5.0,
+             'price_before': 240.00, 'price_after': 255.60},
+            {'symbol': 'NOTEXIST', 'percentage_change': 7.0, 'threshold_at_time': 5.0}
+        ])
+
+        assert len(ids) == 1
+        alerts = db_service.get_recent_alerts('TSLA')
+        assert [a.id for a in alerts] == ids
+        assert alerts[0].message_sent is False
+        assert db_service.bulk_create_alerts([]) == []
+
+    def test_has_alert_for_price_date(self, db_service, sample_stock):
+        """Verifica la detección de alertas duplicadas por precios."""
+        now = datetime.utcnow()
+        db_service.create_alert('TSLA', 4.17, 5.0, price_before=240.00, price_after=250.00)
+
+        assert db_service.has_alert_for_price_date('TSLA', now, 240.00, 250.00) is True
+        assert db_service.has_alert_for_price_date('TSLA', now, 240.00, 251.00) is False
+        assert db_service.has_alert_for_price_date('NOTEXIST', now, 240.00, 250.00) is False
+
+    def test_existing_alert_stock_ids(self, db_service, sample_stock):
+        """Verifica la detección de alertas duplicadas por lotes."""
+        other = db_service.create_stock('AAPL', 'Apple Inc', 3.0)
+        db_service.create_alert('TSLA', 4.17, 5.0, price_before=240.00, price_after=250.00)
+
+        existing = db_service.existing_alert_stock_ids([
+            (sample_stock.id, 240.00, 250.0001),
+            (other.id, 240.00, 250.00)
+        ])
+
+        assert existing == {sample_stock.id}
+        assert db_service.existing_alert_stock_ids([]) == set()
+
     def test_get_recent_alerts(self, db_service, sample_stock):
         """Verifica obtener alertas recientes."""
         # Crear alertas
@@ -378,6 +539,20 @@ class TestAlerts:
 
         assert len(tsla_alerts) == 1
 
+    def test_get_recent_alert_rows_filtered_by_symbol(self, db_service):
+        """Verifica obtener alertas como filas filtradas por símbolo."""
+        tsla = db_service.create_stock('TSLA', 'Tesla Inc', 5.0)
+        db_service.create_stock('AAPL', 'Apple Inc', 3.0)
+
+        db_service.create_alert('TSLA', 4.17, 5.0)
+        db_service.create_alert('AAPL', 3.2, 3.0)
+
+        rows = db_service.get_recent_alert_rows(symbol='tsla', days=7)
+
+        assert len(rows) == 1
+        assert rows[0].stock_id == tsla.id
+        assert rows[0].percentage_change == 4.17
+
     def test_get_recent_alerts_with_time_limit(self, db_service, sample_stock):
         """Verifica filtrado por tiempo."""
         # Crear alerta antigua (simulada modificando created_at sería complejo,
@@ -415,6 +590,63 @@ class TestNewsArticles:
         article = db_service.save_news_article('NOTEXIST', 'Test News')
         assert article is None
 
+    def test_has_news_article_by_url(self, db_service, sample_stock):
+        """Verifica la detección de noticias duplicadas por URL."""
+        db_service.save_news_article('TSLA', 'News', url='https://example.com/news')
+
+        assert db_service.has_news_article_by_url('TSLA', 'https://example.com/news') is True
+        assert db_service.has_news_article_by_url('TSLA', 'https://example.com/other') is False
+        assert db_service.has_news_article_by_url('TSLA', None) is False
+
+    def test_existing_news_urls(self, db_service, sample_stock):
+        """Verifica la detección de duplicados por lotes."""
+        db_service.save_news_article('TSLA', 'News', url='https://example.com/news')
+        other = db_service.create_stock('AAPL', 'Apple Inc', 3.0)
+
+        existing = db_service.existing_news_urls([
+            (sample_stock.id, 'https://example.com/news'),
+            (sample_stock.id, 'https://example.com/other'),
+            (other.id, 'https://example.com/news'),
+            (sample_stock.id, None),
+        ])
+
+        assert existing == {(sample_stock.id, 'https://example.com/news')}
+        assert db_service.existing_news_urls([]) == set()
+
+    def test_save_news_article_duplicate_url(self, db_service, sample_stock):
+        """Verifica que la misma URL no se guarda dos veces para un stock."""
+        db_service.save_news_article('TSLA', 'News', url='https://example.com/news')
+
+        duplicate = db_service.save_news_article('TSLA', 'News again', url='https://example.com/news')
+        assert duplicate is None
+        assert len(db_service.get_news_for_stock('TSLA')) == 1
+
+        # Sin URL sí se pueden guardar varias
+        assert db_service.save_news_article('TSLA', 'News 1') is not None
+        assert db_service.save_news_article('TSLA', 'News 2') is not None
+        assert len(db_service.get_news_for_stock('TSLA')) == 3
+
+    def test_save_news_article_without_unique_index(self, db_service, sample_stock):
+        """Verifica que sin el índice único (BD con duplicados previos) se sigue guardando."""
+        index = next(i for i in NewsArticle.__table__.indexes if i.name == 'ux_news_stock_url')
+        index.drop(bind=db_service.engine)
+
+        # Duplicados anteriores al índice: impiden crearlo
+        with db_service.get_session() as session:
+            for title in ('Old news', 'Old news again'):
+                session.add(NewsArticle(
+                    stock_id=sample_stock.id, title=title, url='https://example.com/old'
+                ))
+
+        db_service.create_tables()
+        assert 'ux_news_stock_url' in db_service._missing_indexes
+
+        saved = db_service.save_news_article('TSLA', 'New news', url='https://example.com/new')
+        assert saved is not None
+        assert db_service.save_news_article('TSLA', 'New again', url='https://example.com/new') is None
+        assert db_service.save_news_article('TSLA', 'Old once more', url='https://example.com/old') is None
+        assert len(db_service.get_news_for_stock('TSLA')) == 3
+
     def test_get_news_for_stock(self, db_service, sample_stock):
         """Verifica obtener noticias de un stock."""
         # Guardar varias noticias
@@ -480,6 +712,22 @@ class TestDashboardSummary:
         assert summary['recent_alerts_24h'] == 1
         assert summary['last_price_update'] is not None
 
+    def test_dashboard_summary_invalidated_on_mutation(self, db_service):
+        """Verifica que el resumen cacheado se recalcula tras cambios."""
+        assert db_service.get_dashboard_summary()['total_stocks'] == 0
+
+        db_service.create_stock('TSLA', 'Tesla Inc', 5.0)
+        assert db_service.get_dashboard_summary()['total_stocks'] == 1
+
+        db_service.update_stock('TSLA', is_active=False)
+        assert db_service.get_dashboard_summary()['active_stocks'] == 0
+
+        db_service.create_alert('TSLA', 4.17, 5.0)
+        assert db_service.get_dashboard_summary()['recent_alerts_24h'] == 1
+
+        db_service.add_price_history('TSLA', datetime.utcnow(), 250.00)
+        assert db_service.get_dashboard_summary()['last_price_update'] is not None
+
 
 # =========================================================================
 # TESTS DE MANEJO DE SESIONES
@@ -515,6 +763,13 @@ class TestSessionManagement:
         retrieved = db_service.get_stock_by_symbol('TEST')
         assert retrieved is None
 
+    def test_read_only_session_does_not_commit(self, db_service):
+        """Verifica que una sesión de solo lectura no confirma cambios."""
+        with db_service.get_session(write=False) as session:
+            session.add(Stock(symbol='TEST', company_name='Test Inc', threshold=5.0))
+
+        assert db_service.get_stock_by_symbol('TEST') is None
+
     def test_objects_usable_outside_session(self, db_service, sample_stock):
         """Verifica que los objetos son usables fuera de la sesión (expunge)."""
         # El objeto ya fue creado y expunged por la fixture
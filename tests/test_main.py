@@ -9,6 +9,7 @@ from unittest.mock import patch, Mock, MagicMock
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import main
+from src.utils import StockSpec
 
 
 class TestMain:
@@ -53,7 +54,7 @@ class TestMain:
         mock_config.TWILIO_AUTH_TOKEN = 'test_token'
 
         mock_load_stocks.return_value = [
-            {'symbol': 'AAPL', 'company_name': 'Apple Inc', 'threshold': 5.0}
+            StockSpec('AAPL', 'Apple Inc', 5.0)
         ]
 
         # Mock stock fetcher
@@ -98,7 +99,7 @@ class TestMain:
         mock_config.TWILIO_AUTH_TOKEN = 'test_token'
 
         mock_load_stocks.return_value = [
-            {'symbol': 'TSLA', 'company_name': 'Tesla Inc', 'threshold': 5.0}
+            StockSpec('TSLA', 'Tesla Inc', 5.0)
         ]
 
         # Mock stock fetcher - returns change above threshold
@@ -151,7 +152,7 @@ class TestMain:
         mock_config.TWILIO_AUTH_TOKEN = 'test_token'
 
         mock_load_stocks.return_value = [
-            {'symbol': 'INVALID', 'company_name': 'Invalid Co', 'threshold': 5.0}
+            StockSpec('INVALID', 'Invalid Co', 5.0)
         ]
 
         # Mock stock fetcher - returns None (error)
@@ -196,8 +197,8 @@ class TestMain:
         mock_config.TWILIO_AUTH_TOKEN = 'test_token'
 
         mock_load_stocks.return_value = [
-            {'symbol': 'TSLA', 'company_name': 'Tesla Inc', 'threshold': 5.0},
-            {'symbol': 'AAPL', 'company_name': 'Apple Inc', 'threshold': 3.0}
+            StockSpec('TSLA', 'Tesla Inc', 5.0),
+            StockSpec('AAPL', 'Apple Inc', 3.0)
         ]
 
         # Mock stock fetcher - one above, one below threshold
@@ -247,7 +248,7 @@ class TestMain:
         mock_config.TWILIO_AUTH_TOKEN = None
 
         mock_load_stocks.return_value = [
-            {'symbol': 'TSLA', 'company_name': 'Tesla Inc', 'threshold': 5.0}
+            StockSpec('TSLA', 'Tesla Inc', 5.0)
         ]
 
         # Mock stock fetcher - returns change above threshold
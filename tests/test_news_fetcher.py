@@ -4,6 +4,7 @@ import os
 import sys
 import pytest
 from unittest.mock import Mock, patch
+import orjson
 import requests
 
 # Add parent directory to path
@@ -32,11 +33,11 @@ class TestNewsFetcher:
         fetcher = NewsFetcher()
         assert fetcher.api_key == 'config_key'
 
-    @patch('src.news_fetcher.requests.get')
+    @patch('requests.Session.get')
     def test_get_articles_success(self, mock_get, news_fetcher):
         """Test successful news article retrieval."""
         mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response.content = orjson.dumps({
             "status": "ok",
             "articles": [
                 {
@@ -50,7 +51,7 @@ class TestNewsFetcher:
                     "url": "https://example.com/2"
                 }
             ]
-        }
+        })
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
 
@@ -61,14 +62,14 @@ class TestNewsFetcher:
         assert articles[0]['description'] == "Tesla stock reaches record levels"
         assert articles[0]['url'] == "https://example.com/1"
 
-    @patch('src.news_fetcher.requests.get')
+    @patch('requests.Session.get')
     def test_get_articles_empty_result(self, mock_get, news_fetcher):
         """Test when API returns no articles."""
         mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response.content = orjson.dumps({
             "status": "ok",
             "articles": []
-        }
+        })
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
 
@@ -76,14 +77,14 @@ class TestNewsFetcher:
 
         assert articles == []
 
-    @patch('src.news_fetcher.requests.get')
+    @patch('requests.Session.get')
     def test_get_articles_non_ok_status(self, mock_get, news_fetcher):
         """Test when API returns non-ok status."""
         mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response.content = orjson.dumps({
             "status": "error",
             "message": "API key invalid"
-        }
+        })
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
 
@@ -91,7 +92,7 @@ class TestNewsFetcher:
 
         assert articles == []
 
-    @patch('src.news_fetcher.requests.get')
+    @patch('requests.Session.get')
     def test_get_articles_timeout(self, mock_get, news_fetcher):
         """Test handling of request timeout."""
         mock_get.side_effect = requests.exceptions.Timeout()
@@ -100,7 +101,7 @@ class TestNewsFetcher:
 
         assert articles == []
 
-    @patch('src.news_fetcher.requests.get')
+    @patch('requests.Session.get')
     def test_get_articles_request_error(self, mock_get, news_fetcher):
         """Test handling of request errors."""
         mock_get.side_effect = requests.exceptions.RequestException("Connection error")
@@ -109,7 +110,7 @@ class TestNewsFetcher:
 
         assert articles == []
 
-    @patch('src.news_fetcher.requests.get')
+    @patch('requests.Session.get')
     def test_get_articles_http_error(self, mock_get, news_fetcher):
         """Test handling of HTTP errors."""
         mock_response = Mock()
@@ -120,14 +121,14 @@ class TestNewsFetcher:
 
         assert articles == []
 
-    @patch('src.news_fetcher.requests.get')
+    @patch('requests.Session.get')
     def test_get_articles_limit_parameter(self, mock_get, news_fetcher):
         """Test that limit parameter is passed correctly."""
         mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response.content = orjson.dumps({
             "status": "ok",
             "articles": [{"title": "News 1", "description": "Desc 1", "url": "url1"}]
-        }
+        })
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
 
@@ -137,14 +138,14 @@ class TestNewsFetcher:
         call_kwargs = mock_get.call_args[1]
         assert call_kwargs['params']['pageSize'] == 5
 
-    @patch('src.news_fetcher.requests.get')
+    @patch('requests.Session.get')
     def test_get_articles_with_company_name(self, mock_get, news_fetcher):
         """Test that company name is passed correctly in query."""
         mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response.content = orjson.dumps({
             "status": "ok",
             "articles": []
-        }
+        })
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
 
@@ -153,3 +154,28 @@ class TestNewsFetcher:
         # Verify the API was called with correct company name
         call_kwargs = mock_get.call_args[1]
         assert call_kwargs['params']['q'] == 'Apple Inc'
+
+    @patch('requests.Session.get')
+    def test_get_articles_many(self, mock_get, news_fetcher):
+        """Test fetching articles for several companies at once."""
+        def fake_get(endpoint, params, timeout):
+            response = Mock()
+            response.content = orjson.dumps({
+                "status": "ok",
+                "articles": [{"title": f"{params['q']} news", "url": params['q']}]
+            })
+            response.raise_for_status = Mock()
+            return response
+
+        mock_get.side_effect = fake_get
+
+        results = news_fetcher.get_articles_many(['Tesla Inc', 'Apple Inc', 'Tesla Inc'])
+
+        assert list(results) == ['Tesla Inc', 'Apple Inc']
+        assert results['Tesla Inc'][0]['title'] == 'Tesla Inc news'
+        assert results['Apple Inc'][0]['title'] == 'Apple Inc news'
+        assert mock_get.call_count == 2
+
+    def test_get_articles_many_empty(self, news_fetcher):
+        """Test that no companies means no requests."""
+        assert news_fetcher.get_articles_many([]) == {}
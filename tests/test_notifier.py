@@ -55,7 +55,7 @@ class TestNotifier:
         assert notifier.from_number == '+config_from'
         assert notifier.to_number == '+config_to'
 
-    @patch('src.notifier.Client')
+    @patch('twilio.rest.Client')
     def test_client_property_lazy_initialization(self, mock_client_class, notifier):
         """Test that client is lazily initialized."""
         assert notifier._client is None
@@ -67,7 +67,7 @@ class TestNotifier:
         mock_client_class.assert_called_once_with('test_sid', 'test_token')
 
     @patch('src.notifier.config')
-    @patch('src.notifier.Client')
+    @patch('twilio.rest.Client')
     def test_client_property_returns_none_without_credentials(self, mock_client_class, mock_config):
         """Test that client returns None without credentials."""
         mock_config.TWILIO_ACCOUNT_SID = None
@@ -80,7 +80,7 @@ class TestNotifier:
         assert notifier.client is None
         mock_client_class.assert_not_called()
 
-    @patch('src.notifier.Client')
+    @patch('twilio.rest.Client')
     def test_send_message_whatsapp_success(self, mock_client_class, notifier):
         """Test successful WhatsApp message sending."""
         mock_message = Mock()
@@ -96,7 +96,7 @@ class TestNotifier:
             to="whatsapp:+0987654321"
         )
 
-    @patch('src.notifier.Client')
+    @patch('twilio.rest.Client')
     def test_send_message_sms_success(self, mock_client_class):
         """Test successful SMS message sending."""
         notifier = Notifier(
@@ -133,7 +133,7 @@ class TestNotifier:
 
         assert result is False
 
-    @patch('src.notifier.Client')
+    @patch('twilio.rest.Client')
     def test_send_message_twilio_exception(self, mock_client_class, notifier):
         """Test handling of Twilio exceptions."""
         mock_client_class.return_value.messages.create.side_effect = Exception("Twilio error")
@@ -142,7 +142,7 @@ class TestNotifier:
 
         assert result is False
 
-    @patch('src.notifier.Client')
+    @patch('twilio.rest.Client')
     def test_send_message_empty_body(self, mock_client_class, notifier):
         """Test sending message with empty body."""
         mock_message = Mock()
@@ -154,7 +154,7 @@ class TestNotifier:
         assert result is True
         mock_client_class.return_value.messages.create.assert_called_once()
 
-    @patch('src.notifier.Client')
+    @patch('twilio.rest.Client')
     def test_send_message_long_body(self, mock_client_class, notifier):
         """Test sending message with long body."""
         long_message = "A" * 2000
@@ -167,3 +167,23 @@ class TestNotifier:
         assert result is True
         call_kwargs = mock_client_class.return_value.messages.create.call_args[1]
         assert call_kwargs['body'] == long_message
+
+    @patch('twilio.rest.Client')
+    def test_send_many(self, mock_client_class, notifier):
+        """Test sending several messages returns one result per message, in order."""
+        def create(body, from_, to):
+            if body == "fail":
+                raise Exception("Twilio error")
+            return Mock(sid=f"SM-{body}")
+
+        mock_client_class.return_value.messages.create.side_effect = create
+
+        results = notifier.send_many(["one", "fail", "three"])
+
+        assert results == [True, False, True]
+        assert mock_client_class.return_value.messages.create.call_count == 3
+        mock_client_class.assert_called_once_with('test_sid', 'test_token')
+
+    def test_send_many_empty(self, notifier):
+        """Test that no messages means no requests."""
+        assert notifier.send_many([]) == []
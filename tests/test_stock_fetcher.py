@@ -4,12 +4,21 @@ import os
 import sys
 import pytest
 from unittest.mock import Mock, patch
+import orjson
 import requests
 
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.stock_fetcher import StockFetcher
+from src.stock_fetcher import StockFetcher, clear_quote_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_quote_cache():
+    """Start every test without cached quotes."""
+    clear_quote_cache()
+    yield
+    clear_quote_cache()
 
 
 class TestStockFetcher:
@@ -32,16 +41,16 @@ class TestStockFetcher:
         fetcher = StockFetcher()
         assert fetcher.api_key == 'config_key'
 
-    @patch('src.stock_fetcher.requests.get')
+    @patch('requests.Session.get')
     def test_get_percentage_change_success(self, mock_get, stock_fetcher):
         """Test successful percentage change calculation."""
         mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response.content = orjson.dumps({
             "Time Series (Daily)": {
                 "2025-01-10": {"4. close": "250.00"},
                 "2025-01-09": {"4. close": "240.00"}
             }
-        }
+        })
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
 
@@ -53,16 +62,16 @@ class TestStockFetcher:
         assert day_before == 240.00
         assert dates == ["2025-01-10", "2025-01-09"]
 
-    @patch('src.stock_fetcher.requests.get')
+    @patch('requests.Session.get')
     def test_get_percentage_change_negative(self, mock_get, stock_fetcher):
         """Test percentage change with negative result."""
         mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response.content = orjson.dumps({
             "Time Series (Daily)": {
                 "2025-01-10": {"4. close": "230.00"},
                 "2025-01-09": {"4. close": "250.00"}
             }
-        }
+        })
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
 
@@ -74,13 +83,13 @@ class TestStockFetcher:
         assert yesterday == 230.00
         assert day_before == 250.00
 
-    @patch('src.stock_fetcher.requests.get')
+    @patch('requests.Session.get')
     def test_get_percentage_change_no_time_series(self, mock_get, stock_fetcher):
         """Test when API response has no time series data."""
         mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response.content = orjson.dumps({
             "Note": "Thank you for using Alpha Vantage! Our standard API call frequency is 5 calls per minute."
-        }
+        })
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
 
@@ -91,7 +100,7 @@ class TestStockFetcher:
         assert day_before is None
         assert dates is None
 
-    @patch('src.stock_fetcher.requests.get')
+    @patch('requests.Session.get')
     def test_get_percentage_change_timeout(self, mock_get, stock_fetcher):
         """Test handling of request timeout."""
         mock_get.side_effect = requests.exceptions.Timeout()
@@ -103,7 +112,7 @@ class TestStockFetcher:
         assert day_before is None
         assert dates is None
 
-    @patch('src.stock_fetcher.requests.get')
+    @patch('requests.Session.get')
     def test_get_percentage_change_request_error(self, mock_get, stock_fetcher):
         """Test handling of request errors."""
         mock_get.side_effect = requests.exceptions.RequestException("Connection error")
@@ -115,7 +124,7 @@ class TestStockFetcher:
         assert day_before is None
         assert dates is None
 
-    @patch('src.stock_fetcher.requests.get')
+    @patch('requests.Session.get')
     def test_get_percentage_change_http_error(self, mock_get, stock_fetcher):
         """Test handling of HTTP errors."""
         mock_response = Mock()
@@ -128,3 +137,88 @@ class TestStockFetcher:
         assert yesterday is None
         assert day_before is None
         assert dates is None
+
+    @patch('requests.Session.get')
+    def test_get_bulk_quotes(self, mock_get, stock_fetcher):
+        """Test bulk quotes are parsed into get_percentage_change tuples."""
+        mock_response = Mock()
+        mock_response.content = orjson.dumps({
+            "data": [
+                {"symbol": "TSLA", "timestamp": "2025-01-10 16:00:00.000",
+                 "close": "250.00", "previous_close": "240.00"},
+                {"symbol": "AAPL", "close": "not a number", "previous_close": "180.00"}
+            ]
+        })
+        mock_response.raise_for_status = Mock()
+        mock_get.return_value = mock_response
+
+        quotes = stock_fetcher.get_bulk_quotes(['tsla', 'AAPL', 'TSLA'])
+
+        assert list(quotes) == ['TSLA']
+        pct_change, close, previous_close, dates = quotes['TSLA']
+        assert abs(pct_change - 4.166666666666667) < 0.01
+        assert close == 250.00
+        assert previous_close == 240.00
+        assert dates == ["2025-01-10"]
+        assert mock_get.call_args[1]['params']['symbol'] == 'TSLA,AAPL'
+
+    @patch('requests.Session.get')
+    def test_get_bulk_quotes_chunks_requests(self, mock_get, stock_fetcher):
+        """Test symbols are requested in chunks of the bulk endpoint limit."""
+        mock_response = Mock()
+        mock_response.content = orjson.dumps({"data": []})
+        mock_response.raise_for_status = Mock()
+        mock_get.return_value = mock_response
+
+        quotes = stock_fetcher.get_bulk_quotes([f"S{i}" for i in range(150)])
+
+        assert quotes == {}
+        assert mock_get.call_count == 2
+
+    @patch('requests.Session.get')
+    def test_get_bulk_quotes_request_error(self, mock_get, stock_fetcher):
+        """Test a failed bulk request leaves its symbols out."""
+        mock_get.side_effect = requests.exceptions.RequestException("Connection error")
+
+        assert stock_fetcher.get_bulk_quotes(['TSLA']) == {}
+
+    @patch('requests.Session.get')
+    def test_get_percentage_change_cached(self, mock_get, stock_fetcher):
+        """Test a fresh result is reused without another request."""
+        mock_response = Mock()
+        mock_response.content = orjson.dumps({
+            "Time Series (Daily)": {
+                "2025-01-10": {"4. close": "250.00"},
+                "2025-01-09": {"4. close": "240.00"}
+            }
+        })
+        mock_response.raise_for_status = Mock()
+        mock_get.return_value = mock_response
+
+        first = stock_fetcher.get_percentage_change('TSLA')
+        second = stock_fetcher.get_percentage_change('tsla')
+
+        assert first == second
+        assert mock_get.call_count == 1
+
+    @patch('src.stock_fetcher.config')
+    @patch('requests.Session.get')
+    def test_get_percentage_change_not_modified(self, mock_get, mock_config, stock_fetcher):
+        """Test an expired result is revalidated with its ETag."""
+        mock_config.ALPHA_VANTAGE_CACHE_TTL = 0
+
+        ok_response = Mock(status_code=200, headers={"ETag": '"v1"'})
+        ok_response.content = orjson.dumps({
+            "Time Series (Daily)": {
+                "2025-01-10": {"4. close": "250.00"},
+                "2025-01-09": {"4. close": "240.00"}
+            }
+        })
+        not_modified = Mock(status_code=304, headers={})
+        mock_get.side_effect = [ok_response, not_modified]
+
+        first = stock_fetcher.get_percentage_change('TSLA')
+        second = stock_fetcher.get_percentage_change('TSLA')
+
+        assert second == first
+        assert mock_get.call_args[1]['headers'] == {"If-None-Match": '"v1"'}
@@ -2,12 +2,21 @@
 
 import os
 import sys
+import logging
 import pytest
+from datetime import datetime, timezone
+from unittest.mock import patch
 
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.utils import load_stocks_from_csv, generate_stock_report
+from src.utils import (
+    FastRotatingFileHandler,
+    StockSpec,
+    load_stocks_from_csv,
+    generate_stock_report,
+    parse_iso_datetime,
+)
 
 
 class TestLoadStocksFromCSV:
@@ -25,11 +34,11 @@ GOOGL,Alphabet Inc,4"""
         stocks = load_stocks_from_csv(str(csv_file))
 
         assert len(stocks) == 3
-        assert stocks[0]['symbol'] == 'TSLA'
-        assert stocks[0]['company_name'] == 'Tesla Inc'
-        assert stocks[0]['threshold'] == 5.0
-        assert stocks[1]['symbol'] == 'AAPL'
-        assert stocks[2]['symbol'] == 'GOOGL'
+        assert stocks[0].symbol == 'TSLA'
+        assert stocks[0].company_name == 'Tesla Inc'
+        assert stocks[0].threshold == 5.0
+        assert stocks[1].symbol == 'AAPL'
+        assert stocks[2].symbol == 'GOOGL'
 
     def test_load_stocks_file_not_found(self):
         """Test loading stocks from non-existent file."""
@@ -52,8 +61,19 @@ GOOGL,Alphabet Inc,4"""
         csv_file.write_text(csv_content)
 
         stocks = load_stocks_from_csv(str(csv_file))
-        assert stocks[0]['symbol'] == 'TSLA'
-        assert stocks[0]['company_name'] == 'Tesla Inc'
+        assert stocks[0].symbol == 'TSLA'
+        assert stocks[0].company_name == 'Tesla Inc'
+
+    def test_load_stocks_quoted_company_name(self, tmp_path):
+        """Test that quoted fields containing commas are parsed as one column."""
+        csv_file = tmp_path / "quoted.csv"
+        csv_content = """symbol,company_name,threshold
+GOOGL,"Alphabet, Inc.",4"""
+        csv_file.write_text(csv_content)
+
+        stocks = load_stocks_from_csv(str(csv_file))
+        assert stocks[0].company_name == 'Alphabet, Inc.'
+        assert stocks[0].threshold == 4.0
 
 
 class TestGenerateStockReport:
@@ -61,11 +81,7 @@ class TestGenerateStockReport:
 
     def test_generate_stock_report_with_news(self):
         """Test report generation with news articles."""
-        stock_info = {
-            'symbol': 'TSLA',
-            'company_name': 'Tesla Inc',
-            'threshold': 5
-        }
+        stock_info = StockSpec('TSLA', 'Tesla Inc', 5)
         percentage_change = 6.5
         articles = [
             {
@@ -87,11 +103,7 @@ class TestGenerateStockReport:
 
     def test_generate_stock_report_negative_change(self):
         """Test report generation with negative change."""
-        stock_info = {
-            'symbol': 'AAPL',
-            'company_name': 'Apple Inc',
-            'threshold': 3
-        }
+        stock_info = StockSpec('AAPL', 'Apple Inc', 3)
         percentage_change = -4.2
         articles = []
 
@@ -103,11 +115,7 @@ class TestGenerateStockReport:
 
     def test_generate_stock_report_no_news(self):
         """Test report generation without news articles."""
-        stock_info = {
-            'symbol': 'GOOGL',
-            'company_name': 'Alphabet Inc',
-            'threshold': 4
-        }
+        stock_info = StockSpec('GOOGL', 'Alphabet Inc', 4)
         percentage_change = 5.0
         articles = []
 
@@ -118,11 +126,7 @@ class TestGenerateStockReport:
 
     def test_generate_stock_report_multiple_news(self):
         """Test report generation with multiple news articles."""
-        stock_info = {
-            'symbol': 'MSFT',
-            'company_name': 'Microsoft',
-            'threshold': 3
-        }
+        stock_info = StockSpec('MSFT', 'Microsoft', 3)
         percentage_change = 4.5
         articles = [
             {'title': 'News 1', 'description': 'Desc 1', 'url': 'https://example.com/1'},
@@ -137,3 +141,78 @@ class TestGenerateStockReport:
         assert 'News 2' in report
         assert 'News 3' in report
         assert 'News 4' not in report
+
+
+class TestParseIsoDatetime:
+    """Tests for parse_iso_datetime function."""
+
+    def test_parse_utc_suffix(self):
+        """Test that a trailing Z is parsed as UTC."""
+        assert parse_iso_datetime("2025-01-10T14:30:00Z") == datetime(2025, 1, 10, 14, 30, tzinfo=timezone.utc)
+
+    def test_parse_offset(self):
+        """Test that explicit offsets are kept."""
+        assert parse_iso_datetime("2025-01-10T14:30:00+00:00") == datetime(2025, 1, 10, 14, 30, tzinfo=timezone.utc)
+
+    def test_parse_empty_or_invalid(self):
+        """Test that missing or invalid values return None."""
+        assert parse_iso_datetime(None) is None
+        assert parse_iso_datetime("") is None
+        assert parse_iso_datetime("yesterday") is None
+
+
+class TestFastRotatingFileHandler:
+    """Tests for FastRotatingFileHandler."""
+
+    def _record(self, message, level=logging.INFO):
+        return logging.LogRecord('test', level, __file__, 0, message, None, None)
+
+    def test_skips_formatting_far_below_limit(self, tmp_path):
+        """Test that records are not formatted while the file is far from maxBytes."""
+        handler = FastRotatingFileHandler(
+            str(tmp_path / 'app.log'), maxBytes=1024 * 1024, backupCount=1
+        )
+        handler.emit(self._record('first'))
+        try:
+            with patch.object(handler, 'format', side_effect=AssertionError):
+                assert handler.shouldRollover(self._record('second')) is False
+        finally:
+            handler.close()
+
+    def test_rolls_over_near_limit(self, tmp_path):
+        """Test that the regular size check applies close to maxBytes."""
+        handler = FastRotatingFileHandler(
+            str(tmp_path / 'app.log'), maxBytes=200, backupCount=1
+        )
+        try:
+            handler.emit(self._record('x' * 150))
+            assert handler.shouldRollover(self._record('y' * 100)) is True
+        finally:
+            handler.close()
+
+    def test_buffers_records_below_warning(self, tmp_path):
+        """Test that INFO records are buffered and WARNING records flush them."""
+        log_file = tmp_path / 'app.log'
+        handler = FastRotatingFileHandler(
+            str(log_file), maxBytes=1024 * 1024, backupCount=1
+        )
+        try:
+            handler.emit(self._record('buffered'))
+            assert log_file.stat().st_size == 0
+
+            handler.emit(self._record('careful', logging.WARNING))
+            assert 'buffered' in log_file.read_text()
+        finally:
+            handler.close()
+
+    def test_flush_level_info_writes_every_record(self, tmp_path):
+        """Test that flush_level='INFO' writes INFO records out immediately."""
+        log_file = tmp_path / 'app.log'
+        handler = FastRotatingFileHandler(
+            str(log_file), maxBytes=1024 * 1024, backupCount=1, flush_level='INFO'
+        )
+        try:
+            handler.emit(self._record('written'))
+            assert 'written' in log_file.read_text()
+        finally:
+            handler.close()